@@ -1,8 +1,40 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+import importlib
+
 # from .color import BGR
 # from .types import KeyValue
-from .size2d import Size2d
-from .point import Point
-from .box import Box
 # from .utils import initialize_logger
+if TYPE_CHECKING:
+    from .size2d import Size2d
+    from .point import Point
+    from .box import Box
+
+__version__ = '3.0.0'
+
+# 'Point'와 'Box'는 numpy를, 'camera'는 cv2를 import하므로
+# package import 시점이 아닌 처음 접근될 때 해당 모듈을 load한다.
+_LAZY_ATTRS = {
+    'Size2d': '.size2d',
+    'Point': '.point',
+    'Box': '.box',
+}
+_LAZY_SUBMODULES = {'camera', 'event', 'execution', 'streams', 'async_streams', 'iterables', 'kafka_utils', 'serdes',
+                    'utils', 'clock', 'color'}
+
+
+def __getattr__(name:str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is not None:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    # 다음 접근부터는 '__getattr__'을 거치지 않도록 module 속성으로 등록한다.
+    globals()[name] = value
+    return value
 
-__version__ = '3.0.0'
\ No newline at end of file
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRS, *_LAZY_SUBMODULES})
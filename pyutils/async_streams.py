@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from typing import TypeVar, Optional, Any, Generic
+from collections.abc import Iterable, AsyncIterable, AsyncIterator, Callable, Awaitable
+from collections import deque
+import asyncio
+import inspect
+import heapq
+
+from .streams import Stream, _ReversedKey
+from .typing import SupportsRichComparison
+
+
+S = TypeVar("S")
+T = TypeVar("T")
+K = TypeVar("K")
+
+_DEFAULT_CONCURRENCY = 16
+
+
+async def _from_iterable(src:Iterable[S], in_thread:bool) -> AsyncIterator[S]:
+    if not in_thread:
+        for v in src:
+            yield v
+        return
+
+    # blocking iterator(예: Kafka consumer)는 event loop를 막지 않도록 별도의 thread에서 읽는다.
+    iterator = iter(src)
+    done = object()
+    while (v := await asyncio.to_thread(next, iterator, done)) is not done:
+        yield v     # type: ignore
+
+
+class AsyncStream(Generic[S]):
+    """asyncio counterpart of ``Stream`` over an asynchronous iterable.
+    Like ``Stream``, an AsyncStream can be consumed only once, and the operators returning
+    an AsyncStream are lazy.
+    """
+    __slots__ = ( '__src', )
+
+    def __init__(self, src:AsyncIterable[S]) -> None:
+        super().__init__()
+        self.__src = src if isinstance(src, AsyncIterator) else aiter(src)
+
+    def __aiter__(self) -> AsyncIterator[S]:
+        return self.__src
+
+    async def __anext__(self) -> S:
+        return await anext(self.__src)
+
+    @classmethod
+    def from_iterable(cls, src:Iterable[S], *, in_thread:bool=False) -> AsyncStream[S]:
+        """Creates an AsyncStream of the values of a synchronous iterable (including ``Stream``).
+
+        Args:
+            src (Iterable[S]): source values.
+            in_thread (bool, optional): read the values on a worker thread so that a blocking iterator
+                                        does not block the event loop. Defaults to False.
+
+        Returns:
+            AsyncStream[S]: stream of the values.
+        """
+        return AsyncStream(_from_iterable(src, in_thread))
+
+    def where(self, pred:Callable[[S], bool]) -> AsyncStream[S]:
+        return self.filter(pred)
+
+    def filter(self, pred:Callable[[S], bool]) -> AsyncStream[S]:
+        async def generate() -> AsyncIterator[S]:
+            async for v in self.__src:
+                if pred(v):
+                    yield v
+        return AsyncStream(generate())
+
+    def map(self, mapper:Callable[[S],T]) -> AsyncStream[T]:
+        async def generate() -> AsyncIterator[T]:
+            async for v in self.__src:
+                yield mapper(v)
+        return AsyncStream(generate())
+
+    def flatmap(self, mapper:Callable[[S],Optional[Iterable[T]|AsyncIterable[T]]]) -> AsyncStream[T]:
+        async def generate() -> AsyncIterator[T]:
+            async for v in self.__src:
+                mapped = mapper(v)
+                if mapped is None:
+                    continue
+                elif isinstance(mapped, AsyncIterable):
+                    async for mv in mapped:
+                        yield mv
+                else:
+                    for mv in mapped:
+                        yield mv
+        return AsyncStream(generate())
+
+    def map_async(self, mapper:Callable[[S],Awaitable[T]],
+                  *,
+                  concurrency:int=_DEFAULT_CONCURRENCY,
+                  ordered:bool=True,
+                  max_in_flight:Optional[int]=None) -> AsyncStream[T]:
+        """Awaits ``mapper`` for the values of this stream concurrently.
+        At most ``concurrency`` calls are awaited at a time, and at most ``max_in_flight`` values
+        are taken from the source but not yet consumed, so infinite streams are processed lazily.
+
+        Args:
+            mapper (Callable[[S],Awaitable[T]]): coroutine function mapping a value.
+            concurrency (int, optional): maximum number of concurrent calls. Defaults to 16.
+            ordered (bool, optional): keep the order of the values. If False, the mapped values are
+                    returned in the order of completion. Defaults to True.
+            max_in_flight (Optional[int], optional): maximum number of the values being mapped or waiting
+                    to be consumed. Defaults to twice ``concurrency``.
+
+        Returns:
+            AsyncStream[T]: stream of the mapped values.
+        """
+        if concurrency <= 0:
+            raise ValueError(f'invalid concurrency: {concurrency}')
+        if max_in_flight is None:
+            max_in_flight = 2 * concurrency
+        elif max_in_flight <= 0:
+            raise ValueError(f'invalid max_in_flight: {max_in_flight}')
+
+        async def generate() -> AsyncIterator[T]:
+            semaphore = asyncio.Semaphore(concurrency)
+            async def run(v:S) -> T:
+                async with semaphore:
+                    return await mapper(v)
+
+            pending:deque[asyncio.Future[T]] = deque()
+            async def next_result() -> T:
+                if ordered:
+                    return await pending.popleft()
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                task = next(iter(done))
+                pending.remove(task)
+                return task.result()
+
+            try:
+                async for v in self.__src:
+                    if len(pending) >= max_in_flight:
+                        yield await next_result()
+                    pending.append(asyncio.ensure_future(run(v)))
+                while pending:
+                    yield await next_result()
+            finally:
+                # stream이 중간에 닫히거나 예외가 발생한 경우에는 남은 작업들을 취소한다.
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+        return AsyncStream(generate())
+
+    def take(self, count:int) -> AsyncStream[S]:
+        async def generate() -> AsyncIterator[S]:
+            if count <= 0:
+                return
+            taken = 0
+            async for v in self.__src:
+                yield v
+                taken += 1
+                if taken >= count:
+                    return
+        return AsyncStream(generate())
+
+    def drop(self, count:int) -> AsyncStream[S]:
+        async def generate() -> AsyncIterator[S]:
+            dropped = 0
+            async for v in self.__src:
+                if dropped < count:
+                    dropped += 1
+                else:
+                    yield v
+        return AsyncStream(generate())
+
+    def take_while(self, pred:Callable[[S], bool]) -> AsyncStream[S]:
+        async def generate() -> AsyncIterator[S]:
+            async for v in self.__src:
+                if pred(v):
+                    yield v
+                else:
+                    return
+        return AsyncStream(generate())
+
+    def drop_while(self, pred:Callable[[S], bool]) -> AsyncStream[S]:
+        async def generate() -> AsyncIterator[S]:
+            publishing = False
+            async for v in self.__src:
+                if publishing:
+                    yield v
+                elif not pred(v):
+                    publishing = True
+                    yield v
+        return AsyncStream(generate())
+
+    def zip_index(self, start:int=0) -> AsyncStream[tuple[int,S]]:
+        async def generate() -> AsyncIterator[tuple[int,S]]:
+            index = start
+            async for v in self.__src:
+                yield index, v
+                index += 1
+        return AsyncStream(generate())
+
+    async def groupby(self, keyer:Callable[[S],K]) -> dict[K,list[S]]:
+        groups:dict[K,list[S]] = dict()
+        async for v in self.__src:
+            groups.setdefault(keyer(v), []).append(v)
+        return groups
+
+    async def count(self) -> int:
+        count = 0
+        async for _ in self.__src:
+            count += 1
+        return count
+
+    def top_k(self, k:int, *,
+              key:Optional[Callable[[S],SupportsRichComparison]]=None,
+              reversed:bool=False) -> AsyncStream[S]:
+        """Returns the ``k`` largest values (the smallest ones if ``reversed``) in descending
+        (ascending if ``reversed``) order. Only ``k`` values are kept in a heap while scanning this
+        stream, and values of equal keys keep their order in this stream.
+        """
+        async def generate() -> AsyncIterator[S]:
+            if k <= 0:
+                return
+            # heap의 root에는 지금까지 선택된 값들 중 가장 먼저 밀려날 값이 위치한다.
+            # 순번을 음수로 저장하여 동일한 key의 값들 중에서는 나중에 들어온 값이 먼저 밀려나도록 한다.
+            heap:list[tuple[Any,int,S]] = []
+            seq = 0
+            async for v in self.__src:
+                kv = key(v) if key else v
+                item = (_ReversedKey(kv) if reversed else kv, -seq, v)
+                seq += 1
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
+            for _, _, v in sorted(heap, key=lambda item: item[:2], reverse=True):
+                yield v
+        return AsyncStream(generate())
+
+    def quasi_sort(self, qlen:int, *,
+                   key:Optional[Callable[[S],SupportsRichComparison]]=None,
+                   reversed:bool=False) -> AsyncStream[S]:
+        """Sorts nearly-sorted values with a reorder buffer of ``qlen`` values.
+        Values of equal keys keep their order in this stream.
+        """
+        if qlen <= 0:
+            raise ValueError(f'invalid qlen: {qlen}')
+
+        async def generate() -> AsyncIterator[S]:
+            # 동일한 key의 값들끼리는 입력 순서를 유지하고 값 자체를 비교하지 않도록 순번을 함께 저장한다.
+            heap:list[tuple[Any,int,S]] = []
+            seq = 0
+            async for v in self.__src:
+                k = key(v) if key else v
+                item = (_ReversedKey(k) if reversed else k, seq, v)
+                seq += 1
+                if len(heap) < qlen:
+                    heapq.heappush(heap, item)
+                else:
+                    yield heapq.heappushpop(heap, item)[2]
+            while heap:
+                yield heapq.heappop(heap)[2]
+        return AsyncStream(generate())
+
+    async def find_first(self, pred:Optional[Callable[[S], bool]]=None,
+                         *,
+                         default:Optional[S]=None) -> Optional[S]:
+        async for v in self.__src:
+            if pred is None or pred(v):
+                return v
+        return default
+
+    async def foreach(self, action:Callable[[S],None|Awaitable[None]]) -> None:
+        async for v in self.__src:
+            result = action(v)
+            if inspect.isawaitable(result):
+                await result
+
+    async def to_list(self) -> list[S]:
+        return [v async for v in self.__src]
+
+    async def to_stream(self) -> Stream[S]:
+        """Collects the values of this stream into a (synchronous) ``Stream``."""
+        return Stream(await self.to_list())
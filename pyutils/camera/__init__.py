@@ -1,3 +1,35 @@
-from .types import Image, Frame, Camera, CameraOptions, CRF #, ImageCapture, VideoWriter
-from .image_processor import ImageProcessorOptions, process_images
-# from .image_processor import ImageProcessor, FrameReader, FrameUpdater, FrameProcessor
\ No newline at end of file
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+import importlib
+
+if TYPE_CHECKING:
+    from .types import Image, Frame, Camera, CameraOptions, CRF #, ImageCapture, VideoWriter
+    from .image_processor import ImageProcessorOptions, process_images
+    # from .image_processor import ImageProcessor, FrameReader, FrameUpdater, FrameProcessor
+    from .multi_camera import MultiCameraCapture, FrameBundle
+
+# 아래 속성들은 모두 numpy/cv2를 필요로 하므로 처음 접근될 때 해당 모듈을 load한다.
+_LAZY_ATTRS = {
+    'Image': '.types',
+    'Frame': '.types',
+    'Camera': '.types',
+    'CameraOptions': '.types',
+    'CRF': '.types',
+    'ImageProcessorOptions': '.image_processor',
+    'process_images': '.image_processor',
+    'MultiCameraCapture': '.multi_camera',
+    'FrameBundle': '.multi_camera',
+}
+
+
+def __getattr__(name:str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRS})
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Optional
+from collections.abc import Callable
+from collections import deque
+import threading
+
+from .types import Image, DropPolicy, QueueOverflowError
+
+
+class AsyncImageWriter:
+    """Writes images on a background thread that drains a bounded queue.
+    ``submit()`` returns as soon as the image is queued. When ``queue_size`` images are waiting,
+    the image is handled by the given DropPolicy: BLOCK waits for a room, DROP_NEWEST discards
+    the submitted image, DROP_OLDEST discards the oldest queued image, and RAISE raises
+    QueueOverflowError.
+    """
+    __slots__ = ( '__write', '__queue_size', '__drop_policy', '__cond', '__queue', '__closed', '__failure',
+                  '__queued_count', '__dropped_count', '__written_count', '__thread' )
+
+    def __init__(self, write:Callable[[Image],None], queue_size:int,
+                 *,
+                 drop_policy:DropPolicy=DropPolicy.BLOCK,
+                 name:Optional[str]=None) -> None:
+        if queue_size <= 0:
+            raise ValueError(f'invalid queue_size: {queue_size}')
+
+        self.__write = write
+        self.__queue_size = queue_size
+        self.__drop_policy = drop_policy
+        self.__cond = threading.Condition()
+        self.__queue:deque[Image] = deque()
+        self.__closed = False
+        self.__failure:Optional[Exception] = None
+        self.__queued_count = 0
+        self.__dropped_count = 0
+        self.__written_count = 0
+        self.__thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self.__thread.start()
+
+    @property
+    def drop_policy(self) -> DropPolicy:
+        return self.__drop_policy
+
+    @property
+    def failure(self) -> Optional[Exception]:
+        """Returns the exception raised while writing an image in the background thread, if any."""
+        return self.__failure
+
+    @property
+    def queued_count(self) -> int:
+        """Returns the number of images accepted into the queue."""
+        return self.__queued_count
+
+    @property
+    def dropped_count(self) -> int:
+        """Returns the number of images discarded because of the queue overflow."""
+        return self.__dropped_count
+
+    @property
+    def written_count(self) -> int:
+        """Returns the number of images written by the background thread."""
+        return self.__written_count
+
+    @property
+    def pending_count(self) -> int:
+        """Returns the number of images waiting to be written."""
+        with self.__cond:
+            return len(self.__queue)
+
+    def submit(self, image:Image) -> bool:
+        """Queues an image to be written in the background thread.
+        The caller must not modify the image after submitting it.
+
+        Args:
+            image (Image): image to write.
+
+        Raises:
+            QueueOverflowError: if the queue is full and the drop policy is RAISE.
+            Exception: the exception raised while writing a previous image.
+
+        Returns:
+            bool: True if the image is queued, False if it is discarded.
+        """
+        with self.__cond:
+            if self.__closed:
+                raise ValueError(f'{self.__class__.__name__} has been closed')
+            if self.__failure is not None:
+                raise self.__failure
+
+            if len(self.__queue) >= self.__queue_size:
+                match self.__drop_policy:
+                    case DropPolicy.BLOCK:
+                        while len(self.__queue) >= self.__queue_size and self.__failure is None:
+                            self.__cond.wait()
+                        if self.__failure is not None:
+                            raise self.__failure
+                    case DropPolicy.DROP_NEWEST:
+                        self.__dropped_count += 1
+                        return False
+                    case DropPolicy.DROP_OLDEST:
+                        self.__queue.popleft()
+                        self.__dropped_count += 1
+                    case DropPolicy.RAISE:
+                        raise QueueOverflowError(f'write queue is full: size={self.__queue_size}')
+
+            self.__queue.append(image)
+            self.__queued_count += 1
+            self.__cond.notify_all()
+            return True
+
+    def close(self) -> None:
+        """Waits until all the queued images are written and stops the background thread.
+
+        Raises:
+            Exception: the exception raised while writing an image in the background thread.
+        """
+        with self.__cond:
+            self.__closed = True
+            self.__cond.notify_all()
+        self.__thread.join()
+        if self.__failure is not None:
+            raise self.__failure
+
+    def __run(self) -> None:
+        while True:
+            with self.__cond:
+                while not self.__queue and not self.__closed:
+                    self.__cond.wait()
+                if not self.__queue:
+                    return
+                image = self.__queue.popleft()
+                self.__cond.notify_all()
+
+            try:
+                self.__write(image)
+            except Exception as e:
+                # 오류가 발생한 이후에는 submit()이 block되지 않도록 queue의 image들을 버린다.
+                with self.__cond:
+                    self.__failure = e
+                    self.__queue.clear()
+                    self.__cond.notify_all()
+                return
+            with self.__cond:
+                self.__written_count += 1
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(queued={self.__queued_count}, dropped={self.__dropped_count}, '
+                f'written={self.__written_count}, policy={self.__drop_policy.name})')
@@ -18,6 +18,17 @@ def is_rtsp_camera(uri:str):
     '''Determines whether the camera of the give URI is a remote one accessed by the RTSP protocol.'''
     return uri.startswith('rtsp://')
 
+def is_live_camera(uri:str):
+    '''Determines whether the camera of the given URI delivers live frames or not.
+    Video files and RTSP playbacks of a recorded range ('start='/'&end=') are not live.'''
+    if is_local_camera(uri):
+        return True
+    return is_rtsp_camera(uri) and uri.find("&end=") < 0 and uri.find("start=") < 0
+
+def is_frame_bus(uri:str):
+    '''Determines whether the images are read from a shared-memory frame bus or not.'''
+    return uri.startswith('bus://')
+
  
 def load_camera(camera_uri:str, **options) -> Camera:
     """Create an OpenCvCamera object of the given URI.
@@ -34,15 +45,30 @@ def load_camera(camera_uri:str, **options) -> Camera:
         sync (bool): synchronized image capturing or not
         begin_frame (int): the first frame to capture.
         end_frame (int): the last frame to capture.
+        prefetch (int): number of frames to decode ahead on a background thread (0 disables prefetching).
+        ring_size (int): number of image buffers reused in turn by an ffmpeg-decoded camera
+                (default: prefetch + 3). A captured image is overwritten ``ring_size`` grabs later.
+        keyframe_index (bool): use a persistent frame index stored next to the video file for seeking.
+        capture_policy (str): frames to deliver: 'all', 'latest', 'stride:<N>' or 'adaptive:<target fps>'.
+        reconnect (bool): reopen a live camera with exponential backoff when its capture fails or stalls.
 
     Returns:
         OpenCvCamera: an OpenCvCamera object.
-        If URI points to a video file, ``OpenCvVideFile`` object is returned. Otherwise,
-        ``OpenCvCamera`` is returned.
+        If URI points to a video file, ``OpenCvVideFile`` object is returned.
+        If URI is 'bus://<name>', ``FrameBusCamera`` reading the frame bus of the name is returned.
+        Otherwise, ``OpenCvCamera`` is returned.
+        If ``reconnect`` is set, the camera is wrapped by ``ReconnectingCamera``.
     """
-    from .opencv_camera import OpenCvCamera, VideoFile
-    
     cam_opts = CameraOptions(**options)
+    camera = _load_camera(camera_uri, cam_opts)
+    if cam_opts.get('reconnect', False):
+        from .reconnecting_camera import ReconnectingCamera
+        return ReconnectingCamera(camera)
+    else:
+        return camera
+    
+def _load_camera(camera_uri:str, cam_opts:CameraOptions) -> Camera:
+    from .opencv_camera import OpenCvCamera, VideoFile
     
     if is_local_camera(camera_uri):
         return OpenCvCamera(camera_uri, cam_opts)
@@ -54,5 +80,8 @@ def load_camera(camera_uri:str, **options) -> Camera:
             return FFMPEGCamera(camera_uri, cam_opts)
         else:
             return OpenCvCamera(camera_uri, cam_opts)
+    elif is_frame_bus(camera_uri):
+        from .frame_bus import FrameBusCamera
+        return FrameBusCamera(camera_uri[len('bus://'):])
     else:
         raise ValueError(f'invalid Camera URI: {camera_uri}')
\ No newline at end of file
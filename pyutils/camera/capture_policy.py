@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import math
+
+
+class CapturePolicy(ABC):
+    """Policy deciding which source frames an ImageCapture delivers.
+    Skipped frames still advance ``Frame.index``, so that it keeps reflecting the source frame number.
+    """
+    @abstractmethod
+    def frames_to_skip(self, source_fps:int) -> int:
+        """Returns the number of source frames to discard before capturing the next frame.
+
+        Args:
+            source_fps (int): fps of the image source.
+
+        Returns:
+            int: number of frames to skip.
+        """
+        pass
+
+    @property
+    def latest_only(self) -> bool:
+        """Returns whether only the most recent frame of the source should be delivered."""
+        return False
+
+    def update_processing_fps(self, fps:float) -> None:
+        """Notifies the measured frame processing rate.
+
+        Args:
+            fps (float): measured frames per second.
+        """
+        pass
+
+    @staticmethod
+    def parse(expr:str|CapturePolicy) -> CapturePolicy:
+        """Parses a capture policy expression.
+        The expression is one of 'all', 'latest', 'stride:<N>', and 'adaptive:<target fps>'.
+
+        Args:
+            expr (str|CapturePolicy): capture policy expression.
+
+        Returns:
+            CapturePolicy: capture policy.
+        """
+        if isinstance(expr, CapturePolicy):
+            return expr
+
+        name, _, arg = expr.partition(':')
+        match name.strip().lower():
+            case 'all':
+                return AllFrames()
+            case 'latest':
+                return LatestFrame()
+            case 'stride':
+                return FixedStride(int(arg))
+            case 'adaptive':
+                return AdaptiveRate(float(arg))
+            case _:
+                raise ValueError(f'invalid capture policy: {expr}')
+
+
+class AllFrames(CapturePolicy):
+    def frames_to_skip(self, source_fps:int) -> int:
+        return 0
+
+    def __repr__(self) -> str:
+        return 'all'
+
+
+class LatestFrame(CapturePolicy):
+    """Delivers only the most recent frame. Frames decoded while the consumer is busy are discarded."""
+    def frames_to_skip(self, source_fps:int) -> int:
+        return 0
+
+    @property
+    def latest_only(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return 'latest'
+
+
+class FixedStride(CapturePolicy):
+    """Delivers every N-th frame."""
+    __slots__ = ( 'stride', )
+
+    def __init__(self, stride:int) -> None:
+        if stride <= 0:
+            raise ValueError(f'invalid stride: {stride}')
+        self.stride = stride
+
+    def frames_to_skip(self, source_fps:int) -> int:
+        return self.stride - 1
+
+    def __repr__(self) -> str:
+        return f'stride:{self.stride}'
+
+
+# 측정 fps가 기대 fps의 아래 비율보다 낮으면 stride를 증가시키고, 위 비율보다 높으면 감소시킨다.
+_SLOWDOWN_RATIO = 0.9
+_SPEEDUP_RATIO = 0.98
+
+class AdaptiveRate(CapturePolicy):
+    """Adjusts the frame stride so that frames are delivered no faster than ``target_fps``
+    and no faster than they are processed.
+    The stride is re-evaluated about once per second of delivered frames.
+    """
+    __slots__ = ( 'target_fps', '__stride', '__processing_fps', '__countdown' )
+
+    def __init__(self, target_fps:float) -> None:
+        if target_fps <= 0:
+            raise ValueError(f'invalid target fps: {target_fps}')
+        self.target_fps = target_fps
+        self.__stride = 0
+        self.__processing_fps = 0.0
+        self.__countdown = 0
+
+    @property
+    def stride(self) -> int:
+        return self.__stride
+
+    def update_processing_fps(self, fps:float) -> None:
+        self.__processing_fps = fps
+
+    def frames_to_skip(self, source_fps:int) -> int:
+        min_stride = max(1, math.ceil(source_fps / self.target_fps))
+        if self.__stride < min_stride:
+            self.__stride = min_stride
+
+        self.__countdown -= 1
+        if self.__countdown <= 0 and self.__processing_fps > 0:
+            expected_fps = source_fps / self.__stride
+            if self.__processing_fps < expected_fps * _SLOWDOWN_RATIO:
+                self.__stride = max(self.__stride + 1, math.ceil(source_fps / self.__processing_fps))
+            elif self.__processing_fps >= expected_fps * _SPEEDUP_RATIO and self.__stride > min_stride:
+                self.__stride -= 1
+            self.__countdown = max(1, round(source_fps / self.__stride))
+
+        return self.__stride - 1
+
+    def __repr__(self) -> str:
+        return f'adaptive:{self.target_fps}(stride={self.__stride})'
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from typing import Optional
+from collections.abc import Callable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from contextlib import suppress
+import threading
+import logging
+
+import numpy as np
+import cv2
+
+from ..size2di import Size2di
+from .types import Image, Frame, VideoWriter
+from .image_processor import FrameReader, ImageProcessor
+from .segment_writer import segment_file_name, create_opencv_writer
+
+
+@dataclass(frozen=True, slots=True)
+class _BufferedFrame:
+    index: int
+    ts: float
+    data: np.ndarray = field(repr=False)
+    '''JPEG-encoded bytes, or a copy of the raw image if JPEG compression is disabled.'''
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+
+def _create_sync_writer(path:str, fps:int, image_size:Size2di) -> VideoWriter:
+    # clip은 이미 자신의 background thread에서 기록되므로, writer에서 다시 복사하여 queue에 넣지 않는다.
+    return create_opencv_writer(path, fps, image_size, queue_size=0)
+
+
+class _ClipWriter:
+    """Background thread creating the VideoWriter of a clip, flushing the pre-roll frames into it,
+    and then writing the frames queued by ``write()``.
+    """
+    __slots__ = ( 'path', '__create_writer', '__decode', '__max_pending_bytes', '__cond', '__queue',
+                  '__pending_bytes', '__closed', '__failure', '__thread' )
+
+    def __init__(self, path:Path, create_writer:Callable[[],VideoWriter], pre_roll:deque[_BufferedFrame],
+                 decode:Callable[[_BufferedFrame],Image], max_pending_bytes:int) -> None:
+        self.path = path
+        self.__create_writer = create_writer
+        self.__decode = decode
+        self.__max_pending_bytes = max_pending_bytes
+        self.__cond = threading.Condition()
+        self.__queue:deque[_BufferedFrame|Image] = deque(pre_roll)
+        self.__pending_bytes = sum(buffered.nbytes for buffered in pre_roll)
+        self.__closed = False
+        self.__failure:Optional[Exception] = None
+        self.__thread = threading.Thread(target=self.__run, name='event-clip-writer', daemon=True)
+        self.__thread.start()
+
+    def write(self, image:Image) -> None:
+        with self.__cond:
+            if self.__failure is not None:
+                raise self.__failure
+            # pre-roll을 기록하는 동안 쌓이는 frame들의 memory 사용량이 한도를 넘으면 대기한다.
+            while self.__pending_bytes > self.__max_pending_bytes and self.__failure is None:
+                self.__cond.wait()
+            if self.__failure is not None:
+                raise self.__failure
+
+            # 호출자가 image buffer를 재사용할 수 있기 때문에 복사본을 넣는다.
+            image = np.array(image, copy=True)
+            self.__queue.append(image)
+            self.__pending_bytes += image.nbytes
+            self.__cond.notify_all()
+
+    def close(self) -> None:
+        """Waits until all the queued frames are written and closes the VideoWriter.
+
+        Raises:
+            Exception: the exception raised while creating or writing the clip.
+        """
+        with self.__cond:
+            self.__closed = True
+            self.__cond.notify_all()
+        self.__thread.join()
+        if self.__failure is not None:
+            raise self.__failure
+
+    def __run(self) -> None:
+        writer:Optional[VideoWriter] = None
+        try:
+            writer = self.__create_writer()
+            while True:
+                with self.__cond:
+                    while not self.__queue and not self.__closed:
+                        self.__cond.wait()
+                    if not self.__queue:
+                        break
+                    item = self.__queue.popleft()
+
+                image = self.__decode(item) if isinstance(item, _BufferedFrame) else item
+                writer.write(image)
+                with self.__cond:
+                    self.__pending_bytes -= item.nbytes
+                    self.__cond.notify_all()
+            writer.close()
+        except Exception as e:
+            # 오류가 발생한 이후에는 write()가 block되지 않도록 queue의 frame들을 버린다.
+            with self.__cond:
+                self.__failure = e
+                self.__queue.clear()
+                self.__pending_bytes = 0
+                self.__cond.notify_all()
+            if writer is not None and writer.is_open():
+                with suppress(Exception): writer.close()
+
+
+class EventRecorder(FrameReader):
+    """FrameReader recording video clips around the frames selected by a trigger predicate.
+    The frames of the last ``pre_seconds`` are kept in a memory-bounded ring buffer, compressed to
+    JPEG unless ``jpeg_quality`` is None. When ``trigger`` returns True for a frame, a clip named by
+    the timestamp of the triggering frame is started with the buffered (pre-roll) frames, and the
+    following frames are written until ``post_seconds`` passes after the last triggering frame.
+    A clip is written on a background thread, which first flushes the pre-roll frames, so that
+    starting a clip does not delay the frame processing.
+    """
+    __slots__ = ( 'output_dir', 'trigger', 'pre_seconds', 'post_seconds', 'max_buffer_bytes', 'jpeg_quality',
+                  'prefix', 'suffix', 'logger', '__writer_factory', '__fps', '__image_size', '__buffer',
+                  '__buffer_bytes', '__clip', '__record_until', '__event_count', '__closer' )
+
+    def __init__(self, output_dir:str|Path, trigger:Callable[[Frame],bool],
+                 *,
+                 pre_seconds:float=5,
+                 post_seconds:float=5,
+                 max_buffer_bytes:int=64*1024*1024,
+                 jpeg_quality:Optional[int]=90,
+                 prefix:str='event-',
+                 suffix:str='.mp4',
+                 writer_factory:Optional[Callable[[str,int,Size2di],VideoWriter]]=None,
+                 logger:Optional[logging.Logger]=None) -> None:
+        """Creates an EventRecorder.
+
+        Args:
+            output_dir (str|Path): directory where the clips are written.
+            trigger (Callable[[Frame],bool]): predicate selecting the frames that start or extend a clip.
+            pre_seconds (float, optional): length of the pre-roll in seconds. Defaults to 5.
+            post_seconds (float, optional): length of the post-roll in seconds. Defaults to 5.
+            max_buffer_bytes (int, optional): maximum memory used by the pre-roll buffer. Defaults to 64MB.
+            jpeg_quality (Optional[int], optional): JPEG quality of the buffered frames.
+                        If None, frames are buffered uncompressed. Defaults to 90.
+            prefix (str, optional): prefix of the clip file names. Defaults to 'event-'.
+            suffix (str, optional): suffix of the clip file names. Defaults to '.mp4'.
+            writer_factory (Optional[Callable[[str,int,Size2di],VideoWriter]], optional): function creating
+                    the VideoWriter of a clip from its path, fps and image size.
+                    The writer is used only by the clip's background thread, so a synchronous writer
+                    is enough. Defaults to a synchronous OpenCvVideoWriter.
+            logger (Optional[logging.Logger], optional): logger. Defaults to None.
+        """
+        if pre_seconds < 0 or post_seconds < 0:
+            raise ValueError(f'invalid pre/post seconds: pre={pre_seconds}, post={post_seconds}')
+        if max_buffer_bytes <= 0:
+            raise ValueError(f'invalid max_buffer_bytes: {max_buffer_bytes}')
+        if jpeg_quality is not None and not (0 <= jpeg_quality <= 100):
+            raise ValueError(f'invalid jpeg_quality: {jpeg_quality}')
+
+        self.output_dir = Path(output_dir)
+        self.trigger = trigger
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.max_buffer_bytes = max_buffer_bytes
+        self.jpeg_quality = jpeg_quality
+        self.prefix = prefix
+        self.suffix = suffix
+        self.logger = logger
+        self.__writer_factory = writer_factory if writer_factory else _create_sync_writer
+        self.__fps = 0
+        self.__image_size:Optional[Size2di] = None
+        self.__buffer:deque[_BufferedFrame] = deque()
+        self.__buffer_bytes = 0
+        self.__clip:Optional[_ClipWriter] = None
+        self.__record_until = 0.0
+        self.__event_count = 0
+        self.__closer:Optional[ThreadPoolExecutor] = None
+
+    def open(self, img_proc:ImageProcessor) -> None:
+        self.__fps = img_proc.capture.fps
+        self.__image_size = img_proc.show_size if img_proc.show_size else img_proc.image_size
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.__closer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='event-closer')
+
+    def close(self) -> None:
+        if self.__closer is None:
+            return
+
+        if self.__clip is not None:
+            self.__finish_clip()
+        self.__closer.shutdown(wait=True)
+        self.__closer = None
+        self.__buffer.clear()
+        self.__buffer_bytes = 0
+
+    @property
+    def recording(self) -> bool:
+        """Returns whether a clip is being recorded."""
+        return self.__clip is not None
+
+    @property
+    def event_count(self) -> int:
+        """Returns the number of clips started."""
+        return self.__event_count
+
+    @property
+    def buffer_bytes(self) -> int:
+        """Returns the memory used by the pre-roll buffer."""
+        return self.__buffer_bytes
+
+    def read(self, frame:Frame) -> None:
+        if self.__closer is None:
+            raise ValueError(f'EventRecorder has not been started')
+
+        if self.trigger(frame):
+            if self.__clip is None:
+                self.__start_clip(frame)
+            self.__record_until = frame.ts + self.post_seconds * 1000
+        elif self.__clip is not None and frame.ts > self.__record_until:
+            self.__finish_clip()
+
+        if self.__clip is not None:
+            self.__clip.write(frame.image)
+        else:
+            self.__push(frame)
+
+    def __push(self, frame:Frame) -> None:
+        if self.pre_seconds <= 0:
+            return
+
+        if self.jpeg_quality is not None:
+            ok, data = cv2.imencode('.jpg', frame.image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                raise IOError(f'fails to encode a frame: index={frame.index}')
+        else:
+            # 호출자가 image buffer를 재사용할 수 있기 때문에 복사본을 보관한다.
+            data = np.array(frame.image, copy=True)
+        self.__buffer.append(_BufferedFrame(index=frame.index, ts=frame.ts, data=data))
+        self.__buffer_bytes += data.nbytes
+
+        # pre-roll 구간을 벗어나거나 memory 한도를 넘는 오래된 frame들은 버린다.
+        min_ts = frame.ts - self.pre_seconds * 1000
+        while self.__buffer and (self.__buffer[0].ts < min_ts or self.__buffer_bytes > self.max_buffer_bytes):
+            self.__buffer_bytes -= self.__buffer.popleft().nbytes
+
+    def __start_clip(self, frame:Frame) -> None:
+        path = self.output_dir / segment_file_name(frame.ts, prefix=self.prefix, suffix=self.suffix)
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'started an event clip: {path}, trigger=#{frame.index}, '
+                             f'pre_roll={len(self.__buffer)} frames')
+
+        # writer 생성과 pre-roll frame들의 decoding 및 기록은 clip의 background thread에서 수행한다.
+        def create_writer() -> VideoWriter:
+            return self.__writer_factory(str(path), self.__fps, self.__image_size)     # type: ignore
+        pre_roll, self.__buffer = self.__buffer, deque()
+        self.__buffer_bytes = 0
+        self.__clip = _ClipWriter(path, create_writer, pre_roll, self.__decode, self.max_buffer_bytes)
+        self.__event_count += 1
+
+    def __decode(self, buffered:_BufferedFrame) -> Image:
+        if self.jpeg_quality is None:
+            return buffered.data
+        image = cv2.imdecode(buffered.data, cv2.IMREAD_COLOR)
+        if image is None:
+            raise IOError(f'fails to decode a buffered frame: index={buffered.index}')
+        return image
+
+    def __finish_clip(self) -> None:
+        clip, self.__clip = self.__clip, None
+        # clip은 background thread에서 닫아 frame 처리가 지연되지 않도록 한다.
+        self.__closer.submit(self.__close_clip, clip)     # type: ignore
+
+    def __close_clip(self, clip:_ClipWriter) -> None:
+        try:
+            clip.close()
+            if self.logger and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f'closed an event clip: {clip.path}')
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f'fails to close event clip: {clip.path}, cause={e}')
+
+    def __repr__(self) -> str:
+        state = 'recording' if self.recording else 'buffering'
+        return (f'{self.__class__.__name__}({state}, dir={self.output_dir}, pre={self.pre_seconds}s, '
+                f'post={self.post_seconds}s, events={self.__event_count})')
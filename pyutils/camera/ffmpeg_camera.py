@@ -10,6 +10,12 @@ from ..size2di import Size2di
 from .. import iterables
 from .types import Camera, CameraOptions, Image
 from .utils import SyncableImageCapture
+from .capture_policy import CapturePolicy
+
+
+# 호출자가 사용 중인 frame과 ffmpeg pipe로부터 채워지고 있는 frame을 위해
+# prefetch된 frame 수 이외에 추가로 할당하는 buffer의 수.
+_EXTRA_RING_BUFFERS = 3
 
 
 def eval_ratio(ratio_str:str) -> float:
@@ -18,7 +24,17 @@ def eval_ratio(ratio_str:str) -> float:
     
 
 class FFMPEGCamera(Camera):
-    __slots__ = '__uri', 'cap_info', '__image_size', '__fps', '__sync', '__pipeline', '__init_ts_expr'
+    """Camera decoding an H.264 stream (RTSP or file) with an ffmpeg subprocess.
+
+    Besides the common camera options, the ``ring_size`` option sets the number of
+    pre-allocated buffers the decoded frames are read into (default: ``prefetch + 3``).
+    The buffers are reused in turn, so the image of a captured frame is overwritten
+    ``ring_size`` grabs later (see ``FFMPEGCameraCapture.image_reuse_interval``).
+    A consumer that keeps more frames than that (e.g. in a queue) must copy the images
+    or use a larger ``ring_size``.
+    """
+    __slots__ = ( '__uri', 'cap_info', '__frame_size', '__image_size', '__fps', '__sync', '__pipeline',
+                  '__init_ts_expr', '__prefetch', '__ring_size', '__capture_policy' )
     
     def __init__(self, uri:str, options:CameraOptions):
         super().__init__()
@@ -26,7 +42,8 @@ class FFMPEGCamera(Camera):
         self.__uri = uri
         probe = ffmpeg.probe(uri)
         _, self.cap_info = iterables.find_first(probe['streams'], lambda s: s['codec_name'] == 'h264')
-        self.__image_size = Size2di(self.cap_info['width'], self.cap_info['height']) # type: ignore
+        self.__frame_size = Size2di(self.cap_info['width'], self.cap_info['height']) # type: ignore
+        self.__image_size:Size2di = options.get('image_size', self.__frame_size)
         self.__fps = int(eval_ratio(self.cap_info['r_frame_rate'])) # type: ignore
         self.__sync = options.get('sync', False)
         self.__pipeline = (
@@ -36,6 +53,9 @@ class FFMPEGCamera(Camera):
         )
         
         self.__init_ts_expr = options.get('init_ts', 'open')
+        self.__prefetch = options.get('prefetch', 0)
+        self.__ring_size = options.get('ring_size', self.__prefetch + _EXTRA_RING_BUFFERS)
+        self.__capture_policy:Optional[str|CapturePolicy] = options.get('capture_policy')
 
     def open(self) -> FFMPEGCameraCapture:
         return FFMPEGCameraCapture(self, self.cap_info, self.pipeline)
@@ -44,6 +64,15 @@ class FFMPEGCamera(Camera):
     def uri(self) -> str:
         return self.__uri
 
+    @property
+    def frame_size(self) -> Size2di:
+        """Returns the size of the raw frames decoded by ffmpeg.
+
+        Returns:
+            Size2di: probed frame size.
+        """
+        return self.__frame_size
+
     @property
     def image_size(self) -> Size2di:
         return self.__image_size
@@ -59,6 +88,18 @@ class FFMPEGCamera(Camera):
     @property
     def init_ts_expr(self) -> str:
         return self.__init_ts_expr
+        
+    @property
+    def prefetch(self) -> int:
+        return self.__prefetch
+        
+    @property
+    def ring_size(self) -> int:
+        return self.__ring_size
+        
+    @property
+    def capture_policy(self) -> Optional[str|CapturePolicy]:
+        return self.__capture_policy
 
     @property
     def pipeline(self):
@@ -66,15 +107,22 @@ class FFMPEGCamera(Camera):
         
 
 class FFMPEGCameraCapture(SyncableImageCapture):
-    __slots__ = ( '__camera', '__process', '__image_bytes' )
+    __slots__ = ( '__camera', '__process', '__buffers', '__buffer_index', '__resize' )
 
     def __init__(self, camera:FFMPEGCamera, cap_info, pipeline) -> None:
-        super().__init__(init_ts_expr=camera.init_ts_expr, init_frame_index=1)
+        super().__init__(init_ts_expr=camera.init_ts_expr, init_frame_index=1, prefetch=camera.prefetch,
+                         capture_policy=camera.capture_policy)
         
         self.__camera = camera
         self.__process = pipeline.run_async(pipe_stdout=True)
-        self.__image_bytes = camera.image_size.area() * 3
-        self.__shape = [self.image_size.height, self.image_size.width, 3]
+        
+        # ffmpeg pipe로부터 읽은 frame은 미리 할당된 buffer들에 순환적으로 저장된다.
+        # 그러므로 반환된 image는 'ring_size'번의 grab 이후에는 덮어쓰이게 된다.
+        frame_size = camera.frame_size
+        shape = (frame_size.height, frame_size.width, 3)
+        self.__buffers = [np.empty(shape, dtype=np.uint8) for _ in range(camera.ring_size)]
+        self.__buffer_index = 0
+        self.__resize = frame_size != camera.image_size
 
     def close_in_guard(self) -> None:
         self.__process.stdout.close()
@@ -108,9 +156,34 @@ class FFMPEGCameraCapture(SyncableImageCapture):
         return f'{self.__class__.__name__}({self.repr_str})'
     
     def grab_image(self) -> Optional[Image]:
-        image_bytes = self.__process.stdout.read(self.__image_bytes)
-        if not image_bytes:
+        buffer = self.__buffers[self.__buffer_index]
+        if not self.__read_into(buffer):
             return None
+        self.__buffer_index = (self.__buffer_index + 1) % len(self.__buffers)
         
-        in_frame = np.frombuffer(image_bytes, np.uint8).reshape(self.__shape)
-        return cv2.resize(in_frame, self.image_size)
\ No newline at end of file
+        return cv2.resize(buffer, self.image_size) if self.__resize else buffer
+
+    def skip_image(self) -> bool:
+        # 건너뛰는 frame은 다음 grab에서 덮어쓸 buffer에 읽어 반환된 image들이 덮어쓰이지 않도록 한다.
+        return self.__read_into(self.__buffers[self.__buffer_index])
+
+    @property
+    def image_reuse_interval(self) -> Optional[int]:
+        if self.__resize:
+            return None
+        if self.capture_policy.latest_only:
+            # prefetch thread가 호출자와 무관하게 계속 grab하므로 반환된 image의 유효 기간을 보장할 수 없다.
+            return 0
+        # prefetch queue에 대기 중인 frame들과 prefetch thread가 grab 중인 frame도 buffer를 점유한다.
+        held = self.prefetch + 1 if self.prefetch > 0 else 0
+        return max(len(self.__buffers) - held, 0)
+    
+    def __read_into(self, buffer:np.ndarray) -> bool:
+        view = memoryview(buffer).cast('B')
+        nread = 0
+        while nread < len(view):
+            n = self.__process.stdout.readinto(view[nread:])
+            if not n:
+                return False
+            nread += n
+        return True
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from typing import Optional
+from contextlib import suppress
+from pathlib import Path
+import logging
+
+import ffmpeg
+import numpy as np
+import cv2
+
+from ..size2di import Size2di
+from .types import Image, Frame, VideoWriter, CRF, DropPolicy
+from .image_processor import FrameReader, ImageProcessor
+from .async_writer import AsyncImageWriter
+
+
+_DEFAULT_QUEUE_SIZE = 16
+
+
+class FFMPEGVideoWriter(VideoWriter):
+    """VideoWriter encoding frames with x264 through an ffmpeg subprocess.
+    Raw BGR images are streamed into the stdin of the ffmpeg process by a dedicated writer thread,
+    which drains a bounded queue of images. When the queue is full, the image is handled according
+    to ``drop_policy``.
+    """
+    __slots__ = ( 'crf', 'preset', 'tune', '__path', '__fps', '__image_size', '__process', '__async_writer' )
+
+    def __init__(self, video_file:str, fps:int, image_size:Size2di,
+                 *,
+                 crf:CRF=CRF.FFMPEG,
+                 preset:Optional[str]=None,
+                 tune:Optional[str]=None,
+                 queue_size:int=_DEFAULT_QUEUE_SIZE,
+                 drop_policy:DropPolicy=DropPolicy.BLOCK) -> None:
+        """Creates an FFMPEGVideoWriter and starts the ffmpeg encoder process.
+
+        Args:
+            video_file (str): path to the output video file.
+            fps (int): frames per second.
+            image_size (Size2di): size of the images to write.
+            crf (CRF, optional): constant rate factor of x264. Defaults to CRF.FFMPEG.
+            preset (Optional[str], optional): x264 preset (e.g. 'veryfast'). Defaults to None.
+            tune (Optional[str], optional): x264 tune (e.g. 'zerolatency'). Defaults to None.
+            queue_size (int, optional): maximum number of images waiting to be encoded. Defaults to 16.
+            drop_policy (DropPolicy, optional): policy applied when the queue is full. Defaults to DropPolicy.BLOCK.
+        """
+        if crf == CRF.OPENCV:
+            raise ValueError(f'invalid CRF for ffmpeg: {crf}')
+
+        path = Path(video_file)
+        self.__path = str(path.resolve())
+        self.__fps = fps
+        self.__image_size = image_size
+        self.crf = crf
+        self.preset = preset
+        self.tune = tune
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        output_args = {'vcodec': 'libx264', 'pix_fmt': 'yuv420p', 'crf': crf.value}
+        if preset:
+            output_args['preset'] = preset
+        if tune:
+            output_args['tune'] = tune
+        self.__process = (
+            ffmpeg.input('pipe:', format='rawvideo', pix_fmt='bgr24',
+                         s=f'{image_size.width}x{image_size.height}', framerate=fps)
+                    .output(self.__path, **output_args)
+                    .global_args('-loglevel', 'error')
+                    .overwrite_output()
+                    .run_async(pipe_stdin=True)
+        )
+
+        stdin = self.__process.stdin
+        self.__async_writer = AsyncImageWriter(lambda image: stdin.write(memoryview(image)), queue_size,
+                                               drop_policy=drop_policy, name='ffmpeg-writer')
+
+    def close(self) -> None:
+        """Closes this writer after all queued images are encoded.
+
+        Raises:
+            IOError: if the ffmpeg process fails.
+        """
+        if self.__process is None:
+            return
+
+        process, self.__process = self.__process, None
+        failure:Optional[Exception] = None
+        try:
+            self.__async_writer.close()
+        except Exception as e:
+            failure = e
+        with suppress(Exception): process.stdin.close()
+        returncode = process.wait()
+        if failure is not None:
+            raise IOError(f'fails to write video: path={self.__path}, cause={failure}')
+        if returncode != 0:
+            raise IOError(f'ffmpeg failed: path={self.__path}, returncode={returncode}')
+
+    def is_open(self) -> bool:
+        return self.__process is not None
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def fps(self) -> int:
+        return self.__fps
+
+    @property
+    def image_size(self) -> Size2di:
+        return self.__image_size
+
+    @property
+    def queued_count(self) -> int:
+        """Returns the number of images accepted by ``write()``."""
+        return self.__async_writer.queued_count
+
+    @property
+    def dropped_count(self) -> int:
+        """Returns the number of images discarded because of the queue overflow."""
+        return self.__async_writer.dropped_count
+
+    @property
+    def encoded_count(self) -> int:
+        """Returns the number of images streamed into the encoder."""
+        return self.__async_writer.written_count
+
+    def write(self, image:Image) -> None:
+        assert self.__process, "not opened."
+        if (failure := self.__async_writer.failure) is not None:
+            raise IOError(f'fails to write video: path={self.__path}, cause={failure}')
+
+        # 호출자가 image buffer를 재사용할 수 있기 때문에 queue에는 복사본을 넣는다.
+        h, w = image.shape[:2]
+        if w != self.__image_size.width or h != self.__image_size.height:
+            image = cv2.resize(image, self.__image_size)
+        else:
+            image = np.array(image, copy=True, order='C')
+        self.__async_writer.submit(image)
+
+    def __repr__(self) -> str:
+        state = 'opened' if self.is_open() else 'closed'
+        return f'{self.__class__.__name__}({state}, path={self.path}, crf={self.crf.name}, fps={self.fps})'
+
+
+class FFMPEGWriteProcessor(FrameReader):
+    __slots__ = ( 'path', 'crf', 'preset', 'tune', 'queue_size', 'drop_policy', 'logger', '__writer' )
+
+    def __init__(self, path:str,
+                 *,
+                 crf:CRF=CRF.FFMPEG,
+                 preset:Optional[str]=None,
+                 tune:Optional[str]=None,
+                 queue_size:int=_DEFAULT_QUEUE_SIZE,
+                 drop_policy:DropPolicy=DropPolicy.BLOCK,
+                 logger:Optional[logging.Logger]=None) -> None:
+        if queue_size <= 0:
+            raise ValueError(f'invalid queue_size: {queue_size}, the ffmpeg writer requires a positive queue size')
+
+        self.path = path
+        self.crf = crf
+        self.preset = preset
+        self.tune = tune
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+        self.logger = logger
+        self.__writer:Optional[FFMPEGVideoWriter] = None
+
+    def open(self, img_proc:ImageProcessor) -> None:
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'opening video file: {self.path}, crf={self.crf.name}')
+        img_sz = img_proc.show_size if img_proc.show_size else img_proc.image_size
+        self.__writer = FFMPEGVideoWriter(self.path, img_proc.capture.fps, img_sz,
+                                          crf=self.crf, preset=self.preset, tune=self.tune,
+                                          queue_size=self.queue_size, drop_policy=self.drop_policy)
+
+    def close(self) -> None:
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'closing video file: {self.path}')
+        if self.__writer:
+            writer, self.__writer = self.__writer, None
+            try:
+                writer.close()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f'fails to close video file: {self.path}, cause={e}')
+            if self.logger and self.logger.isEnabledFor(logging.INFO) and writer.dropped_count > 0:
+                self.logger.info(f'dropped frames: path={self.path}, count={writer.dropped_count}')
+
+    def read(self, frame:Frame) -> None:
+        if self.__writer is None:
+            raise ValueError(f'FFMPEGWriteProcessor has not been started')
+        self.__writer.write(frame.image)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from typing import Optional
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+import cv2
+
+from ..size2di import Size2di
+from .types import Frame
+
+
+@dataclass(frozen=True, slots=True)
+class FrameBatch:
+    """A batch of frames converted into a single NCHW array.
+
+    Attributes:
+        tensor (np.ndarray): converted images of shape (N, C, H, W).
+        indexes (list[int]): frame indexes of the images.
+        tss (list[float]): timestamps of the images.
+        scales (list[tuple[float,float]]): (x, y) resize ratio applied to each image.
+        offsets (list[tuple[int,int]]): (x, y) position of each resized image in the letterboxed canvas.
+    """
+    tensor: np.ndarray = field(repr=False)
+    indexes: list[int]
+    tss: list[float] = field(repr=False)
+    scales: list[tuple[float,float]] = field(repr=False)
+    offsets: list[tuple[int,int]] = field(repr=False)
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+
+class FrameBatcher:
+    """Collects frames into batches of preprocessed images for batched inference.
+    Each image is resized (keeping its aspect ratio and padding the rest if ``letterbox`` is set)
+    into a preallocated canvas, and the whole batch is then converted into a preallocated
+    contiguous NCHW array in a few vectorized operations: optional BGR to RGB conversion,
+    multiplication by ``scale``, and normalization with ``mean`` and ``std``.
+
+    Unless ``reuse_buffer`` is False, the tensor of a batch is overwritten by the next batch.
+    """
+    __slots__ = ( 'batch_size', 'target_size', 'letterbox', 'pad_value', 'to_rgb', 'scale', 'reuse_buffer',
+                  '__mean', '__std', '__dtype', '__canvas', '__tensor', '__staging' )
+
+    def __init__(self, batch_size:int, target_size:Size2di,
+                 *,
+                 letterbox:bool=True,
+                 pad_value:int=114,
+                 to_rgb:bool=True,
+                 scale:float=1/255,
+                 mean:Optional[Sequence[float]]=None,
+                 std:Optional[Sequence[float]]=None,
+                 dtype:np.dtype|type=np.float32,
+                 reuse_buffer:bool=True) -> None:
+        """Creates a FrameBatcher.
+
+        Args:
+            batch_size (int): maximum number of frames in a batch.
+            target_size (Size2di): size of the images in a batch.
+            letterbox (bool, optional): keep the aspect ratio of the images by padding. Defaults to True.
+            pad_value (int, optional): pixel value of the padded area. Defaults to 114.
+            to_rgb (bool, optional): convert BGR images into RGB. Defaults to True.
+            scale (float, optional): factor multiplied to the pixel values. Defaults to 1/255.
+            mean (Optional[Sequence[float]], optional): per-channel mean subtracted after scaling. Defaults to None.
+            std (Optional[Sequence[float]], optional): per-channel standard deviation dividing the result.
+                                                       Defaults to None.
+            dtype (np.dtype|type, optional): element type of the tensor. Defaults to np.float32.
+            reuse_buffer (bool, optional): reuse the same tensor for every batch. Defaults to True.
+        """
+        if batch_size <= 0:
+            raise ValueError(f'invalid batch_size: {batch_size}')
+        if target_size.width <= 0 or target_size.height <= 0:
+            raise ValueError(f'invalid target_size: {target_size}')
+        if mean is not None and len(mean) != 3:
+            raise ValueError(f'invalid mean: {mean}')
+        if std is not None and (len(std) != 3 or any(v == 0 for v in std)):
+            raise ValueError(f'invalid std: {std}')
+
+        self.batch_size = batch_size
+        self.target_size = target_size
+        self.letterbox = letterbox
+        self.pad_value = pad_value
+        self.to_rgb = to_rgb
+        self.scale = scale
+        self.reuse_buffer = reuse_buffer
+        self.__dtype = np.dtype(dtype)
+        self.__mean = np.asarray(mean, dtype=self.__dtype).reshape(1, 3, 1, 1) if mean is not None else None
+        self.__std = np.asarray(std, dtype=self.__dtype).reshape(1, 3, 1, 1) if std is not None else None
+
+        w, h = target_size.width, target_size.height
+        self.__canvas = np.empty((batch_size, h, w, 3), dtype=np.uint8)
+        self.__tensor = np.empty((batch_size, 3, h, w), dtype=self.__dtype)
+        # 동일한 크기의 frame들이 반복되므로 resize 결과를 담을 buffer를 크기별로 재사용한다.
+        self.__staging:dict[tuple[int,int],np.ndarray] = {}
+
+    def batches(self, frames:Iterable[Frame], *, drop_last:bool=False) -> Iterator[FrameBatch]:
+        """Groups the given frames into batches.
+
+        Args:
+            frames (Iterable[Frame]): frames to batch (e.g. an ImageCapture).
+            drop_last (bool, optional): discard the last batch if it is smaller than ``batch_size``.
+                                        Defaults to False.
+
+        Returns:
+            Iterator[FrameBatch]: batches of the frames.
+        """
+        pending:list[Frame] = []
+        for frame in frames:
+            pending.append(frame)
+            if len(pending) == self.batch_size:
+                yield self.batch(pending)
+                pending = []
+        if pending and not drop_last:
+            yield self.batch(pending)
+
+    def batch(self, frames:Sequence[Frame]) -> FrameBatch:
+        """Converts the given frames into a batch.
+
+        Args:
+            frames (Sequence[Frame]): frames to convert. At most ``batch_size`` frames are allowed.
+
+        Returns:
+            FrameBatch: the converted batch.
+        """
+        n = len(frames)
+        if n == 0 or n > self.batch_size:
+            raise ValueError(f'invalid number of frames: {n}, batch_size={self.batch_size}')
+
+        scales:list[tuple[float,float]] = []
+        offsets:list[tuple[int,int]] = []
+        for idx, frame in enumerate(frames):
+            ratio, offset = self.__place(frame.image, self.__canvas[idx])
+            scales.append(ratio)
+            offsets.append(offset)
+
+        canvas = self.__canvas[:n]
+        tensor = self.__tensor[:n] if self.reuse_buffer else np.empty((n, *self.__tensor.shape[1:]), self.__dtype)
+        # NHWC(BGR) -> NCHW 변환과 정규화를 batch 전체에 대해 한번에 수행한다.
+        src = canvas[..., ::-1] if self.to_rgb else canvas
+        np.multiply(src.transpose(0, 3, 1, 2), self.scale, out=tensor, casting='unsafe')
+        if self.__mean is not None:
+            np.subtract(tensor, self.__mean, out=tensor)
+        if self.__std is not None:
+            np.divide(tensor, self.__std, out=tensor)
+
+        return FrameBatch(tensor=tensor, indexes=[frame.index for frame in frames],
+                          tss=[frame.ts for frame in frames], scales=scales, offsets=offsets)
+
+    def __place(self, image:np.ndarray, canvas:np.ndarray) -> tuple[tuple[float,float],tuple[int,int]]:
+        h, w = image.shape[:2]
+        tw, th = self.target_size.width, self.target_size.height
+        if not self.letterbox:
+            if (w, h) == (tw, th):
+                canvas[:] = image
+            else:
+                cv2.resize(image, (tw, th), dst=canvas, interpolation=cv2.INTER_LINEAR)
+            return (tw / w, th / h), (0, 0)
+
+        ratio = min(tw / w, th / h)
+        nw, nh = min(round(w * ratio), tw), min(round(h * ratio), th)
+        x, y = (tw - nw) // 2, (th - nh) // 2
+        if (nw, nh) != (tw, th):
+            canvas[:] = self.pad_value
+        if (nw, nh) == (w, h):
+            canvas[y:y+nh, x:x+nw] = image
+        else:
+            staging = self.__staging.get((nw, nh))
+            if staging is None:
+                staging = self.__staging[(nw, nh)] = np.empty((nh, nw, 3), dtype=np.uint8)
+            cv2.resize(image, (nw, nh), dst=staging, interpolation=cv2.INTER_LINEAR)
+            canvas[y:y+nh, x:x+nw] = staging
+        return (ratio, ratio), (x, y)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(batch_size={self.batch_size}, target={self.target_size})'
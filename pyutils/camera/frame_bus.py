@@ -0,0 +1,409 @@
+from __future__ import annotations
+
+from typing import Optional
+from contextlib import suppress
+from multiprocessing.shared_memory import SharedMemory
+import multiprocessing as mp
+import sys
+import time
+import logging
+
+import numpy as np
+import cv2
+
+from ..size2di import Size2di
+from .types import Camera, ImageCapture, Frame
+
+
+_MAGIC = 0x46425553     # 'FBUS'
+_HEADER_FIELDS = 8
+_H_MAGIC, _H_SLOT_COUNT, _H_HEIGHT, _H_WIDTH, _H_CHANNELS, _H_FPS, _H_WRITE_SEQ, _H_CLOSED = range(_HEADER_FIELDS)
+_ALIGNMENT = 64
+_READY_TIMEOUT_SECONDS = 30
+_JOIN_TIMEOUT_SECONDS = 5
+_MAX_POLL_SECONDS = 0.005
+
+
+def _align(size:int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _attach_shared_memory(name:str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)     # type: ignore
+
+    # Python 3.13 이전에는 attach만 한 process가 종료될 때에도 resource tracker가
+    # shared memory를 unlink하므로, 생성한 process만 관리하도록 등록을 해제한다.
+    from multiprocessing import resource_tracker
+    shm = SharedMemory(name=name)
+    with suppress(Exception): resource_tracker.unregister(shm._name, 'shared_memory')   # type: ignore
+    return shm
+
+
+class _FrameRing:
+    """Layout of the shared memory of a frame bus.
+    The memory consists of a header, sequence numbers and frame indexes of the slots, timestamps
+    of the slots, and the images of the slots. A slot is being written while its sequence number is -1.
+    """
+    __slots__ = ( 'shm', 'header', 'meta', 'tss', 'images' )
+
+    def __init__(self, shm:SharedMemory) -> None:
+        self.shm = shm
+        self.header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        if self.header[_H_MAGIC] != _MAGIC:
+            raise ValueError(f'not a frame bus: {shm.name}')
+
+        slot_count = int(self.header[_H_SLOT_COUNT])
+        shape = (slot_count, int(self.header[_H_HEIGHT]), int(self.header[_H_WIDTH]), int(self.header[_H_CHANNELS]))
+        offset = _align(self.header.nbytes)
+        self.meta = np.ndarray((slot_count, 2), dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += _align(self.meta.nbytes)
+        self.tss = np.ndarray((slot_count,), dtype=np.float64, buffer=shm.buf, offset=offset)
+        offset += _align(self.tss.nbytes)
+        self.images = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+
+    @staticmethod
+    def create(name:str, slot_count:int, image_size:Size2di, fps:int) -> _FrameRing:
+        shape = (slot_count, image_size.height, image_size.width, 3)
+        size = (_align(_HEADER_FIELDS * 8) + _align(slot_count * 16) + _align(slot_count * 8)
+                + int(np.prod(shape)))
+        shm = SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_H_SLOT_COUNT] = slot_count
+        header[_H_HEIGHT], header[_H_WIDTH], header[_H_CHANNELS] = shape[1:]
+        header[_H_FPS] = fps
+        header[_H_MAGIC] = _MAGIC
+        del header
+        ring = _FrameRing(shm)
+        ring.meta[:, 0] = 0
+        return ring
+
+    @staticmethod
+    def attach(name:str) -> _FrameRing:
+        return _FrameRing(_attach_shared_memory(name))
+
+    @property
+    def slot_count(self) -> int:
+        return int(self.header[_H_SLOT_COUNT])
+
+    @property
+    def image_size(self) -> Size2di:
+        return Size2di(int(self.header[_H_WIDTH]), int(self.header[_H_HEIGHT]))
+
+    @property
+    def fps(self) -> int:
+        return int(self.header[_H_FPS])
+
+    @property
+    def write_seq(self) -> int:
+        return int(self.header[_H_WRITE_SEQ])
+
+    @property
+    def closed(self) -> bool:
+        return bool(self.header[_H_CLOSED])
+
+    def publish(self, frame:Frame) -> None:
+        seq = self.write_seq + 1
+        slot = seq % self.slot_count
+
+        # 기록 중인 slot은 순서 번호를 -1로 표시하여 reader가 사용하지 않도록 한다.
+        self.meta[slot, 0] = -1
+        image = self.images[slot]
+        if frame.image.shape == image.shape:
+            np.copyto(image, frame.image)
+        else:
+            cv2.resize(frame.image, (image.shape[1], image.shape[0]), dst=image)
+        self.meta[slot, 1] = frame.index
+        self.tss[slot] = frame.ts
+        self.meta[slot, 0] = seq
+        self.header[_H_WRITE_SEQ] = seq
+
+    def mark_closed(self) -> None:
+        self.header[_H_CLOSED] = 1
+
+    def close(self) -> None:
+        # shared memory를 닫기 전에 buffer를 참조하는 array들을 먼저 해제한다.
+        self.header = self.meta = self.tss = self.images = None     # type: ignore
+        with suppress(Exception): self.shm.close()
+
+
+def _run_publisher(camera:Camera, name:str, slot_count:int, ready:mp.Queue, stopped) -> None:
+    ring:Optional[_FrameRing] = None
+    try:
+        with camera.open() as capture:
+            ring = _FrameRing.create(name, slot_count, capture.image_size, capture.fps)
+            ready.put(None)
+            for frame in capture:
+                if stopped.is_set():
+                    break
+                ring.publish(frame)
+    except Exception as e:
+        if ring is None:
+            ready.put(RuntimeError(f'{e.__class__.__name__}: {e}'))
+    finally:
+        if ring is not None:
+            ring.mark_closed()
+            shm = ring.shm
+            ring.close()
+            with suppress(Exception): shm.unlink()
+
+
+class FrameBusPublisher:
+    """Publishes the frames of a camera into a shared-memory ring (frame bus).
+    The camera is opened and decoded once in a dedicated process, and every frame is copied into
+    the next slot of a ring of ``slot_count`` slots tagged with a sequence number.
+    Any number of local processes can read the frames through FrameBusCamera.
+    """
+    __slots__ = ( 'camera', 'name', 'slot_count', 'logger', '__process', '__stopped' )
+
+    def __init__(self, camera:Camera, name:str,
+                 *,
+                 slot_count:int=8,
+                 logger:Optional[logging.Logger]=None) -> None:
+        """Creates a FrameBusPublisher.
+
+        Args:
+            camera (Camera): camera to publish. It should be picklable.
+            name (str): name of the frame bus (the name of the shared memory).
+            slot_count (int, optional): number of slots in the ring. Defaults to 8.
+            logger (Optional[logging.Logger], optional): logger. Defaults to None.
+        """
+        if slot_count < 2:
+            raise ValueError(f'invalid slot_count: {slot_count}')
+
+        self.camera = camera
+        self.name = name
+        self.slot_count = slot_count
+        self.logger = logger
+        self.__process:Optional[mp.process.BaseProcess] = None
+        self.__stopped = None
+
+    def start(self) -> None:
+        """Starts the publisher process and waits until the frame bus is ready.
+
+        Raises:
+            RuntimeError: if the publisher fails to open the camera or to create the frame bus.
+        """
+        if self.__process is not None:
+            raise ValueError(f'{self.__class__.__name__} has been started already')
+
+        ctx = mp.get_context()
+        ready = ctx.Queue()
+        self.__stopped = ctx.Event()
+        self.__process = ctx.Process(target=_run_publisher, name=f'frame-bus-{self.name}', daemon=True,
+                                     args=(self.camera, self.name, self.slot_count, ready, self.__stopped))
+        self.__process.start()
+        try:
+            error = ready.get(timeout=_READY_TIMEOUT_SECONDS)
+        except Exception:
+            error = RuntimeError(f'frame bus is not ready: name={self.name}')
+        if error is not None:
+            self.stop()
+            raise error
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'started frame bus: name={self.name}, camera={self.camera.uri}, slots={self.slot_count}')
+
+    def stop(self) -> None:
+        """Stops the publisher process. Readers finish their iterations after consuming the published frames."""
+        if self.__process is None:
+            return
+
+        process, self.__process = self.__process, None
+        self.__stopped.set()    # type: ignore
+        process.join(_JOIN_TIMEOUT_SECONDS)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'stopped frame bus: name={self.name}')
+
+    def is_alive(self) -> bool:
+        return self.__process is not None and self.__process.is_alive()
+
+    def __enter__(self) -> FrameBusPublisher:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        with suppress(Exception): self.stop()
+        return False
+
+    def __repr__(self) -> str:
+        state = 'running' if self.is_alive() else 'stopped'
+        return f'{self.__class__.__name__}({state}, name={self.name}, camera={self.camera.uri})'
+
+
+class FrameBusCamera(Camera):
+    """Camera reading the frames published into a frame bus by FrameBusPublisher.
+
+    If ``copy`` is False, the images of the captured frames are read-only views of the shared memory.
+    Such an image is valid until the publisher wraps around the ring (``slot_count - 1`` frames later),
+    so a consumer that keeps images longer should copy them. Since the publisher does not wait for
+    the consumers, a zero-copy image can also be torn (partially overwritten by a newer frame) if
+    the consumer lags behind by a whole ring. With ``copy`` set, torn copies are detected and
+    skipped.
+    """
+    __slots__ = ( '__name', '__start', '__copy', '__image_size', '__fps' )
+
+    def __init__(self, name:str,
+                 *,
+                 start:str='latest',
+                 copy:bool=False) -> None:
+        """Creates a FrameBusCamera.
+
+        Args:
+            name (str): name of the frame bus.
+            start (str, optional): 'latest' to start from the most recent frame, or 'oldest' to start
+                                   from the oldest frame kept in the ring. Defaults to 'latest'.
+            copy (bool, optional): copy the images out of the shared memory. Defaults to False.
+        """
+        if start not in ('latest', 'oldest'):
+            raise ValueError(f'invalid start: {start}')
+
+        self.__name = name
+        self.__start = start
+        self.__copy = copy
+        self.__image_size:Optional[Size2di] = None
+        self.__fps:Optional[int] = None
+
+    def open(self) -> FrameBusCapture:
+        capture = FrameBusCapture(self, _FrameRing.attach(self.__name), start=self.__start, copy=self.__copy)
+        self.__image_size = capture.image_size
+        self.__fps = capture.fps
+        return capture
+
+    @property
+    def uri(self) -> str:
+        return f'bus://{self.__name}'
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def image_size(self) -> Size2di:
+        if self.__image_size is None:
+            self.__load_info()
+        return self.__image_size     # type: ignore
+
+    @property
+    def fps(self) -> int:
+        if self.__fps is None:
+            self.__load_info()
+        return self.__fps     # type: ignore
+
+    def __load_info(self) -> None:
+        ring = _FrameRing.attach(self.__name)
+        try:
+            self.__image_size = ring.image_size
+            self.__fps = ring.fps
+        finally:
+            ring.close()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(uri={self.uri}, start={self.__start}, copy={self.__copy})'
+
+
+class FrameBusCapture(ImageCapture):
+    __slots__ = ( '__camera', '__ring', '__copy', '__next_seq', '__poll_seconds', '__dropped_count',
+                  '__initial_ts' )
+
+    def __init__(self, camera:FrameBusCamera, ring:_FrameRing,
+                 *,
+                 start:str='latest',
+                 copy:bool=False) -> None:
+        self.__camera = camera
+        self.__ring:Optional[_FrameRing] = ring
+        self.__copy = copy
+        self.__dropped_count = 0
+        self.__initial_ts:Optional[int] = None
+        self.__poll_seconds = min(_MAX_POLL_SECONDS, 0.25 / ring.fps) if ring.fps > 0 else _MAX_POLL_SECONDS
+
+        write_seq = ring.write_seq
+        if start == 'latest':
+            self.__next_seq = max(write_seq, 1)
+        else:
+            self.__next_seq = max(write_seq - ring.slot_count + 2, 1)
+
+    def close(self) -> None:
+        if self.__ring is not None:
+            ring, self.__ring = self.__ring, None
+            ring.close()
+
+    def is_closed(self) -> bool:
+        return self.__ring is None
+
+    @property
+    def camera(self) -> FrameBusCamera:
+        return self.__camera
+
+    @property
+    def image_size(self) -> Size2di:
+        assert self.__ring is not None, "closed"
+        return self.__ring.image_size
+
+    @property
+    def fps(self) -> int:
+        assert self.__ring is not None, "closed"
+        return self.__ring.fps
+
+    @property
+    def initial_ts(self) -> int:
+        if self.__initial_ts is None:
+            raise ValueError(f"not initialized")
+        return self.__initial_ts
+
+    @property
+    def dropped_count(self) -> int:
+        """Returns the number of frames overwritten by the publisher before this capture read them."""
+        return self.__dropped_count
+
+    @property
+    def image_reuse_interval(self) -> Optional[int]:
+        # publisher는 소비자와 무관하게 slot들을 덮어 쓰므로 zero-copy image의 유효 기간을 보장할 수 없다.
+        return None if self.__copy else 0
+
+    def __next__(self) -> Frame:
+        ring = self.__ring
+        if ring is None:
+            raise StopIteration()
+
+        slot_count = ring.slot_count
+        while True:
+            write_seq = ring.write_seq
+            if write_seq >= self.__next_seq:
+                # 다음 frame이 이미 덮어 쓰여졌거나 덮어 쓰일 수 있으면 최근 frame들로 건너뛴다.
+                min_seq = write_seq - slot_count + 2
+                if self.__next_seq < min_seq:
+                    self.__dropped_count += min_seq - self.__next_seq
+                    self.__next_seq = min_seq
+
+                seq = self.__next_seq
+                slot = seq % slot_count
+                if ring.meta[slot, 0] != seq:
+                    continue
+                index = int(ring.meta[slot, 1])
+                ts = float(ring.tss[slot])
+                if self.__copy:
+                    image = ring.images[slot].copy()
+                    # 복사하는 도중에 publisher가 slot을 덮어 쓴 경우에는 다시 읽는다.
+                    if ring.meta[slot, 0] != seq:
+                        continue
+                else:
+                    # zero-copy image는 이후에 덮어 쓰일 수 있으므로 소비자가 수정하지 못하도록 한다.
+                    image = ring.images[slot]
+                    image.flags.writeable = False
+
+                self.__next_seq = seq + 1
+                if self.__initial_ts is None:
+                    self.__initial_ts = int(ts)
+                return Frame(image=image, index=index, ts=ts)
+
+            if ring.closed and ring.write_seq < self.__next_seq:
+                raise StopIteration()
+            time.sleep(self.__poll_seconds)
+
+    def __repr__(self) -> str:
+        state = 'closed' if self.is_closed() else 'opened'
+        return f'{self.__class__.__name__}({state}, uri={self.__camera.uri}, next_seq={self.__next_seq})'
@@ -4,22 +4,36 @@ from typing import Any, Optional, Protocol, runtime_checkable, overload
 from dataclasses import field, replace
 from contextlib import suppress
 import logging
+import threading
 import time
 from datetime import timedelta
 
+import numpy as np
 import cv2
 
 from .. import color
 from ..utils import utc_now_millis, sub_logger
 from ..size2d import Size2di
 from ..execution import AbstractExecution, ExecutionContext, CancellationError
-from .types import Frame, Camera, ImageCapture, CRF, CameraOptions
+from .types import Frame, Camera, ImageCapture, CRF, CameraOptions, DropPolicy
+from .stats import LatencyRecorder, EwmaRate, ProcessingStats
     
 _DEFAULT_WINDOW_SIZE = Size2di(0, 0)
+_DEFAULT_PIPELINE_QUEUE_SIZE = 8
+_DEFAULT_STATS_WINDOW = 1024
+# 'write_queue_size' 옵션의 writer별 기본값. OpenCV writer는 기본적으로 동기적으로 encoding하며(0),
+# 양수가 주어진 경우에만 background thread에서 encoding한다. ffmpeg writer는 항상 writer thread를 사용하므로
+# 양수의 queue 크기가 필요하다.
+_DEFAULT_OPENCV_WRITE_QUEUE_SIZE = 0
+_DEFAULT_FFMPEG_WRITE_QUEUE_SIZE = 16
+
+PIPELINE_STAGES = ('clean_readers', 'processor', 'updaters', 'final_readers')
 
 
 class ImageProcessorOptions(CameraOptions):
-    PROCESSOR_ONLY_KEYS = {'camera_uri', 'show', 'output_video', 'title', 'progress', 'crf'}
+    PROCESSOR_ONLY_KEYS = {'camera_uri', 'show', 'output_video', 'title', 'progress', 'crf', 'preset', 'tune',
+                           'process_workers', 'pipeline', 'pipeline_queue_size', 'drop_oldest_stages',
+                           'write_queue_size', 'write_overflow', 'show_async', 'stats_interval', 'stats_window'}
     KEYS = CameraOptions.KEYS.union(PROCESSOR_ONLY_KEYS)
         
     def __init__(self, **options):
@@ -31,14 +45,23 @@ class ImageProcessorOptions(CameraOptions):
                 assert isinstance(item, str)
                 self.data[key] = item
             case 'show':
-                if isinstance(key, str):
+                if isinstance(item, bool):
+                    self.data['show'] = item
+                elif isinstance(item, str):
                     self.data['show'] = Size2di.from_expr(item)
-                elif isinstance(key, bool):
-                    self.data['show'] = Size2di(0, 0)
-                elif isinstance(key, Size2di):
+                elif isinstance(item, Size2di):
                     self.data['show'] = item
                 else:
                     raise ValueError(f"invalid option value: show={item}")
+            case 'show_async':
+                assert isinstance(item, bool)
+                self.data[key] = item
+            case 'stats_interval':
+                assert isinstance(item, int|float) and item >= 0
+                self.data[key] = item
+            case 'stats_window':
+                assert isinstance(item, int) and item > 0
+                self.data[key] = item
             case 'output_video':
                 if item is not None:
                     from pathlib import Path
@@ -50,11 +73,38 @@ class ImageProcessorOptions(CameraOptions):
             case 'progress':
                 assert isinstance(item, bool)
                 self.data[key] = item
+            case 'process_workers':
+                assert isinstance(item, int) and item >= 0
+                self.data[key] = item
+            case 'pipeline':
+                assert isinstance(item, bool)
+                self.data[key] = item
+            case 'pipeline_queue_size':
+                assert isinstance(item, int) and item > 0
+                self.data[key] = item
+            case 'drop_oldest_stages':
+                stages = set(item.split('+')) if isinstance(item, str) else set(item)
+                if not stages.issubset(PIPELINE_STAGES):
+                    raise ValueError(f"invalid option value: {key}={item}")
+                self.data[key] = stages
             case 'crf':
-                if isinstance(key, str):
+                if isinstance(item, str):
                     self.data[key] = CRF.from_name(item)
-                elif isinstance(key, CRF):
-                    self.data['show'] = item
+                elif isinstance(item, CRF):
+                    self.data[key] = item
+                else:
+                    raise ValueError(f"invalid option value: {key}={item}")
+            case 'preset' | 'tune':
+                assert isinstance(item, str)
+                self.data[key] = item
+            case 'write_queue_size':
+                assert isinstance(item, int) and item >= 0
+                self.data[key] = item
+            case 'write_overflow':
+                if isinstance(item, str):
+                    self.data[key] = DropPolicy.from_name(item)
+                elif isinstance(item, DropPolicy):
+                    self.data[key] = item
                 else:
                     raise ValueError(f"invalid option value: {key}={item}")
             case _:
@@ -108,7 +158,7 @@ def create_image_processor(_camera:Camera|str, /,
     if isinstance(_camera, str):
         from .camera import load_camera
         camera_opts = dict(img_proc_opts.to_camera_options())
-        _camera = load_camera(options['camera_uri'], **camera_opts)
+        _camera = load_camera(_camera, **camera_opts)
     capture = _camera.open()
         
     return ImageProcessor(capture, img_proc_opts,
@@ -150,7 +200,6 @@ class Result:
         return f"fps={self.fps_measured:.1f}, count={self.frame_count}, elapsed={str(elapsed)[:-4]}"
 
 
-__ALPHA = 0.1
 class ImageProcessor(AbstractExecution):
     def __init__(self, capture:ImageCapture, options:ImageProcessorOptions,
                  *,
@@ -167,6 +216,23 @@ class ImageProcessor(AbstractExecution):
         self.fps_measured = 0.0
         self.logger = logging.getLogger('camera.image_processor')
         
+        # 0보다 큰 경우에는 'frame_processor'를 지정된 수의 worker process들에서 병렬로 수행시킨다.
+        self.process_workers:int = options.get('process_workers', 0)
+        
+        # 'pipeline' 모드에서는 clean reader들, frame processor, updater들, final reader들이
+        # 각각 별도의 thread에서 수행되고, 서로 bounded queue로 연결된다.
+        self.pipelined:bool = options.get('pipeline', False)
+        self.pipeline_queue_size:int = options.get('pipeline_queue_size', _DEFAULT_PIPELINE_QUEUE_SIZE)
+        self.drop_oldest_stages:set[str] = options.get('drop_oldest_stages', set())
+        
+        # 각 처리 단계의 수행 시간을 측정하고, 'stats_interval'(초)마다 'report_progress()'로 통계를 보고한다.
+        self.stats_interval:float = options.get('stats_interval', 0)
+        self.stats_window:int = options.get('stats_window', _DEFAULT_STATS_WINDOW)
+        self.__recorders:dict[str,LatencyRecorder] = {}
+        self.__fps_meter = EwmaRate()
+        self.__capture_count = 0
+        self.__started_ns = 0
+        
         self.show_size = self.__get_show_size(options)
         self.__set_show_title(options)
         self.__set_output_video(options)
@@ -188,6 +254,19 @@ class ImageProcessor(AbstractExecution):
 
     def add_final_frame_reader(self, frame_reader:FrameReader) -> None:
         self.final_frame_readers.append(frame_reader)
+        
+    def stats(self) -> ProcessingStats:
+        """Returns the latency statistics of the processing stages and the EWMA of the capture rate.
+        The run-average fps is given by ``fps_measured`` and ``Result.fps_measured``.
+        The stages are 'capture', 'processor', 'clean_reader:<name>', 'updater:<name>' and 'reader:<name>'.
+
+        Returns:
+            ProcessingStats: snapshot of the statistics.
+        """
+        elapsed_ns = time.perf_counter_ns() - self.__started_ns if self.__started_ns else 0
+        return ProcessingStats(frame_count=self.__capture_count, elapsed_ms=elapsed_ns // 1_000_000,
+                               fps=self.__fps_meter.rate,
+                               stages={name:rec.snapshot() for name, rec in list(self.__recorders.items())})
     
     def run_work(self) -> Result:
         started_ms = utc_now_millis()
@@ -202,22 +281,60 @@ class ImageProcessor(AbstractExecution):
             # 등록된 모든 frame 처리기를 초기화시킨다.
             for proc in [*self.clean_frame_readers, *self.frame_updaters, *self.final_frame_readers]:
                 proc.open(self)
+            self.__init_recorders()
             
+            process_pool = None
+            pipeline = None
             try:
-                started_ms_10th = 0
+                if self.frame_processor is not None and self.process_workers > 0:
+                    from .process_pool import ProcessPoolFrameProcessor
+                    process_pool = ProcessPoolFrameProcessor(self.frame_processor, self.process_workers,
+                                                             logger=sub_logger(self.logger, 'process_pool'))
+                    process_pool.open(self)
+                if self.pipelined:
+                    pipeline = self.__create_pipeline(process_pool)
+                    pipeline.start()
+                
+                # adaptive capture policy는 측정된 처리 속도에 따라 건너뛸 frame 수를 조정한다.
+                capture_policy = getattr(self.capture, 'capture_policy', None)
+                capture_recorder = self.__recorders['capture']
+                report_interval_ns = int(self.stats_interval * 1_000_000_000)
+                next_report_ns = self.__started_ns + report_interval_ns
+                last_ns = time.perf_counter_ns()
                 for frame in self.capture:
-                    capture_count += 1
-                    self.__process_frame(frame)
+                    # 이전 frame의 처리가 끝난 후부터 frame이 반환될 때까지를 capture 시간으로 측정한다.
+                    now_ns = time.perf_counter_ns()
+                    capture_recorder.record(now_ns - last_ns)
+                    fps_rate = self.__fps_meter.update(now_ns)
                     
-                    now = utc_now_millis()
-                    if capture_count == 10:
-                        started_ms_10th = now
-                    elif capture_count > 10:
-                        elapsed = now - started_ms_10th
-                        self.fps_measured = 1000 / (elapsed / (capture_count-10))
+                    # 'stop()'이 요청된 경우에는 CancellationError를 발생시켜 처리를 중단한다.
+                    self.check_stopped()
+                    capture_count += 1
+                    self.__capture_count = capture_count
+                    # 'fps_measured'는 처리 시작 이후 전체 구간의 평균 fps이다. EWMA fps는 'stats()'로만 제공한다.
+                    elapsed_ns = now_ns - self.__started_ns
+                    if elapsed_ns > 0:
+                        self.fps_measured = capture_count * 1_000_000_000 / elapsed_ns
+                    if pipeline is not None:
+                        pipeline.put(frame)
+                    elif process_pool is not None:
+                        self.__submit_frame(process_pool, frame)
                     else:
-                        elapsed = now - started_ms
-                        self.fps_measured = 1000 / (elapsed / capture_count)
+                        self.__process_frame(frame)
+                    
+                    if capture_policy is not None:
+                        # adaptive capture policy는 최근의 처리 속도 변화에 반응하도록 EWMA fps를 사용한다.
+                        capture_policy.update_processing_fps(fps_rate)
+                    last_ns = time.perf_counter_ns()
+                    if report_interval_ns > 0 and last_ns >= next_report_ns:
+                        self.context.report_progress(self.stats())
+                        next_report_ns = last_ns + report_interval_ns
+                        
+                if pipeline is not None:
+                    pipeline.finish()
+                elif process_pool is not None:
+                    for processed in process_pool.drain():
+                        self.__finish_frame(processed)
             except StopIteration: pass
             except CancellationError as e:
                 failure_cause = e
@@ -225,31 +342,145 @@ class ImageProcessor(AbstractExecution):
                 failure_cause = e
                 self.logger.error(e, exc_info=True)
             finally:
+                if pipeline is not None:
+                    with suppress(Exception): pipeline.abort()
+                if process_pool is not None:
+                    with suppress(Exception): process_pool.close()
+                    
                 # 등록된 모든 frame 처리기를 종료화시킨다.
                 for proc in [*self.clean_frame_readers, *self.frame_updaters, *self.final_frame_readers]:
                     with suppress(Exception): proc.close()
                     
-        return Result(elapsed_ms=utc_now_millis() - started_ms,
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'processing stats: {self.stats()}')
+        elapsed_ms = utc_now_millis() - started_ms
+        return Result(elapsed_ms=elapsed_ms,
                       frame_count=capture_count,
-                      fps_measured=self.fps_measured,
+                      fps_measured=(capture_count * 1000 / elapsed_ms) if elapsed_ms > 0 else 0.0,
                       failure_cause=failure_cause)
                 
     def stop_work(self) -> None: pass
 
     def finalize(self) -> None: pass
         
-    def __process_frame(self, frame:Frame) -> None:
-        for reader in self.clean_frame_readers:
+    def __init_recorders(self) -> None:
+        self.__recorders = {}
+        self.__fps_meter = EwmaRate()
+        self.__capture_count = 0
+        self.__started_ns = time.perf_counter_ns()
+        
+        def add(name:str) -> LatencyRecorder:
+            # 같은 class의 처리기가 여러 개 등록된 경우에는 '#<번호>'를 붙여 구분한다.
+            unique, seq = name, 2
+            while unique in self.__recorders:
+                unique, seq = f'{name}#{seq}', seq+1
+            recorder = self.__recorders[unique] = LatencyRecorder(unique, self.stats_window)
+            return recorder
+        
+        add('capture')
+        self.__processor_recorder = add('processor') if self.frame_processor is not None else None
+        self.__clean_readers = [(reader, add(f'clean_reader:{reader.__class__.__name__}'))
+                                    for reader in self.clean_frame_readers]
+        self.__updaters = [(updater, add(f'updater:{updater.__class__.__name__}')) for updater in self.frame_updaters]
+        self.__final_readers = [(reader, add(f'reader:{reader.__class__.__name__}'))
+                                    for reader in self.final_frame_readers]
+        
+    def __read_clean(self, frame:Frame) -> None:
+        for reader, recorder in self.__clean_readers:
+            started = time.perf_counter_ns()
             reader.read(frame)
-            
+            recorder.record(time.perf_counter_ns() - started)
+        
+    def __process_frame(self, frame:Frame) -> None:
+        self.__read_clean(frame)
         if self.frame_processor is not None:
+            started = time.perf_counter_ns()
             frame = self.frame_processor.process(frame)
+            self.__processor_recorder.record(time.perf_counter_ns() - started)     # type: ignore
+        self.__finish_frame(frame)
             
-        for updater in self.frame_updaters:
+    def __submit_frame(self, process_pool:ProcessPoolFrameProcessor, frame:Frame) -> None:
+        self.__read_clean(frame)
+        
+        # worker process들에서 처리가 완료된 frame들은 frame 번호 순서대로 반환된다.
+        for processed in self.__submit_timed(process_pool, frame):
+            self.__finish_frame(processed)
+            
+    def __submit_timed(self, process_pool:ProcessPoolFrameProcessor, frame:Frame) -> list[Frame]:
+        # process pool을 사용하는 경우에는 frame 전달과 완료된 결과 수신에 걸린 시간을 측정한다.
+        started = time.perf_counter_ns()
+        processed = process_pool.submit(frame)
+        self.__processor_recorder.record(time.perf_counter_ns() - started)     # type: ignore
+        return processed
+            
+    def __update_frame(self, frame:Frame) -> Frame:
+        for updater, recorder in self.__updaters:
+            started = time.perf_counter_ns()
             frame = updater.update(frame)
+            recorder.record(time.perf_counter_ns() - started)
+        return frame
             
-        for reader in self.final_frame_readers:
+    def __read_final(self, frame:Frame) -> None:
+        for reader, recorder in self.__final_readers:
+            started = time.perf_counter_ns()
             reader.read(frame)
+            recorder.record(time.perf_counter_ns() - started)
+            
+    def __finish_frame(self, frame:Frame) -> None:
+        self.__read_final(self.__update_frame(frame))
+            
+    def __create_pipeline(self, process_pool:Optional[ProcessPoolFrameProcessor]) -> FramePipeline:
+        from .pipeline import FramePipeline, FrameStage
+        
+        def read_clean(frame:Frame) -> list[Frame]:
+            self.__read_clean(frame)
+            return [frame]
+        
+        def process(frame:Frame) -> list[Frame]:
+            started = time.perf_counter_ns()
+            frame = self.frame_processor.process(frame)    # type: ignore
+            self.__processor_recorder.record(time.perf_counter_ns() - started)     # type: ignore
+            return [frame]
+        
+        def submit(frame:Frame) -> list[Frame]:
+            return self.__submit_timed(process_pool, frame)     # type: ignore
+        
+        def update(frame:Frame) -> list[Frame]:
+            return [self.__update_frame(frame)]
+        
+        def read_final(frame:Frame) -> list[Frame]:
+            self.__read_final(frame)
+            return []
+        
+        handlers = []
+        if self.clean_frame_readers:
+            handlers.append(('clean_readers', read_clean, None))
+        if process_pool is not None:
+            handlers.append(('processor', submit, process_pool.drain))
+        elif self.frame_processor is not None:
+            handlers.append(('processor', process, None))
+        if self.frame_updaters:
+            handlers.append(('updaters', update, None))
+        if self.final_frame_readers:
+            handlers.append(('final_readers', read_final, None))
+        if not handlers:
+            handlers.append(('final_readers', read_final, None))
+        
+        stage_logger = sub_logger(self.logger, 'pipeline')
+        stages = [FrameStage(name, handler, flusher=flusher, queue_size=self.pipeline_queue_size,
+                             drop_policy=DropPolicy.DROP_OLDEST if name in self.drop_oldest_stages else DropPolicy.BLOCK,
+                             logger=stage_logger)
+                  for name, handler, flusher in handlers]
+        pipeline = FramePipeline(stages)
+        # capture가 image buffer를 재사용하기 전에 pipeline에 대기 중인 frame들이 처리되지 못할 수 있다면
+        # pipeline에 넣기 전에 image를 복사한다.
+        reuse_interval = self.capture.image_reuse_interval
+        if reuse_interval is not None and reuse_interval <= pipeline.capacity:
+            pipeline.copy_images = True
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f'copy captured images: reuse_interval={reuse_interval}, '
+                                 f'pipeline_capacity={pipeline.capacity}')
+        return pipeline
             
     def __get_show_size(self, options:ImageProcessorOptions) -> Optional[Size2di]:
         def parse_show_option(show:bool|str) -> Optional[Size2di]:
@@ -275,12 +506,21 @@ class ImageProcessor(AbstractExecution):
         if output_video:
             write_processor = None
             crf = options.get('crf', CRF.OPENCV)
+            overflow = options.get('write_overflow', DropPolicy.BLOCK)
             if crf == CRF.OPENCV:
                 from .opencv_video_writer import OpenCvWriteProcessor
-                write_processor = OpenCvWriteProcessor(output_video, logger=sub_logger(self.logger, 'image_writer'))
+                write_processor = OpenCvWriteProcessor(output_video,
+                                                       queue_size=options.get('write_queue_size',
+                                                                              _DEFAULT_OPENCV_WRITE_QUEUE_SIZE),
+                                                       drop_policy=overflow,
+                                                       logger=sub_logger(self.logger, 'image_writer'))
             else:
                 from .ffmpeg_writer import FFMPEGWriteProcessor
                 write_processor = FFMPEGWriteProcessor(output_video, crf=crf,
+                                                       preset=options.get('preset'), tune=options.get('tune'),
+                                                       queue_size=options.get('write_queue_size',
+                                                                              _DEFAULT_FFMPEG_WRITE_QUEUE_SIZE),
+                                                       drop_policy=overflow,
                                                        logger=sub_logger(self.logger, 'image_writer'))
             self.final_frame_readers.append(write_processor)
             
@@ -290,6 +530,7 @@ class ImageProcessor(AbstractExecution):
             # 여기서 'show_processor'를 생성만 하고, 실제 등록은
             # 'run_work()' 메소드 수행 시점에서 추가시킨다.
             self.show_processor = ShowFrame(window_name=f'camera={self.capture.camera.uri}',
+                                            threaded=options.get('show_async', False),
                                             logger=sub_logger(self.logger, 'show_frame'))
     
     def __set_progress(self, options:ImageProcessorOptions) -> None:
@@ -328,11 +569,29 @@ from collections import namedtuple
 TitleSpec = namedtuple('TitleSpec', 'date, time, ts, frame, fps')
 
 class DrawFrameTitle(FrameUpdater):
+    """FrameUpdater drawing a title line on the top-left corner of frames.
+    With a background color, the title is rendered into a small patch that is re-rendered only when
+    the title text changes and copied onto each frame. Text extents are computed from per-character
+    advances measured once. The title is drawn in place if the image is writeable.
+    """
+    _FONT = cv2.FONT_HERSHEY_COMPLEX_SMALL
+    _FONT_SCALE = 1
+    _THICKNESS = 2
+    _ORIGIN = (10, 20)
+    _BOX_ORIGIN = (7, 0)
+    
     def __init__(self, title_spec:set[str], bg_color:Optional[color.BGR]=None) -> None:
         super().__init__()
         self.title_spec = TitleSpec('date' in title_spec, 'time' in title_spec, 'ts' in title_spec,
                                     'frame' in title_spec, 'fps' in title_spec)
         self.bg_color = bg_color
+        self.__advances:dict[str,int] = {}
+        self.__text_height = 0
+        self.__patch:Optional[np.ndarray] = None
+        self.__message = ''
+        self.__second:Optional[int] = None
+        self.__date_str = ''
+        self.__hms_str = ''
         
     def open(self, img_proc:ImageProcessor) -> None:
         self.image_proc = img_proc
@@ -340,51 +599,138 @@ class DrawFrameTitle(FrameUpdater):
     def close(self) -> None: pass
 
     def update(self, frame:Frame) -> Frame:
-        from datetime import datetime
-        
-        ts_sec = frame.ts / 1000.0
-        date_str = datetime.fromtimestamp(ts_sec).strftime('%Y-%m-%d')
-        time_str = datetime.fromtimestamp(ts_sec).strftime('%H:%M:%S.%f')[:-4]
-        ts_str = f'ts:{frame.ts}'
-        frame_str = f'#{frame.index}'
-        fps_str = f'fps:{self.image_proc.fps_measured:.2f}'
-        str_list = [date_str, time_str, ts_str, frame_str, fps_str]
-        message = ' '.join([msg for is_on, msg in zip(self.title_spec, str_list) if is_on])
+        message = self.__format(frame)
         
         convas = frame.image
+        if not convas.flags.writeable:
+            convas = convas.copy()
         if self.bg_color:
-            (msg_w, msg_h), _ = cv2.getTextSize(message, cv2.FONT_HERSHEY_COMPLEX_SMALL, 1, 2)
-            convas = cv2.rectangle(convas, (7, 3), (msg_w+11, msg_h+11), self.bg_color, -1)
-        convas = cv2.putText(convas, message, (10, 20), cv2.FONT_HERSHEY_COMPLEX_SMALL, 1, color.RED, 2)
-        return replace(frame, image=convas)
+            self.__draw_patch(convas, message)
+        else:
+            convas = cv2.putText(convas, message, DrawFrameTitle._ORIGIN, DrawFrameTitle._FONT,
+                                 DrawFrameTitle._FONT_SCALE, color.RED, DrawFrameTitle._THICKNESS)
+        return frame if convas is frame.image else replace(frame, image=convas)
+
+    def __format(self, frame:Frame) -> str:
+        parts:list[str] = []
+        if self.title_spec.date or self.title_spec.time:
+            # 날짜와 시각(초 단위)은 초가 바뀔 때만 다시 계산한다.
+            ts_sec = frame.ts / 1000.0
+            second = int(ts_sec // 1)
+            if second != self.__second:
+                from datetime import datetime
+                dt = datetime.fromtimestamp(second)
+                self.__date_str = dt.strftime('%Y-%m-%d')
+                self.__hms_str = dt.strftime('%H:%M:%S')
+                self.__second = second
+            if self.title_spec.date:
+                parts.append(self.__date_str)
+            if self.title_spec.time:
+                centis = min(int(round((ts_sec - second) * 1_000_000)) // 10_000, 99)
+                parts.append(f'{self.__hms_str}.{centis:02d}')
+        if self.title_spec.ts:
+            parts.append(f'ts:{frame.ts}')
+        if self.title_spec.frame:
+            parts.append(f'#{frame.index}')
+        if self.title_spec.fps:
+            parts.append(f'fps:{self.image_proc.fps_measured:.2f}')
+        return ' '.join(parts)
+
+    def __text_width(self, text:str) -> int:
+        # Hershey font의 문자열 폭은 문자별 advance의 합에 선 두께에 의한 1 pixel이 더해진 값이므로,
+        # 처음 보는 문자에 대해서만 측정한다.
+        advances = self.__advances
+        for ch in set(text).difference(advances):
+            (w1, h), _ = cv2.getTextSize(ch, DrawFrameTitle._FONT, DrawFrameTitle._FONT_SCALE, DrawFrameTitle._THICKNESS)
+            (w2, _), _ = cv2.getTextSize(ch*2, DrawFrameTitle._FONT, DrawFrameTitle._FONT_SCALE, DrawFrameTitle._THICKNESS)
+            advances[ch] = w2 - w1
+            self.__text_height = max(self.__text_height, h)
+        return sum(advances[ch] for ch in text) + 1 if text else 0
+
+    def __draw_patch(self, convas:np.ndarray, message:str) -> None:
+        box_x, box_y = DrawFrameTitle._BOX_ORIGIN
+        if message != self.__message or self.__patch is None or self.__patch.dtype != convas.dtype:
+            msg_w = self.__text_width(message)
+            shape = (self.__text_height + 12, msg_w + 5, *convas.shape[2:])
+            patch = self.__patch
+            if patch is None or patch.shape != shape or patch.dtype != convas.dtype:
+                patch = self.__patch = np.empty(shape, dtype=convas.dtype)
+            
+            # glyph들의 advance가 소수 단위이므로 일부 문자만 다시 그리면 위치가 어긋날 수 있어
+            # 작은 patch 전체를 다시 그린다. 작은 채널 축에 대한 numpy broadcasting 대입보다 cv2.rectangle()이 빠르다.
+            cv2.rectangle(patch, (0, 0), (shape[1]-1, shape[0]-1), self.bg_color, -1)
+            cv2.putText(patch, message, (DrawFrameTitle._ORIGIN[0] - box_x, DrawFrameTitle._ORIGIN[1] - box_y),
+                        DrawFrameTitle._FONT, DrawFrameTitle._FONT_SCALE, color.RED, DrawFrameTitle._THICKNESS)
+            self.__message = message
+        
+        patch = self.__patch
+        h = min(patch.shape[0], convas.shape[0] - box_y)
+        w = min(patch.shape[1], convas.shape[1] - box_x)
+        if h > 0 and w > 0:
+            convas[box_y:box_y+h, box_x:box_x+w] = patch[:h, :w]
 
 
 class ShowFrame(FrameReader):
+    """FrameReader displaying frames in a window.
+    In the threaded mode, the window is rendered by a dedicated UI thread from a latest-frame slot:
+    ``read()`` only replaces the slot, so frames are dropped rather than slowing down the processing.
+    The threaded mode is opt-in ('show_async' option of ImageProcessor), since HighGUI windows
+    cannot be used off the main thread on some platforms (e.g. macOS).
+    Key-strokes are handled in the UI thread: 'q' makes the next ``read()`` raise StopIteration, which
+    ends the processing normally as in the synchronous mode, and ' ' pauses (and resumes) the processing
+    by blocking ``read()``.
+    """
     _PAUSE_MILLIS = int(timedelta(hours=1).total_seconds() * 1000)
+    _UI_POLL_SECONDS = 0.01
 
     def __init__(self, window_name:str,
                  *,
+                 threaded:bool=False,
                  logger:Optional[logging.Logger]=None) -> None:
         super().__init__()
         self.window_name = window_name
+        self.threaded = threaded
         self.logger = logger
+        self.dropped_count = 0
+        self.__cond = threading.Condition()
+        self.__latest:Optional[Frame] = None
+        self.__closed = False
+        self.__resumed = threading.Event()
+        self.__quit_requested = False
+        self.__ui_thread:Optional[threading.Thread] = None
 
     def open(self, img_proc:ImageProcessor) -> None:
-        cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
-        
         assert img_proc.show_size is not None
+        self.img_proc = img_proc
         self.window_size = img_proc.image_size if img_proc.show_size == _DEFAULT_WINDOW_SIZE else img_proc.show_size
-        cv2.resizeWindow(self.window_name, self.window_size)
+        self.dropped_count = 0
+        self.__closed = False
+        self.__quit_requested = False
+        self.__resumed.set()
         
-        if self.logger and self.logger.isEnabledFor(logging.INFO):
-            self.logger.info(f'create window: {self.window_name}, size=({self.window_size})')
+        if self.threaded:
+            # HighGUI 함수들은 모두 UI thread에서만 호출한다.
+            self.__ui_thread = threading.Thread(target=self.__run_ui, name='show-frame', daemon=True)
+            self.__ui_thread.start()
+        else:
+            self.__create_window()
             
     def close(self) -> None:
-        if self.logger and self.logger.isEnabledFor(logging.INFO):
-            self.logger.info(f'destroy window: {self.window_name}')
-        with suppress(Exception): cv2.destroyWindow(self.window_name)
+        if self.__ui_thread is not None:
+            with self.__cond:
+                self.__closed = True
+                self.__cond.notify_all()
+            self.__resumed.set()
+            self.__ui_thread.join()
+            self.__ui_thread = None
+        else:
+            self.__destroy_window()
 
     def read(self, frame:Frame) -> None:
+        if self.threaded:
+            self.__put_latest(frame)
+            return
+        
         if not self.window_size:
             img = frame.image
         else:
@@ -409,4 +755,71 @@ class ShowFrame(FrameReader):
                     elif key == ord('q'):
                         raise StopIteration(f"Requested to quit")
             else: 
-                return
\ No newline at end of file
+                return
+
+    def __put_latest(self, frame:Frame) -> None:
+        # 일시 정지 중에는 처리 thread를 대기시킨다.
+        while not self.__resumed.wait(ShowFrame._UI_POLL_SECONDS):
+            pass
+        # UI thread에서 'q'가 입력된 경우에는 동기 mode와 동일하게 처리를 정상 종료시킨다.
+        if self.__quit_requested:
+            raise StopIteration(f"Requested to quit")
+
+        # 호출자가 image buffer를 재사용할 수 있기 때문에 복사본을 전달한다.
+        frame = replace(frame, image=frame.image.copy())
+        with self.__cond:
+            if self.__latest is not None:
+                self.dropped_count += 1
+            self.__latest = frame
+            self.__cond.notify_all()
+
+    def __run_ui(self) -> None:
+        try:
+            self.__create_window()
+            while True:
+                with self.__cond:
+                    if self.__latest is None and not self.__closed:
+                        self.__cond.wait(ShowFrame._UI_POLL_SECONDS)
+                    if self.__closed:
+                        break
+                    frame, self.__latest = self.__latest, None
+
+                if frame is not None:
+                    img = frame.image
+                    if self.window_size:
+                        img = cv2.resize(img, dsize=self.window_size, interpolation=cv2.INTER_AREA)
+                    cv2.imshow(self.window_name, img)
+                self.__handle_key(cv2.waitKey(1) & 0xFF)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f'fails to show frames: window={self.window_name}, cause={e}')
+        finally:
+            self.__destroy_window()
+            self.__resumed.set()
+
+    def __handle_key(self, key:int) -> None:
+        if key == ord('q'):
+            if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f'interrupted by a key-stroke')
+            self.__quit_requested = True
+            self.__resumed.set()
+        elif key == ord(' '):
+            if self.__resumed.is_set():
+                if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f'paused by a key-stroke')
+                self.__resumed.clear()
+            else:
+                if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f'resumed by a key-stroke')
+                self.__resumed.set()
+
+    def __create_window(self) -> None:
+        cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(self.window_name, self.window_size)
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'create window: {self.window_name}, size=({self.window_size})')
+
+    def __destroy_window(self) -> None:
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'destroy window: {self.window_name}')
+        with suppress(Exception): cv2.destroyWindow(self.window_name)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from typing import Optional
+from collections.abc import Iterable
+from collections import deque
+from dataclasses import dataclass, field, replace
+from contextlib import suppress
+import threading
+import time
+import logging
+
+from .types import Camera, ImageCapture, Frame, DropPolicy
+
+
+# 'close()'에서 capture를 닫기 전에 capture thread들이 스스로 종료하기를 기다리는 시간(초)과
+# capture를 닫은 후에 종료를 기다리는 최대 시간(초).
+_STOP_GRACE_SECONDS = 0.5
+_STOP_TIMEOUT_SECONDS = 2.0
+
+
+@dataclass(frozen=True, slots=True)
+class FrameBundle:
+    """A set of time-aligned frames captured from multiple cameras.
+
+    Attributes:
+        ts (int): reference timestamp of the bundle (the latest timestamp among the frames).
+        frames (dict[str,Frame]): captured frames keyed by camera URI.
+    """
+    ts: int
+    frames: dict[str,Frame] = field(repr=False)
+
+    def __repr__(self) -> str:
+        indexes = ', '.join(f'{uri}=#{frame.index}' for uri, frame in self.frames.items())
+        return f'{self.__class__.__name__}[ts={self.ts}, {indexes}]'
+
+
+class _CaptureThread(threading.Thread):
+    def __init__(self, capture:ImageCapture, uri:str, cond:threading.Condition,
+                 queue_size:int, drop_policy:DropPolicy, copy_images:bool) -> None:
+        super().__init__(name=f'capture-{uri}', daemon=True)
+
+        self.capture = capture
+        self.uri = uri
+        self.cond = cond
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+        self.copy_images = copy_images
+        self.frames:deque[Frame] = deque()
+        self.stopped = False
+        self.finished = False
+        self.failure:Optional[Exception] = None
+        self.dropped_count = 0
+
+    def run(self) -> None:
+        try:
+            for frame in self.capture:
+                if self.copy_images:
+                    frame = replace(frame, image=frame.image.copy())
+                with self.cond:
+                    if self.drop_policy == DropPolicy.BLOCK:
+                        while not self.stopped and len(self.frames) >= self.queue_size:
+                            self.cond.wait()
+                    if self.stopped:
+                        return
+                    if len(self.frames) >= self.queue_size:
+                        self.frames.popleft()
+                        self.dropped_count += 1
+                    self.frames.append(frame)
+                    self.cond.notify_all()
+        except Exception as e:
+            self.failure = e
+        finally:
+            with self.cond:
+                self.finished = True
+                self.cond.notify_all()
+
+
+class MultiCameraCapture:
+    """Captures frames from multiple cameras and yields time-aligned frame bundles.
+
+    Each camera is captured on its own thread into a bounded queue. A bundle is formed when
+    every camera has a frame whose timestamp is within ``skew_tolerance_ms`` of the latest one,
+    and frames that are too old to be aligned are discarded. The iteration finishes when any of
+    the cameras runs out of frames.
+
+    If a capture reuses its image buffers sooner than the queued frames are consumed
+    (see ``ImageCapture.image_reuse_interval``), the images are copied before being queued.
+    The images of a bundle stay valid at least until the next bundle is requested.
+    """
+    __slots__ = ( 'skew_tolerance_ms', 'logger', '__cond', '__threads', '__closed', '__skipped_counts' )
+
+    def __init__(self, cameras:Iterable[Camera],
+                 *,
+                 skew_tolerance_ms:int=50,
+                 queue_size:int=8,
+                 drop_policy:DropPolicy=DropPolicy.DROP_OLDEST,
+                 logger:Optional[logging.Logger]=None) -> None:
+        """Creates a MultiCameraCapture object and opens the given cameras.
+
+        Args:
+            cameras (Iterable[Camera]): cameras to capture.
+            skew_tolerance_ms (int, optional): maximum timestamp difference of the frames in a bundle. Defaults to 50.
+            queue_size (int, optional): maximum number of frames queued for each camera. Defaults to 8.
+            drop_policy (DropPolicy, optional): policy applied when a camera queue is full.
+                                                Defaults to DropPolicy.DROP_OLDEST.
+            logger (Optional[logging.Logger], optional): logger. Defaults to None.
+        """
+        cameras = list(cameras)
+        uris = [camera.uri for camera in cameras]
+        if len(set(uris)) != len(uris):
+            raise ValueError(f'duplicate camera URIs: {uris}')
+        if queue_size <= 0:
+            raise ValueError(f'invalid queue_size: {queue_size}')
+        if drop_policy not in (DropPolicy.BLOCK, DropPolicy.DROP_OLDEST):
+            raise ValueError(f'unsupported drop_policy: {drop_policy}')
+
+        self.skew_tolerance_ms = skew_tolerance_ms
+        self.logger = logger
+        self.__cond = threading.Condition()
+        self.__threads:list[_CaptureThread] = []
+        self.__closed = False
+        self.__skipped_counts:dict[str,int] = {uri:0 for uri in uris}
+
+        try:
+            for camera in cameras:
+                capture = camera.open()
+                # 큐에 대기 중인 frame들과 bundle로 반환된 frame, 그리고 grab 중인 frame이
+                # 서로 다른 buffer를 사용할 수 없다면 image를 복사하여 큐에 넣는다.
+                reuse_interval = capture.image_reuse_interval
+                copy_images = reuse_interval is not None and reuse_interval <= queue_size + 1
+                self.__threads.append(_CaptureThread(capture, camera.uri, self.__cond, queue_size, drop_policy,
+                                                     copy_images))
+        except Exception:
+            for thread in self.__threads:
+                with suppress(Exception): thread.capture.close()
+            raise
+
+        for thread in self.__threads:
+            thread.start()
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'opened cameras: {uris}')
+
+    def close(self) -> None:
+        with self.__cond:
+            if self.__closed:
+                return
+            self.__closed = True
+            for thread in self.__threads:
+                thread.stopped = True
+            self.__cond.notify_all()
+
+        # capture thread들이 스스로 종료하기를 잠시 기다린 후 capture들을 닫는다.
+        # 응답이 없는 source의 grab에서 멈춘 thread는 capture가 닫히면서 깨어나게 된다.
+        self.__join_threads(_STOP_GRACE_SECONDS)
+        for thread in self.__threads:
+            with suppress(Exception): thread.capture.close()
+        stuck = [thread.uri for thread in self.__join_threads(_STOP_TIMEOUT_SECONDS)]
+        if stuck and self.logger:
+            self.logger.warning(f'capture threads did not stop: {stuck}')
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'closed cameras: {self.uris}')
+
+    def __join_threads(self, timeout:float) -> list[_CaptureThread]:
+        deadline = time.monotonic() + timeout
+        for thread in self.__threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        return [thread for thread in self.__threads if thread.is_alive()]
+
+    @property
+    def uris(self) -> list[str]:
+        return [thread.uri for thread in self.__threads]
+
+    @property
+    def dropped_counts(self) -> dict[str,int]:
+        """Returns the number of frames dropped because of the queue overflow for each camera."""
+        with self.__cond:
+            return {thread.uri:thread.dropped_count for thread in self.__threads}
+
+    @property
+    def skipped_counts(self) -> dict[str,int]:
+        """Returns the number of frames discarded because they could not be aligned for each camera."""
+        with self.__cond:
+            return dict(self.__skipped_counts)
+
+    def __iter__(self) -> MultiCameraCapture:
+        return self
+
+    def __next__(self) -> FrameBundle:
+        with self.__cond:
+            while True:
+                if self.__closed:
+                    raise StopIteration()
+                for thread in self.__threads:
+                    if thread.failure is not None:
+                        raise thread.failure
+                    if thread.finished and not thread.frames:
+                        raise StopIteration()
+
+                if any(not thread.frames for thread in self.__threads):
+                    self.__cond.wait()
+                    continue
+
+                # 모든 camera의 첫번째 frame들 중 가장 늦은 timestamp를 기준으로
+                # 허용 오차보다 오래된 frame들은 정렬이 불가능하므로 버린다.
+                target_ts = max(thread.frames[0].ts for thread in self.__threads)
+                min_ts = target_ts - self.skew_tolerance_ms
+                skipped = False
+                for thread in self.__threads:
+                    while thread.frames and thread.frames[0].ts < min_ts:
+                        thread.frames.popleft()
+                        self.__skipped_counts[thread.uri] += 1
+                        skipped = True
+                if skipped:
+                    self.__cond.notify_all()
+                    continue
+
+                frames = {thread.uri:thread.frames.popleft() for thread in self.__threads}
+                self.__cond.notify_all()
+                return FrameBundle(ts=target_ts, frames=frames)
+
+    def __enter__(self) -> MultiCameraCapture:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        with suppress(Exception): self.close()
+        return False
+
+    def __repr__(self) -> str:
+        state = 'closed' if self.__closed else 'opened'
+        return f'{self.__class__.__name__}({state}, cameras={len(self.__threads)}, skew={self.skew_tolerance_ms}ms)'
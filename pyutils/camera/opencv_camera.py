@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from typing import Optional, Any
+from collections.abc import Iterable, Iterator
 
 import cv2
 
 from ..size2di import Size2di
 from .types import Image, Camera, Frame, CameraOptions
 from .utils import SyncableImageCapture
+from .capture_policy import CapturePolicy
+from .video_index import VideoIndex
 
 
 def _get_image_size(cap:cv2.VideoCapture) -> Size2di:
@@ -32,7 +35,8 @@ def _set_frame_index(cap:cv2.VideoCapture, index:int) -> None:
     
 
 class OpenCvCamera(Camera):
-    __slot__ = ( '__uri' '__image_size', '__fps', '__sync', '__init_ts_expr')
+    __slot__ = ( '__uri' '__image_size', '__fps', '__sync', '__init_ts_expr', '__prefetch',
+                 '__capture_policy')
     
     def __init__(self, camera_uri:str, options:CameraOptions):
         super().__init__()
@@ -42,6 +46,8 @@ class OpenCvCamera(Camera):
         self.__fps:Optional[int] = options.get('fps')
         self.__sync:bool = options.get('sync', True)
         self.__init_ts_expr:str = options.get('init_ts', 'open')
+        self.__prefetch:int = options.get('prefetch', 0)
+        self.__capture_policy:Optional[str|CapturePolicy] = options.get('capture_policy')
         
     def open(self) -> OpenCvImageCapture:
         return OpenCvImageCapture(self, capture=cv2.VideoCapture(self.uri))
@@ -67,6 +73,14 @@ class OpenCvCamera(Camera):
     @property
     def init_ts_expr(self) -> str:
         return self.__init_ts_expr
+        
+    @property
+    def prefetch(self) -> int:
+        return self.__prefetch
+        
+    @property
+    def capture_policy(self) -> Optional[str|CapturePolicy]:
+        return self.__capture_policy
     
     def __setup_if_necessary(self, cap:cv2.VideoCapture) -> None:
         if self.__image_size is None:
@@ -84,7 +98,8 @@ class OpenCvImageCapture(SyncableImageCapture):
     __slots__ = ( '__camera', '__capture', '__image_size' )
 
     def __init__(self, camera:OpenCvCamera, capture:cv2.VideoCapture, init_frame_index:int=1) -> None:
-        super().__init__(init_ts_expr=camera.init_ts_expr, init_frame_index=init_frame_index)
+        super().__init__(init_ts_expr=camera.init_ts_expr, init_frame_index=init_frame_index,
+                         prefetch=camera.prefetch, capture_policy=camera.capture_policy)
         
         if capture is None:
             raise ValueError(f'cv2.VideoCapture is invalid')
@@ -138,16 +153,23 @@ class OpenCvImageCapture(SyncableImageCapture):
         if self.__capture is None:
             return None
         return self.__capture.read()[1]
+    
+    def skip_image(self) -> bool:
+        # 'grab()'는 frame을 decode만 하고, image로의 변환은 수행하지 않는다.
+        if self.__capture is None:
+            return False
+        return self.__capture.grab()
 
 
 class VideoFile(OpenCvCamera):
-    __slot__ = ( '__begin_frame', '__end_frame' )
+    __slot__ = ( '__begin_frame', '__end_frame', '__keyframe_index' )
     
     def __init__(self, uri:str, options:CameraOptions):
         super().__init__(uri, options)
         
         self.__begin_frame:int = options.get('begin_frame', 1)
         self.__end_frame:Optional[int] = options.get('end_frame')
+        self.__keyframe_index:bool = options.get('keyframe_index', False)
         
     def open(self) -> VideoFileCapture:
         capture = cv2.VideoCapture(self.uri)
@@ -162,16 +184,25 @@ class VideoFile(OpenCvCamera):
     @property
     def end_frame(self) -> Optional[int]:
         return self.__end_frame
+        
+    @property
+    def keyframe_index(self) -> bool:
+        return self.__keyframe_index
     
 
 class VideoFileCapture(OpenCvImageCapture):
     def __init__(self, video_file:VideoFile, capture:cv2.VideoCapture) -> None:
         super().__init__(video_file, capture, init_frame_index=video_file.begin_frame)
         
-        if video_file.begin_frame <= 0 and video_file.begin_frame > self.total_frame_count:
+        # 'keyframe_index' 옵션이 설정된 경우에는 sidecar 파일에 저장된 frame index를 사용하고,
+        # 없는 경우에는 새로 생성하여 저장한다.
+        self.__index = VideoIndex.load_or_build(video_file.uri) if video_file.keyframe_index else None
+        self.__total_frame_count = self.__index.frame_count if self.__index else _get_frame_count(capture)
+        
+        if video_file.begin_frame <= 0 or video_file.begin_frame > self.total_frame_count:
             raise ValueError(f'index({video_file.begin_frame}) should be between 1 and {self.total_frame_count}')
-        if video_file.begin_frame > 0:
-            _set_frame_index(capture, video_file.begin_frame-1)
+        if video_file.begin_frame > 1:
+            self.__move_to(video_file.begin_frame)
             
         self.__end_frame = video_file.end_frame
             
@@ -182,7 +213,11 @@ class VideoFileCapture(OpenCvImageCapture):
         # 지정된 마지막 프레임 번호보다 큰 경우는 image capture를 종료시킨다.
         if self.__end_frame is not None and (self.frame_index+1) >= self.__end_frame:
             raise StopIteration()
-        return super().__next__()
+        frame = super().__next__()
+        # capture policy에 의해 frame들을 건너뛴 경우에는 마지막 프레임 번호를 넘어설 수 있다.
+        if self.__end_frame is not None and frame.index >= self.__end_frame:
+            raise StopIteration()
+        return frame
 
     @property
     def sync(self) -> bool:
@@ -190,7 +225,62 @@ class VideoFileCapture(OpenCvImageCapture):
 
     @property
     def total_frame_count(self) -> int:
-        return _get_frame_count(self.video_capture)
+        return self.__total_frame_count
+    
+    @property
+    def video_index(self) -> Optional[VideoIndex]:
+        return self.__index
+    
+    def seek(self, frame_index:int) -> None:
+        """Moves to the given frame so that it is the next captured frame.
+
+        Args:
+            frame_index (int): frame number (1-based).
+        """
+        if frame_index <= 0 or frame_index > self.total_frame_count:
+            raise ValueError(f'index({frame_index}) should be between 1 and {self.total_frame_count}')
+        self._reposition(frame_index, lambda: self.__move_to(frame_index))
+        
+    def read_ranges(self, ranges:Iterable[tuple[int,int]]) -> Iterator[Frame]:
+        """Captures the frames of the given ranges without reopening the video file.
+        Each range consists of the first frame number and the frame number following the last one.
+        The 'end_frame' option of the video file is not applied.
+
+        Args:
+            ranges (Iterable[tuple[int,int]]): frame ranges.
+
+        Returns:
+            Iterator[Frame]: captured frames.
+        """
+        for begin, end in ranges:
+            self.seek(begin)
+            while self.frame_index+1 < end:
+                try:
+                    frame = SyncableImageCapture.__next__(self)
+                except StopIteration:
+                    return
+                if frame.index >= end:
+                    break
+                yield frame
+    
+    def __move_to(self, frame_index:int) -> None:
+        cap = self.video_capture
+        position = int(cap.get(cv2.CAP_PROP_POS_FRAMES)) + 1
+        keyframe = self.__index.keyframe_before(frame_index) if self.__index else None
+        if keyframe is None:
+            if position != frame_index:
+                _set_frame_index(cap, frame_index-1)
+            return
+        
+        # 목표 frame이 현재 위치 이후이고 그 사이에 key frame이 없는 경우에는
+        # seek하지 않고 frame들을 decode하며 건너뛴다.
+        if keyframe <= position <= frame_index:
+            start = position
+        else:
+            _set_frame_index(cap, keyframe-1)
+            start = keyframe
+        for _ in range(frame_index - start):
+            cap.grab()
 
     @property
     def repr_str(self) -> str:
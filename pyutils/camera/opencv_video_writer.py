@@ -6,21 +6,42 @@ from contextlib import suppress
 import logging
 from pathlib import Path
 
+import numpy as np
 import cv2
 
 from ..size2di import Size2di
-from .types import Image, Frame, VideoWriter
+from .types import Image, Frame, VideoWriter, DropPolicy
 from .image_processor import FrameReader, ImageProcessor
+from .async_writer import AsyncImageWriter
 
 
 class OpenCvVideoWriter(VideoWriter):
-    __slots__ = ('fourcc', '__path', '__fps', '__image_size', '__video_writer')
+    """VideoWriter encoding frames with cv2.VideoWriter.
+    If ``queue_size`` is positive, images are encoded by a background thread draining a bounded queue
+    so that ``write()`` does not wait for the encoding. When the queue is full, the image is handled
+    according to ``drop_policy``.
+    """
+    __slots__ = ('fourcc', '__path', '__fps', '__image_size', '__video_writer', '__async_writer',
+                 '__encoded_count')
     FOURCC_MP4V = 'mp4v'
     FOURCC_XVID = 'XVID'
     FOURCC_DIVX = 'DIVX'
     FOURCC_WMV1 = 'WMV1'
     
-    def __init__(self, video_file:str, fps:int, image_size:Size2di) -> None:
+    def __init__(self, video_file:str, fps:int, image_size:Size2di,
+                 *,
+                 queue_size:int=0,
+                 drop_policy:DropPolicy=DropPolicy.BLOCK) -> None:
+        """Creates an OpenCvVideoWriter.
+
+        Args:
+            video_file (str): path to the output video file.
+            fps (int): frames per second.
+            image_size (Size2di): size of the images to write.
+            queue_size (int, optional): maximum number of images waiting to be encoded in the background.
+                                        If 0, images are encoded synchronously in ``write()``. Defaults to 0.
+            drop_policy (DropPolicy, optional): policy applied when the queue is full. Defaults to DropPolicy.BLOCK.
+        """
         path = Path(video_file)
 
         self.fourcc = None
@@ -33,17 +54,35 @@ class OpenCvVideoWriter(VideoWriter):
             self.fourcc = cv2.VideoWriter.fourcc(*OpenCvVideoWriter.FOURCC_WMV1)
         else:
             raise IOError("unknown output video file extension: 'f{ext}'")
+        if queue_size < 0:
+            raise ValueError(f'invalid queue_size: {queue_size}')
         self.__path = str(path.resolve())
         
         self.__fps = fps
         self.__image_size = image_size
         path.parent.mkdir(exist_ok=True)
         self.__video_writer = cv2.VideoWriter(self.__path, self.fourcc, self.__fps, self.__image_size)
+        self.__encoded_count = 0
+        self.__async_writer:Optional[AsyncImageWriter] = None
+        if queue_size > 0:
+            self.__async_writer = AsyncImageWriter(self.__video_writer.write, queue_size,
+                                                   drop_policy=drop_policy, name='opencv-writer')
         
     def close(self) -> None:
+        """Closes this writer after all queued images are encoded.
+
+        Raises:
+            IOError: if encoding a queued image fails.
+        """
         if self.__video_writer:
-            self.__video_writer.release()
-            self.__video_writer = None
+            video_writer, self.__video_writer = self.__video_writer, None
+            try:
+                if self.__async_writer:
+                    self.__async_writer.close()
+            except Exception as e:
+                raise IOError(f'fails to write video: path={self.__path}, cause={e}')
+            finally:
+                video_writer.release()
         
     def is_open(self) -> bool:
         return self.__video_writer is not None
@@ -60,36 +99,66 @@ class OpenCvVideoWriter(VideoWriter):
     def image_size(self) -> Size2di:
         return self.__image_size
 
+    @property
+    def queued_count(self) -> int:
+        """Returns the number of images accepted by ``write()``."""
+        return self.__async_writer.queued_count if self.__async_writer else self.__encoded_count
+
+    @property
+    def dropped_count(self) -> int:
+        """Returns the number of images discarded because of the queue overflow."""
+        return self.__async_writer.dropped_count if self.__async_writer else 0
+
+    @property
+    def encoded_count(self) -> int:
+        """Returns the number of images passed to the encoder."""
+        return self.__async_writer.written_count if self.__async_writer else self.__encoded_count
+
     def write(self, image:Image) -> None:
         assert self.__video_writer, "not opened."
-        self.__video_writer.write(image)
+        if self.__async_writer:
+            # 호출자가 image buffer를 재사용할 수 있기 때문에 queue에는 복사본을 넣는다.
+            self.__async_writer.submit(np.array(image, copy=True))
+        else:
+            self.__video_writer.write(image)
+            self.__encoded_count += 1
 
 
 class OpenCvWriteProcessor(FrameReader):
-    __slots__ = ( 'path', 'logger', '__writer' )
+    __slots__ = ( 'path', 'queue_size', 'drop_policy', 'logger', '__writer' )
     
     def __init__(self, path: str,
                  *,
+                 queue_size:int=0,
+                 drop_policy:DropPolicy=DropPolicy.BLOCK,
                  logger:Optional[logging.Logger]=None) -> None:
         self.path = path
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
         self.logger = logger
-        self.__writer = None
+        self.__writer:Optional[OpenCvVideoWriter] = None
         
     def open(self, img_proc:ImageProcessor) -> None:
         if self.logger and self.logger.isEnabledFor(logging.INFO):
             self.logger.info(f'opening video file: {self.path}')
         img_sz = img_proc.show_size if img_proc.show_size else img_proc.image_size
-        self.__writer = OpenCvVideoWriter(self.path, img_proc.capture.fps, img_sz)
+        self.__writer = OpenCvVideoWriter(self.path, img_proc.capture.fps, img_sz,
+                                          queue_size=self.queue_size, drop_policy=self.drop_policy)
 
     def close(self) -> None:
         if self.logger and self.logger.isEnabledFor(logging.INFO):
             self.logger.info(f'closing video file: {self.path}')
-        with suppress(Exception):
-            if self.__writer:
-                self.__writer.close()
-                self.__writer = None
+        if self.__writer:
+            writer, self.__writer = self.__writer, None
+            try:
+                writer.close()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f'fails to close video file: {self.path}, cause={e}')
+            if self.logger and self.logger.isEnabledFor(logging.INFO) and writer.dropped_count > 0:
+                self.logger.info(f'dropped frames: path={self.path}, count={writer.dropped_count}')
 
     def read(self, frame:Frame) -> None:
         if self.__writer is None:
             raise ValueError(f'OpenCvWriteProcessor has not been started')
-        self.__writer.write(frame.image)
\ No newline at end of file
+        self.__writer.write(frame.image)
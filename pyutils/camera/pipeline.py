@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from typing import Optional
+from collections.abc import Callable, Iterable
+from collections import deque
+from dataclasses import replace
+from contextlib import suppress
+import threading
+import logging
+
+from .types import Frame, DropPolicy
+
+
+FrameHandler = Callable[[Frame], Iterable[Frame]]
+FrameFlusher = Callable[[], Iterable[Frame]]
+
+_END_OF_FRAMES = None
+
+
+class _PipelineControl:
+    __slots__ = ( 'cond', 'failure', 'stop_requested' )
+
+    def __init__(self) -> None:
+        self.cond = threading.Condition()
+        self.failure:Optional[Exception] = None
+        self.stop_requested = False
+
+    @property
+    def aborted(self) -> bool:
+        return self.failure is not None or self.stop_requested
+
+
+class FrameStage(threading.Thread):
+    """A pipeline stage that handles frames on its own thread.
+    Frames are delivered to the stage through a bounded queue.
+    """
+    def __init__(self, name:str, handler:FrameHandler,
+                 *,
+                 flusher:Optional[FrameFlusher]=None,
+                 queue_size:int=8,
+                 drop_policy:DropPolicy=DropPolicy.BLOCK,
+                 logger:Optional[logging.Logger]=None) -> None:
+        super().__init__(name=f'stage-{name}', daemon=True)
+
+        if queue_size <= 0:
+            raise ValueError(f'invalid queue_size: {queue_size}')
+        if drop_policy not in (DropPolicy.BLOCK, DropPolicy.DROP_OLDEST):
+            raise ValueError(f'unsupported drop_policy: {drop_policy}')
+
+        self.stage_name = name
+        self.handler = handler
+        self.flusher = flusher
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+        self.logger = logger
+        self.dropped_count = 0
+        self.__queue:deque[Optional[Frame]] = deque()
+        self.__downstream:Optional[FrameStage] = None
+        self.__control = _PipelineControl()
+
+    def connect(self, control:_PipelineControl, downstream:Optional[FrameStage]) -> None:
+        self.__control = control
+        self.__downstream = downstream
+
+    def put(self, frame:Optional[Frame]) -> None:
+        ctrl = self.__control
+        with ctrl.cond:
+            # 종료 표식은 drop되지 않도록 queue 크기와 무관하게 추가한다.
+            if frame is not _END_OF_FRAMES:
+                if self.drop_policy == DropPolicy.BLOCK:
+                    while not ctrl.aborted and len(self.__queue) >= self.queue_size:
+                        ctrl.cond.wait()
+                elif len(self.__queue) >= self.queue_size:
+                    self.__queue.popleft()
+                    self.dropped_count += 1
+            if ctrl.aborted:
+                return
+            self.__queue.append(frame)
+            ctrl.cond.notify_all()
+
+    def run(self) -> None:
+        ctrl = self.__control
+        try:
+            while True:
+                with ctrl.cond:
+                    while not ctrl.aborted and not self.__queue:
+                        ctrl.cond.wait()
+                    if ctrl.aborted:
+                        return
+                    frame = self.__queue.popleft()
+                    ctrl.cond.notify_all()
+
+                if frame is _END_OF_FRAMES:
+                    if self.flusher is not None:
+                        self.__forward(self.flusher())
+                    if self.__downstream is not None:
+                        self.__downstream.put(_END_OF_FRAMES)
+                    return
+                self.__forward(self.handler(frame))
+        except StopIteration:
+            if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f'stop requested by stage: {self.stage_name}')
+            with ctrl.cond:
+                ctrl.stop_requested = True
+                ctrl.cond.notify_all()
+        except Exception as e:
+            if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f'stage failed: {self.stage_name}, cause={e}')
+            with ctrl.cond:
+                if ctrl.failure is None:
+                    ctrl.failure = e
+                ctrl.cond.notify_all()
+
+    def __forward(self, frames:Iterable[Frame]) -> None:
+        if self.__downstream is not None:
+            for frame in frames:
+                self.__downstream.put(frame)
+        else:
+            for _ in frames: pass
+
+
+class FramePipeline:
+    """A chain of FrameStages connected by bounded queues.
+
+    A stage whose drop policy is ``DropPolicy.BLOCK`` applies back-pressure to its upstream,
+    while one with ``DropPolicy.DROP_OLDEST`` discards the oldest queued frame instead.
+    If a stage fails, the whole pipeline is aborted and the failure is re-raised to the caller
+    of ``put()`` or ``finish()``. If a stage raises StopIteration, the pipeline is stopped and
+    ``put()`` raises StopIteration.
+
+    Frames are passed between the stages by reference. If the images put into the pipeline are
+    recycled by their producer (e.g. the image buffers of ``FFMPEGCameraCapture``) sooner than
+    ``capacity`` frames later, ``copy_images`` should be set so that ``put()`` copies them.
+    """
+    __slots__ = ( 'stages', 'copy_images', '__control' )
+
+    def __init__(self, stages:list[FrameStage], *, copy_images:bool=False) -> None:
+        if not stages:
+            raise ValueError(f'empty pipeline')
+
+        self.stages = stages
+        self.copy_images = copy_images
+        self.__control = _PipelineControl()
+        for stage, downstream in zip(stages, [*stages[1:], None]):
+            stage.connect(self.__control, downstream)
+
+    def start(self) -> None:
+        for stage in self.stages:
+            stage.start()
+
+    def put(self, frame:Frame) -> None:
+        """Puts a frame into the first stage of this pipeline.
+
+        Raises:
+            StopIteration: a stage has requested to stop the pipeline.
+            Exception: the failure raised by a stage.
+        """
+        self.__check_aborted()
+        if self.copy_images:
+            frame = replace(frame, image=frame.image.copy())
+        self.stages[0].put(frame)
+        self.__check_aborted()
+
+    def finish(self) -> None:
+        """Waits until all frames put so far pass through this pipeline.
+        """
+        self.stages[0].put(_END_OF_FRAMES)
+        for stage in self.stages:
+            stage.join()
+        if self.__control.failure is not None:
+            raise self.__control.failure
+
+    def abort(self) -> None:
+        ctrl = self.__control
+        with ctrl.cond:
+            ctrl.stop_requested = True
+            ctrl.cond.notify_all()
+        for stage in self.stages:
+            if stage.is_alive():
+                with suppress(RuntimeError): stage.join()
+
+    @property
+    def capacity(self) -> int:
+        """Returns the maximum number of frames held by this pipeline at a time, including
+        the frames being handled by the stages and the one being put by the caller.
+        """
+        return sum(stage.queue_size + 1 for stage in self.stages) + 1
+
+    @property
+    def dropped_counts(self) -> dict[str,int]:
+        return {stage.stage_name:stage.dropped_count for stage in self.stages}
+
+    def __check_aborted(self) -> None:
+        ctrl = self.__control
+        if ctrl.failure is not None:
+            raise ctrl.failure
+        if ctrl.stop_requested:
+            raise StopIteration()
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from typing import Optional, Any
+from collections import deque
+from dataclasses import dataclass, replace
+from contextlib import suppress
+import logging
+import pickle
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty
+
+import numpy as np
+
+from ..size2di import Size2di
+from .types import Frame
+from .image_processor import FrameProcessor, ImageProcessor
+
+
+_RESULT_POLL_SECONDS = 0.5
+_JOIN_TIMEOUT_SECONDS = 5
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerImageProcessor:
+    """Picklable snapshot of an ImageProcessor given to ``FrameProcessor.open()`` in worker processes.
+
+    Attributes:
+        image_size (Size2di): size of the captured images.
+        show_size (Optional[Size2di]): size of the display window, if any.
+        fps (int): fps of the image capture.
+        worker_index (int): index of the worker process.
+    """
+    image_size: Size2di
+    show_size: Optional[Size2di]
+    fps: int
+    worker_index: int
+
+
+def _picklable_error(error:Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(f'{error.__class__.__name__}: {error}')
+
+
+def _run_worker(processor:FrameProcessor, info:WorkerImageProcessor, slot_names:list[str],
+                shape:tuple[int,int,int], tasks:mp.Queue, results:mp.Queue) -> None:
+    slots = [SharedMemory(name=name) for name in slot_names]
+    images = [np.ndarray(shape, dtype=np.uint8, buffer=slot.buf) for slot in slots]
+    try:
+        try:
+            processor.open(info)    # type: ignore
+        except Exception as e:
+            results.put((None, None, _picklable_error(e)))
+            return
+
+        while (task := tasks.get()) is not None:
+            slot_idx, frame = task
+            try:
+                image = images[slot_idx]
+                result = processor.process(replace(frame, image=image))
+
+                # 처리 결과 image는 가능하면 shared memory를 통해 전달하고,
+                # 크기가 달라진 경우에만 pickle을 통해 전달한다.
+                out_image = None
+                if result.image is not image:
+                    if result.image.shape == image.shape and result.image.dtype == image.dtype:
+                        np.copyto(image, result.image)
+                    else:
+                        out_image = result.image
+                results.put((slot_idx, replace(result, image=out_image), None))
+            except Exception as e:
+                results.put((slot_idx, None, _picklable_error(e)))
+        with suppress(Exception): processor.close()
+    finally:
+        del images
+        for slot in slots:
+            slot.close()
+
+
+class ProcessPoolFrameProcessor:
+    """Runs a FrameProcessor on a pool of worker processes.
+
+    Each worker process runs its own copy of the given FrameProcessor. Frame images are passed
+    to the workers through shared memory slots, and processed frames are returned in the order
+    of their ``Frame.index``.
+    """
+    __slots__ = ( 'frame_processor', 'workers', 'slot_count', 'logger', '__shape', '__shms', '__images',
+                  '__free_slots', '__tasks', '__results', '__processes', '__pending', '__done' )
+
+    def __init__(self, frame_processor:FrameProcessor, workers:int,
+                 *,
+                 slot_count:Optional[int]=None,
+                 logger:Optional[logging.Logger]=None) -> None:
+        """Creates a ProcessPoolFrameProcessor.
+
+        Args:
+            frame_processor (FrameProcessor): processor to run. It should be picklable.
+            workers (int): number of worker processes.
+            slot_count (Optional[int], optional): number of shared memory image slots, that is,
+                            the maximum number of frames in flight. Defaults to 2 * workers.
+            logger (Optional[logging.Logger], optional): logger. Defaults to None.
+        """
+        if workers <= 0:
+            raise ValueError(f'invalid number of workers: {workers}')
+
+        self.frame_processor = frame_processor
+        self.workers = workers
+        self.slot_count = slot_count if slot_count else 2 * workers
+        self.logger = logger
+        self.__shms:list[SharedMemory] = []
+        self.__images:list[np.ndarray] = []
+        self.__processes:list[Any] = []
+        self.__pending:deque[int] = deque()
+        self.__done:dict[int,Frame] = dict()
+
+    def open(self, img_proc:ImageProcessor) -> None:
+        image_size = img_proc.image_size
+        self.__shape = (image_size.height, image_size.width, 3)
+        nbytes = image_size.area() * 3
+        try:
+            for _ in range(self.slot_count):
+                slot = SharedMemory(create=True, size=nbytes)
+                self.__shms.append(slot)
+                self.__images.append(np.ndarray(self.__shape, dtype=np.uint8, buffer=slot.buf))
+            self.__free_slots = list(range(self.slot_count))
+
+            ctx = mp.get_context()
+            self.__tasks = ctx.Queue()
+            self.__results = ctx.Queue()
+            slot_names = [slot.name for slot in self.__shms]
+            for idx in range(self.workers):
+                info = WorkerImageProcessor(image_size=image_size, show_size=img_proc.show_size,
+                                            fps=img_proc.capture.fps, worker_index=idx)
+                proc = ctx.Process(target=_run_worker, name=f'frame-processor-{idx}', daemon=True,
+                                   args=(self.frame_processor, info, slot_names, self.__shape,
+                                         self.__tasks, self.__results))
+                proc.start()
+                self.__processes.append(proc)
+        except Exception:
+            self.close()
+            raise
+
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'started frame processor workers: count={self.workers}, slots={self.slot_count}')
+
+    def close(self) -> None:
+        for _ in self.__processes:
+            with suppress(Exception): self.__tasks.put(None)
+        for proc in self.__processes:
+            proc.join(_JOIN_TIMEOUT_SECONDS)
+            if proc.is_alive():
+                proc.terminate()
+        self.__processes.clear()
+
+        self.__images.clear()
+        for slot in self.__shms:
+            with suppress(Exception): slot.close()
+            with suppress(Exception): slot.unlink()
+        self.__shms.clear()
+
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'stopped frame processor workers')
+
+    def submit(self, frame:Frame) -> list[Frame]:
+        """Submits a frame to the worker processes.
+        If all image slots are in use, this method waits until a slot is released.
+
+        Args:
+            frame (Frame): frame to process.
+
+        Returns:
+            list[Frame]: processed frames that are ready to be returned in order.
+        """
+        if frame.image.shape != self.__shape:
+            raise ValueError(f'incompatible image shape: {frame.image.shape}, expected={self.__shape}')
+
+        while not self.__free_slots:
+            self.__receive(block=True)
+        while self.__receive(block=False): pass
+
+        slot_idx = self.__free_slots.pop()
+        np.copyto(self.__images[slot_idx], frame.image)
+        self.__pending.append(frame.index)
+        self.__tasks.put((slot_idx, replace(frame, image=None)))
+
+        return self.__pop_ready_frames()
+
+    def drain(self) -> list[Frame]:
+        """Waits for all submitted frames to be processed.
+
+        Returns:
+            list[Frame]: remaining processed frames in order.
+        """
+        while len(self.__done) < len(self.__pending):
+            self.__receive(block=True)
+        return self.__pop_ready_frames()
+
+    def __receive(self, block:bool) -> bool:
+        while True:
+            try:
+                slot_idx, frame, error = self.__results.get(block=block, timeout=_RESULT_POLL_SECONDS)
+                break
+            except Empty:
+                if not block:
+                    return False
+                if any(not proc.is_alive() for proc in self.__processes):
+                    raise RuntimeError(f'frame processor worker terminated unexpectedly')
+
+        if error is not None:
+            raise error
+
+        if frame.image is None:
+            frame = replace(frame, image=self.__images[slot_idx].copy())
+        self.__free_slots.append(slot_idx)
+        self.__done[frame.index] = frame
+        return True
+
+    def __pop_ready_frames(self) -> list[Frame]:
+        ready:list[Frame] = []
+        while self.__pending and self.__pending[0] in self.__done:
+            ready.append(self.__done.pop(self.__pending.popleft()))
+        return ready
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(workers={self.workers}, slots={self.slot_count})'
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+from typing import Optional
+from collections.abc import Callable
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+import random
+import threading
+import time
+import logging
+
+from ..size2di import Size2di
+from .types import Camera, ImageCapture, Frame
+from .capture_policy import CapturePolicy
+from .camera import is_live_camera
+
+
+_MAX_GAP_HISTORY = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureGap:
+    """Interval during which no frames were captured because the connection to the camera was lost.
+
+    Attributes:
+        last_index (int): index of the last frame captured before the connection was lost.
+        next_index (int): index of the first frame captured after reconnecting.
+        last_ts (float): timestamp of the last frame captured before the connection was lost.
+        next_ts (float): timestamp of the first frame captured after reconnecting.
+        attempts (int): number of reconnect attempts.
+        cause (str): description of the failure that closed the connection.
+    """
+    last_index: int
+    next_index: int
+    last_ts: float
+    next_ts: float
+    attempts: int
+    cause: str
+
+    @property
+    def missing_count(self) -> int:
+        """Returns the estimated number of frames not captured during the gap."""
+        return self.next_index - self.last_index - 1
+
+
+class ReconnectingCamera(Camera):
+    """Camera wrapper reopening the wrapped camera when its capture fails.
+
+    For a live camera (see ``is_live_camera()``), the capture is reopened when it fails or stops
+    delivering frames. For other sources, such as video files, running out of frames ends the capture
+    and a failure is raised to the caller, since reopening would replay the source from its beginning.
+    The reconnect attempts are delayed by exponential backoff with random jitter.
+    The frames captured through the wrapper keep increasing frame indexes and timestamps across
+    reconnections: the frames missed during an outage are estimated from its duration and fps,
+    and each outage is recorded as a ``CaptureGap``.
+    If ``warm_pool_size`` is positive, that many captures are opened ahead on a background thread
+    so that a reconnection does not wait for opening the camera. This is opt-in and meant for
+    network cameras whose connection takes long: each warm capture holds an extra connection
+    (and decoder) to the camera while waiting.
+    """
+    __slots__ = ( 'camera', 'live', 'max_retries', 'initial_backoff', 'max_backoff', 'backoff_factor', 'jitter',
+                  'warm_pool_size', 'on_gap', 'logger' )
+
+    def __init__(self, camera:Camera,
+                 *,
+                 live:Optional[bool]=None,
+                 max_retries:Optional[int]=None,
+                 initial_backoff:float=0.5,
+                 max_backoff:float=30,
+                 backoff_factor:float=2,
+                 jitter:float=0.5,
+                 warm_pool_size:int=0,
+                 on_gap:Optional[Callable[[CaptureGap],None]]=None,
+                 logger:Optional[logging.Logger]=None) -> None:
+        """Creates a ReconnectingCamera.
+
+        Args:
+            camera (Camera): camera to wrap.
+            live (Optional[bool], optional): whether the camera delivers live frames, so that running out of
+                        frames means a lost connection. Defaults to None (determined by ``is_live_camera()``).
+            max_retries (Optional[int], optional): maximum number of consecutive reconnect attempts.
+                        If exceeded, the capture ends. Defaults to None (unlimited).
+            initial_backoff (float, optional): delay in seconds before the second attempt. Defaults to 0.5.
+                        The first attempt is made immediately.
+            max_backoff (float, optional): maximum delay in seconds between attempts. Defaults to 30.
+            backoff_factor (float, optional): factor multiplied to the delay after each attempt. Defaults to 2.
+            jitter (float, optional): fraction of each delay randomly subtracted from it. Defaults to 0.5.
+            warm_pool_size (int, optional): number of captures opened ahead (opt-in, for network cameras).
+                        Defaults to 0.
+            on_gap (Optional[Callable[[CaptureGap],None]], optional): function called with each gap
+                        when the first frame after a reconnection is captured. Defaults to None.
+            logger (Optional[logging.Logger], optional): logger. Defaults to None.
+        """
+        if max_retries is not None and max_retries < 0:
+            raise ValueError(f'invalid max_retries: {max_retries}')
+        if initial_backoff < 0 or max_backoff < initial_backoff or backoff_factor < 1:
+            raise ValueError(f'invalid backoff: initial={initial_backoff}, max={max_backoff}, '
+                             f'factor={backoff_factor}')
+        if not (0 <= jitter <= 1):
+            raise ValueError(f'invalid jitter: {jitter}')
+        if warm_pool_size < 0:
+            raise ValueError(f'invalid warm_pool_size: {warm_pool_size}')
+
+        self.camera = camera
+        self.live = live if live is not None else is_live_camera(camera.uri)
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.warm_pool_size = warm_pool_size
+        self.on_gap = on_gap
+        self.logger = logger
+
+    def open(self) -> ReconnectingCapture:
+        return ReconnectingCapture(self, self.camera.open())
+
+    @property
+    def uri(self) -> str:
+        return self.camera.uri
+
+    @property
+    def image_size(self) -> Size2di:
+        return self.camera.image_size
+
+    @property
+    def fps(self) -> int:
+        return self.camera.fps
+
+    def backoff_delay(self, attempt:int) -> float:
+        """Returns the delay in seconds before the given (0-based) reconnect attempt."""
+        if attempt <= 0:
+            return 0
+        delay = min(self.initial_backoff * (self.backoff_factor ** (attempt-1)), self.max_backoff)
+        # 여러 process가 동시에 재접속을 시도하지 않도록 지연 시간을 무작위로 줄인다.
+        return delay * (1 - self.jitter * random.random())
+
+    def __repr__(self) -> str:
+        retries = self.max_retries if self.max_retries is not None else 'unlimited'
+        return (f'{self.__class__.__name__}({self.camera.uri}, live={self.live}, retries={retries}, '
+                f'warm_pool={self.warm_pool_size})')
+
+
+class _WarmCapturePool:
+    """Background thread keeping a number of captures of a camera opened ahead."""
+    __slots__ = ( '__camera', '__size', '__logger', '__captures', '__cond', '__stopped', '__thread' )
+
+    def __init__(self, camera:ReconnectingCamera, size:int) -> None:
+        self.__camera = camera
+        self.__size = size
+        self.__logger = camera.logger
+        self.__captures:deque[ImageCapture] = deque()
+        self.__cond = threading.Condition()
+        self.__stopped = False
+        self.__thread = threading.Thread(target=self.__run, name='warm-capture-pool', daemon=True)
+        self.__thread.start()
+
+    def take(self) -> Optional[ImageCapture]:
+        with self.__cond:
+            capture = self.__captures.popleft() if self.__captures else None
+            self.__cond.notify_all()
+            return capture
+
+    def close(self) -> None:
+        with self.__cond:
+            self.__stopped = True
+            self.__cond.notify_all()
+        self.__thread.join()
+        while self.__captures:
+            with suppress(Exception): self.__captures.popleft().close()
+
+    def __run(self) -> None:
+        attempt = 0
+        while True:
+            with self.__cond:
+                while not self.__stopped and len(self.__captures) >= self.__size:
+                    self.__cond.wait()
+                if self.__stopped:
+                    return
+                # 열기에 실패한 경우에는 backoff 시간만큼 대기한 후 다시 시도한다.
+                if attempt > 0 and self.__cond.wait_for(lambda: self.__stopped,
+                                                        self.__camera.backoff_delay(attempt)):
+                    return
+            try:
+                capture = self.__camera.camera.open()
+                attempt = 0
+            except Exception as e:
+                attempt += 1
+                if self.__logger and self.__logger.isEnabledFor(logging.DEBUG):
+                    self.__logger.debug(f'fails to open a warm capture: {e}')
+                continue
+
+            with self.__cond:
+                if self.__stopped:
+                    with suppress(Exception): capture.close()
+                    return
+                self.__captures.append(capture)
+
+
+class ReconnectingCapture(ImageCapture):
+    __slots__ = ( '__camera', '__capture', '__pool', '__closed', '__attempts', '__cause', '__last_frame',
+                  '__last_ns', '__reconnected', '__index_offset', '__ts_offset', '__gaps', '__reconnect_count' )
+
+    def __init__(self, camera:ReconnectingCamera, capture:ImageCapture) -> None:
+        self.__camera = camera
+        self.__capture:Optional[ImageCapture] = capture
+        self.__pool = _WarmCapturePool(camera, camera.warm_pool_size) if camera.warm_pool_size > 0 else None
+        self.__closed = threading.Event()
+        self.__attempts = 0
+        self.__cause = ''
+        self.__last_frame:Optional[Frame] = None
+        self.__last_ns = 0
+        self.__reconnected = False
+        self.__index_offset = 0
+        self.__ts_offset:float = 0
+        self.__gaps:deque[CaptureGap] = deque(maxlen=_MAX_GAP_HISTORY)
+        self.__reconnect_count = 0
+
+    def close(self) -> None:
+        if self.__closed.is_set():
+            return
+
+        self.__closed.set()
+        if self.__pool is not None:
+            self.__pool.close()
+        if self.__capture is not None:
+            with suppress(Exception): self.__capture.close()
+            self.__capture = None
+
+    @property
+    def camera(self) -> ReconnectingCamera:
+        return self.__camera
+
+    @property
+    def image_size(self) -> Size2di:
+        return self.__camera.image_size
+
+    @property
+    def fps(self) -> int:
+        return self.__camera.fps
+
+    @property
+    def initial_ts(self) -> int:
+        if self.__capture is None:
+            raise ValueError(f"not connected")
+        return self.__capture.initial_ts
+
+    @property
+    def capture_policy(self) -> Optional[CapturePolicy]:
+        return getattr(self.__capture, 'capture_policy', None)
+
+    @property
+    def image_reuse_interval(self) -> Optional[int]:
+        return self.__capture.image_reuse_interval if self.__capture is not None else None
+
+    @property
+    def gaps(self) -> list[CaptureGap]:
+        """Returns the gaps recorded so far (at most the last 1024)."""
+        return list(self.__gaps)
+
+    @property
+    def reconnect_count(self) -> int:
+        return self.__reconnect_count
+
+    def __next__(self) -> Frame:
+        while True:
+            if self.__capture is None:
+                self.__reconnect()
+
+            try:
+                frame = next(self.__capture)     # type: ignore
+            except StopIteration:
+                # live camera가 아닌 경우(예: video file)에는 frame이 더 이상 없으면 capture를 종료한다.
+                if not self.__camera.live:
+                    raise
+                self.__disconnect('no more frames')
+                continue
+            except Exception as e:
+                if not self.__camera.live:
+                    raise
+                self.__disconnect(repr(e))
+                continue
+
+            now_ns = time.monotonic_ns()
+            if self.__reconnected:
+                self.__reconnected = False
+                self.__align(frame, now_ns)
+            self.__attempts = 0
+            self.__last_ns = now_ns
+            frame = Frame(image=frame.image, index=frame.index + self.__index_offset, ts=frame.ts + self.__ts_offset)
+            self.__last_frame = frame
+            return frame
+
+    def __disconnect(self, cause:str) -> None:
+        if self.__closed.is_set():
+            raise StopIteration()
+        if self.__attempts == 0:
+            self.__cause = cause
+            if self.__camera.logger and self.__camera.logger.isEnabledFor(logging.WARNING):
+                self.__camera.logger.warning(f'lost connection to camera: {self.__camera.uri}, cause={cause}')
+
+        with suppress(Exception): self.__capture.close()     # type: ignore
+        self.__capture = None
+
+    def __reconnect(self) -> None:
+        max_retries = self.__camera.max_retries
+        while self.__capture is None:
+            if max_retries is not None and self.__attempts >= max_retries:
+                if self.__camera.logger:
+                    self.__camera.logger.error(f'gave up reconnecting camera: {self.__camera.uri}, '
+                                               f'attempts={self.__attempts}')
+                raise StopIteration()
+
+            # 'close()'가 호출되면 대기를 중단하고 capture를 종료한다.
+            if self.__closed.wait(self.__camera.backoff_delay(self.__attempts)):
+                raise StopIteration()
+            self.__attempts += 1
+
+            capture = self.__pool.take() if self.__pool is not None else None
+            if capture is None:
+                try:
+                    capture = self.__camera.camera.open()
+                except Exception as e:
+                    if self.__camera.logger and self.__camera.logger.isEnabledFor(logging.DEBUG):
+                        self.__camera.logger.debug(f'fails to reconnect camera: {self.__camera.uri}, '
+                                                   f'attempt={self.__attempts}, cause={e}')
+                    continue
+            self.__capture = capture
+            self.__reconnected = True
+
+    def __align(self, frame:Frame, now_ns:int) -> None:
+        # 연결이 끊긴 동안 놓친 frame 수를 경과 시간으로 추정하여, 재접속 후의 frame 번호와
+        # timestamp가 끊기기 전의 값들에 이어지도록 보정값을 계산한다.
+        last = self.__last_frame
+        if last is None:
+            self.__index_offset = 0
+            self.__ts_offset = 0
+            return
+
+        interval_ms = 1000 / self.fps if self.fps > 0 else 0
+        elapsed_ms = (now_ns - self.__last_ns) / 1_000_000
+        advance = max(round(elapsed_ms / interval_ms), 1) if interval_ms > 0 else 1
+        next_index = last.index + advance
+        next_ts = last.ts + round(advance * interval_ms)
+        self.__index_offset = next_index - frame.index
+        self.__ts_offset = next_ts - frame.ts
+
+        gap = CaptureGap(last_index=last.index, next_index=next_index, last_ts=last.ts, next_ts=next_ts,
+                         attempts=self.__attempts, cause=self.__cause)
+        self.__gaps.append(gap)
+        self.__reconnect_count += 1
+        if self.__camera.logger and self.__camera.logger.isEnabledFor(logging.INFO):
+            self.__camera.logger.info(f'reconnected camera: {self.__camera.uri}, missing={gap.missing_count}, '
+                                      f'attempts={gap.attempts}')
+        if self.__camera.on_gap is not None:
+            self.__camera.on_gap(gap)
+
+    def __repr__(self) -> str:
+        state = 'closed' if self.__closed.is_set() else ('connected' if self.__capture else 'reconnecting')
+        return f'{self.__class__.__name__}({state}, uri={self.__camera.uri}, reconnects={self.__reconnect_count})'
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from typing import Optional
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+import re
+import time
+import logging
+
+from ..size2di import Size2di
+from .types import Frame, VideoWriter, DropPolicy
+from .image_processor import FrameReader, ImageProcessor
+
+
+_DEFAULT_QUEUE_SIZE = 16
+_TS_FORMAT = '%Y%m%d-%H%M%S'
+# 'segment_file_name()'이 생성하는 이름 중 timestamp 부분의 pattern.
+_TS_PATTERN = r'\d{8}-\d{6}-\d{3}'
+
+
+def segment_file_name(ts:float, *, prefix:str='', suffix:str='.mp4') -> str:
+    """Returns the file name of the segment whose first frame has the given timestamp.
+    File names of the segments are ordered by their timestamps.
+
+    Args:
+        ts (float): timestamp (UTC milliseconds) of the first frame.
+        prefix (str, optional): prefix of the file name. Defaults to ''.
+        suffix (str, optional): suffix of the file name. Defaults to '.mp4'.
+
+    Returns:
+        str: file name.
+    """
+    ts = int(ts)
+    dt = datetime.fromtimestamp(ts / 1000, timezone.utc)
+    return f'{prefix}{dt.strftime(_TS_FORMAT)}-{ts % 1000:03d}{suffix}'
+
+
+class SegmentedWriteProcessor(FrameReader):
+    """FrameReader writing frames into a sequence of video files (segments).
+    A new segment is started every ``segment_seconds`` (measured by the frame timestamps) or
+    every ``segment_frames`` frames, and it is named by the timestamp of its first frame.
+    The finished segment is closed on a background thread so that writing frames does not pause
+    during the rollover. After a segment is closed, the oldest segments in the output directory are
+    deleted while their total size exceeds ``retention_bytes`` or while they are older than
+    ``retention_seconds``. Only the files named exactly like ``segment_file_name()`` with the same
+    prefix and suffix are regarded as segments, so other files in the directory are never deleted.
+    """
+    __slots__ = ( 'output_dir', 'segment_seconds', 'segment_frames', 'prefix', 'suffix', 'retention_bytes',
+                  'retention_seconds', 'logger', '__writer_factory', '__fps', '__image_size', '__writer',
+                  '__segment_path', '__segment_start_ts', '__segment_frame_count', '__closer' )
+
+    def __init__(self, output_dir:str|Path,
+                 *,
+                 segment_seconds:Optional[float]=None,
+                 segment_frames:Optional[int]=None,
+                 prefix:str='',
+                 suffix:str='.mp4',
+                 retention_bytes:Optional[int]=None,
+                 retention_seconds:Optional[float]=None,
+                 writer_factory:Optional[Callable[[str,int,Size2di],VideoWriter]]=None,
+                 logger:Optional[logging.Logger]=None) -> None:
+        """Creates a SegmentedWriteProcessor.
+
+        Args:
+            output_dir (str|Path): directory where the segments are written.
+            segment_seconds (Optional[float], optional): length of a segment in seconds. Defaults to None.
+            segment_frames (Optional[int], optional): number of frames in a segment. Defaults to None.
+            prefix (str, optional): prefix of the segment file names. Defaults to ''.
+            suffix (str, optional): suffix of the segment file names. Defaults to '.mp4'.
+            retention_bytes (Optional[int], optional): maximum total size of the closed segments. Defaults to None.
+            retention_seconds (Optional[float], optional): maximum age of the closed segments. Defaults to None.
+            writer_factory (Optional[Callable[[str,int,Size2di],VideoWriter]], optional): function creating
+                    the VideoWriter of a segment from its path, fps and image size.
+                    Defaults to OpenCvVideoWriter with a background encoding queue.
+            logger (Optional[logging.Logger], optional): logger. Defaults to None.
+        """
+        if segment_seconds is None and segment_frames is None:
+            raise ValueError(f'either segment_seconds or segment_frames should be given')
+        if segment_seconds is not None and segment_seconds <= 0:
+            raise ValueError(f'invalid segment_seconds: {segment_seconds}')
+        if segment_frames is not None and segment_frames <= 0:
+            raise ValueError(f'invalid segment_frames: {segment_frames}')
+
+        self.output_dir = Path(output_dir)
+        self.segment_seconds = segment_seconds
+        self.segment_frames = segment_frames
+        self.prefix = prefix
+        self.suffix = suffix
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+        self.logger = logger
+        self.__writer_factory = writer_factory if writer_factory else create_opencv_writer
+        self.__fps = 0
+        self.__image_size:Optional[Size2di] = None
+        self.__writer:Optional[VideoWriter] = None
+        self.__segment_path:Optional[Path] = None
+        self.__segment_start_ts = 0.0
+        self.__segment_frame_count = 0
+        self.__closer:Optional[ThreadPoolExecutor] = None
+
+    def open(self, img_proc:ImageProcessor) -> None:
+        self.__fps = img_proc.capture.fps
+        self.__image_size = img_proc.show_size if img_proc.show_size else img_proc.image_size
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # segment들은 생성 순서대로 닫히고 정리되어야 하기 때문에 하나의 thread만 사용한다.
+        self.__closer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='segment-closer')
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'opening segmented video: dir={self.output_dir}, '
+                             f'seconds={self.segment_seconds}, frames={self.segment_frames}')
+
+    def close(self) -> None:
+        if self.__closer is None:
+            return
+
+        if self.__writer is not None:
+            writer, path = self.__writer, self.__segment_path
+            self.__writer = None
+            self.__segment_path = None
+            self.__closer.submit(self.__close_segment, writer, path)
+        self.__closer.shutdown(wait=True)
+        self.__closer = None
+        if self.logger and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f'closed segmented video: dir={self.output_dir}')
+
+    @property
+    def segment_path(self) -> Optional[Path]:
+        """Returns the path of the segment being written."""
+        return self.__segment_path
+
+    def read(self, frame:Frame) -> None:
+        if self.__closer is None:
+            raise ValueError(f'SegmentedWriteProcessor has not been started')
+
+        if self.__writer is None or self.__is_segment_full(frame):
+            self.__rollover(frame)
+        self.__writer.write(frame.image)     # type: ignore
+        self.__segment_frame_count += 1
+
+    def __is_segment_full(self, frame:Frame) -> bool:
+        if self.segment_frames is not None and self.__segment_frame_count >= self.segment_frames:
+            return True
+        if self.segment_seconds is not None:
+            return (frame.ts - self.__segment_start_ts) >= self.segment_seconds * 1000
+        return False
+
+    def __rollover(self, frame:Frame) -> None:
+        path = self.output_dir / segment_file_name(frame.ts, prefix=self.prefix, suffix=self.suffix)
+        writer = self.__writer_factory(str(path), self.__fps, self.__image_size)    # type: ignore
+
+        prev_writer, prev_path = self.__writer, self.__segment_path
+        self.__writer = writer
+        self.__segment_path = path
+        self.__segment_start_ts = frame.ts
+        self.__segment_frame_count = 0
+
+        # 이전 segment는 background thread에서 닫아 frame 기록이 지연되지 않도록 한다.
+        if prev_writer is not None:
+            self.__closer.submit(self.__close_segment, prev_writer, prev_path)     # type: ignore
+        if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f'started a segment: {path}')
+
+    def __close_segment(self, writer:VideoWriter, path:Optional[Path]) -> None:
+        try:
+            writer.close()
+            if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f'closed a segment: {path}')
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f'fails to close segment: {path}, cause={e}')
+
+        try:
+            self.__apply_retention()
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f'fails to apply retention: dir={self.output_dir}, cause={e}')
+
+    def __apply_retention(self) -> None:
+        if self.retention_bytes is None and self.retention_seconds is None:
+            return
+
+        # 'segment_file_name()'으로 생성된 이름의 파일들만 정리 대상으로 하고, 기록 중인 segment는 제외한다.
+        name_pattern = re.compile(f'{re.escape(self.prefix)}{_TS_PATTERN}{re.escape(self.suffix)}')
+        active = self.__segment_path
+        segments = sorted(p for p in self.output_dir.iterdir()
+                            if name_pattern.fullmatch(p.name) and p.is_file() and p != active)
+        stats = [(p, p.stat()) for p in segments]
+        total_bytes = sum(stat.st_size for _, stat in stats)
+        now = time.time()
+        for path, stat in stats:
+            too_large = self.retention_bytes is not None and total_bytes > self.retention_bytes
+            too_old = self.retention_seconds is not None and (now - stat.st_mtime) > self.retention_seconds
+            if not too_large and not too_old:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= stat.st_size
+            if self.logger and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f'deleted a segment: {path}')
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(dir={self.output_dir}, seconds={self.segment_seconds}, '
+                f'frames={self.segment_frames})')
+
+
+def create_opencv_writer(path:str, fps:int, image_size:Size2di,
+                         *,
+                         queue_size:int=_DEFAULT_QUEUE_SIZE) -> VideoWriter:
+    """Creates the default VideoWriter of a segment or a clip: an OpenCvVideoWriter encoding
+    the images on a background thread with a bounded queue of ``queue_size`` images.
+
+    Args:
+        path (str): path to the video file.
+        fps (int): frames per second.
+        image_size (Size2di): size of the images to write.
+        queue_size (int, optional): size of the encoding queue. If 0, the images are encoded
+                                    synchronously by ``write()``. Defaults to 16.
+
+    Returns:
+        VideoWriter: created writer.
+    """
+    from .opencv_video_writer import OpenCvVideoWriter
+    return OpenCvVideoWriter(path, fps, image_size, queue_size=queue_size, drop_policy=DropPolicy.BLOCK)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Optional
+from collections import deque
+from dataclasses import dataclass, field
+import math
+
+
+_DEFAULT_WINDOW = 1024
+_DEFAULT_FPS_ALPHA = 0.1
+
+
+@dataclass(frozen=True, slots=True)
+class StageStats:
+    """Latency statistics of a processing stage.
+    Percentiles are computed over the most recent samples kept in the rolling window.
+
+    Attributes:
+        name (str): name of the stage.
+        count (int): total number of measured calls.
+        mean_ms (float): mean latency of all the calls in milliseconds.
+        p50_ms (float): median latency in milliseconds.
+        p95_ms (float): 95th percentile latency in milliseconds.
+        p99_ms (float): 99th percentile latency in milliseconds.
+        max_ms (float): maximum latency of all the calls in milliseconds.
+    """
+    name: str
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    def __repr__(self) -> str:
+        return (f'{self.name}(n={self.count}, mean={self.mean_ms:.2f}ms, p50={self.p50_ms:.2f}ms, '
+                f'p95={self.p95_ms:.2f}ms, p99={self.p99_ms:.2f}ms)')
+
+
+@dataclass(frozen=True, slots=True)
+class ProcessingStats:
+    """Snapshot of the instrumentation of an ImageProcessor.
+
+    Attributes:
+        frame_count (int): number of captured frames.
+        elapsed_ms (int): elapsed time since the processing started.
+        fps (float): exponentially weighted moving average of the capture rate.
+        stages (dict[str,StageStats]): latency statistics keyed by stage name.
+    """
+    frame_count: int
+    elapsed_ms: int
+    fps: float
+    stages: dict[str,StageStats] = field(default_factory=dict)
+
+    def bottleneck(self) -> Optional[StageStats]:
+        """Returns the stage with the largest mean latency, excluding 'capture'."""
+        stages = [stats for name, stats in self.stages.items() if name != 'capture' and stats.count > 0]
+        return max(stages, key=lambda stats: stats.mean_ms) if stages else None
+
+    def __repr__(self) -> str:
+        stages = ', '.join(repr(stats) for stats in self.stages.values())
+        return f'frames={self.frame_count}, fps={self.fps:.1f}, stages=[{stages}]'
+
+
+class LatencyRecorder:
+    """Records the latencies of a stage measured in nanoseconds.
+    ``record()`` is expected to be called from a single thread, while ``snapshot()`` may be called from any thread.
+    """
+    __slots__ = ( 'name', '__samples', '__count', '__total_ns', '__max_ns' )
+
+    def __init__(self, name:str, window:int=_DEFAULT_WINDOW) -> None:
+        if window <= 0:
+            raise ValueError(f'invalid window: {window}')
+
+        self.name = name
+        self.__samples:deque[int] = deque(maxlen=window)
+        self.__count = 0
+        self.__total_ns = 0
+        self.__max_ns = 0
+
+    def record(self, elapsed_ns:int) -> None:
+        self.__samples.append(elapsed_ns)
+        self.__count += 1
+        self.__total_ns += elapsed_ns
+        if elapsed_ns > self.__max_ns:
+            self.__max_ns = elapsed_ns
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    def snapshot(self) -> StageStats:
+        # 다른 thread에서 'record()'가 호출되는 중에도 안전하도록 복사본을 정렬한다.
+        samples = sorted(self.__samples.copy())
+        def percentile(q:float) -> float:
+            if not samples:
+                return 0.0
+            # nearest-rank 방식의 percentile을 사용한다.
+            rank = max(math.ceil(q / 100 * len(samples)), 1)
+            return samples[rank-1] / 1_000_000
+
+        count = self.__count
+        return StageStats(name=self.name, count=count,
+                          mean_ms=(self.__total_ns / count / 1_000_000) if count > 0 else 0.0,
+                          p50_ms=percentile(50), p95_ms=percentile(95), p99_ms=percentile(99),
+                          max_ms=self.__max_ns / 1_000_000)
+
+
+class EwmaRate:
+    """Exponentially weighted moving average of an event rate.
+    The intervals between events are smoothed, and the rate is the reciprocal of the smoothed interval.
+    """
+    __slots__ = ( 'alpha', '__last_ns', '__interval_ns' )
+
+    def __init__(self, alpha:float=_DEFAULT_FPS_ALPHA) -> None:
+        if not (0 < alpha <= 1):
+            raise ValueError(f'invalid alpha: {alpha}')
+
+        self.alpha = alpha
+        self.__last_ns:Optional[int] = None
+        self.__interval_ns = 0.0
+
+    def update(self, now_ns:int) -> float:
+        """Notifies an event occurred at the given time (from a monotonic clock).
+
+        Args:
+            now_ns (int): time of the event in nanoseconds.
+
+        Returns:
+            float: the updated rate (events per second).
+        """
+        if self.__last_ns is not None:
+            interval = now_ns - self.__last_ns
+            if self.__interval_ns == 0:
+                self.__interval_ns = float(interval)
+            else:
+                self.__interval_ns += self.alpha * (interval - self.__interval_ns)
+        self.__last_ns = now_ns
+        return self.rate
+
+    @property
+    def rate(self) -> float:
+        return 1_000_000_000 / self.__interval_ns if self.__interval_ns > 0 else 0.0
@@ -4,7 +4,8 @@ from enum import Enum
 from typing import Optional
 import time
 
-from ..utils import datetime2utc, utc_now_millis
+from ..utils import datetime2utc
+from ..clock import utc_now_millis, AnchoredClock, Pacer, sleep_until
 
 
 class InitialTimestamp(Enum):
@@ -30,18 +31,19 @@ class TimestampGenerator:
         self.__sync = sync
         self.__init_ts = init_ts
         self.__last_ts = 0
+        self.__last_ns = 0
         
-        now = utc_now_millis()
-        
-        # TS_ON_OPEN Ehsms 
+        # TS_ON_OPEN 또는 REALTIME인 경우에는 생성 시각을 첫번째 frame의 timestamp로 사용한다.
         if self.type == InitialTimestamp.TS_ON_OPEN or self.type == InitialTimestamp.REALTIME:
-            self.__init_ts = now
-        # 매 frame마다 ts를 생성할 때 보정용으로 사용함.
-        self.__adjust_ts = now - self.__init_ts
-        self.__frame_interval = int(1000.0 / fps)
+            self.__init_ts = utc_now_millis()
+        # frame 간격을 정수(ms)로 자르지 않아야 frame 번호가 커져도 오차가 누적되지 않는다.
+        self.__frame_interval = 1000.0 / fps
+        # sync 모드에서는 monotonic clock을 기준으로 frame 0이 생성 시각에 오도록 대기 시간을 맞춘다.
+        self.__pacer = Pacer(fps)
+        self.__clock = AnchoredClock()
 
     @classmethod
-    def parse(cls, init_ts_expr:str, fps:int, sync:bool) -> TimestampGenerator:
+    def parse(cls, init_ts_expr:str|int, fps:int, sync:bool) -> TimestampGenerator:
         match init_ts_expr:
             case '0' | 'zero' | 0:
                 return TimestampGenerator(InitialTimestamp.ZERO, fps=fps, sync=sync, init_ts=0)
@@ -49,13 +51,15 @@ class TimestampGenerator:
                 return TimestampGenerator(InitialTimestamp.TS_ON_OPEN, fps=fps, sync=sync)
             case 'realtime':
                 return TimestampGenerator(InitialTimestamp.REALTIME, fps=fps, sync=sync)
+            case int():
+                return TimestampGenerator(InitialTimestamp.GIVEN_TS, fps=fps, sync=sync, init_ts=init_ts_expr)
             case _:
                 try:
                     import dateutil.parser as dt_parser
                     # 별도의 timezone 지정없이 'parse'를 호출하면 localzone을 기준으로 datetime을 반환함.
                     dt = dt_parser.parse(init_ts_expr)
                     return TimestampGenerator(InitialTimestamp.GIVEN_TS, fps=fps, sync=sync, init_ts=datetime2utc(dt))
-                except ValueError:
+                except (ValueError, OverflowError):
                     return TimestampGenerator(InitialTimestamp.GIVEN_TS, fps=fps, sync=sync, init_ts=round(eval(init_ts_expr)))
 
     def generate(self, frame_index:int) -> int:
@@ -73,24 +77,34 @@ class TimestampGenerator:
         """
         ts = round(self.__init_ts + (frame_index*self.__frame_interval))
         if self.__sync:
-            now = utc_now_millis()
             if self.type == InitialTimestamp.REALTIME:
-                remains_ms = self.__frame_interval - (now - self.__last_ts)
+                # 직전 frame이 반환된 시각으로부터 frame 간격만큼 대기한다.
+                if self.__last_ns:
+                    sleep_until(self.__last_ns + round(self.__pacer.interval_ns), spin_ns=self.__pacer.spin_ns)
             else:
-                remains_ms = (ts + self.__adjust_ts) - now
-            # print(f'frame_index={frame_index}, ts={ts}, remain_ms={remains_ms}')
-            if remains_ms > 20:
-                time.sleep((remains_ms-5) / 1000.0)
+                self.__pacer.wait(frame_index)
 
         match self.type:
             case InitialTimestamp.ZERO | InitialTimestamp.TS_ON_OPEN | InitialTimestamp.GIVEN_TS:
                 return ts
             case InitialTimestamp.REALTIME:
-                self.__last_ts = utc_now_millis()
+                # monotonic clock 기반의 UTC 시각을 사용하여 timestamp가 역행하지 않도록 한다.
+                self.__last_ns = time.monotonic_ns()
+                self.__last_ts = round(self.__clock.to_utc_nanos(self.__last_ns) / 1_000_000)
                 return self.__last_ts
             case _:
                 raise ValueError(f'invalid initial-timestamp: {self.type}')
         
+    def resync(self, frame_index:int) -> None:
+        """Restarts the sync pacing so that the frame of the given number is due now.
+        Timestamps generated for frames are not affected.
+
+        Args:
+            frame_index (int): frame number.
+        """
+        self.__pacer.reset(frame_index)
+        self.__last_ns = 0
+
     @property
     def fps(self) -> int:
         return self.__fps
@@ -105,5 +119,5 @@ class TimestampGenerator:
 
     def __repr__(self):
         init_ts_str = f", init_ts={self.__init_ts}" if self.__init_ts is not None else ''
-        intvl_ms_str = f", interval={self.__frame_interval}ms" if self.__frame_interval is not None else ''
+        intvl_ms_str = f", interval={self.__frame_interval:.1f}ms" if self.__frame_interval is not None else ''
         return f'{self.type}{init_ts_str}{intvl_ms_str}'
\ No newline at end of file
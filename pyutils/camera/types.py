@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TypeAlias, Any
+from typing import TypeAlias, Any, Optional
 from abc import ABC, abstractmethod
 from collections import UserDict
 from dataclasses import dataclass, field
@@ -28,7 +28,8 @@ class Frame:
     
 
 class CameraOptions(UserDict):
-    KEYS = {'camera_uri', 'fps', 'sync', 'init_ts', 'begin_frame', 'end_frame'}
+    KEYS = {'camera_uri', 'fps', 'sync', 'init_ts', 'begin_frame', 'end_frame', 'prefetch', 'capture_policy',
+            'reconnect', 'ring_size'}
     
     def __init__(self, **options):
         super().__init__()
@@ -59,6 +60,18 @@ class CameraOptions(UserDict):
             case 'end_frame':
                 assert isinstance(item, int)
                 self.data['end_frame'] = item
+            case 'prefetch':
+                assert isinstance(item, int) and item >= 0
+                self.data['prefetch'] = item
+            case 'capture_policy':
+                from .capture_policy import CapturePolicy
+                self.data['capture_policy'] = CapturePolicy.parse(item)
+            case 'reconnect':
+                assert isinstance(item, bool)
+                self.data['reconnect'] = item
+            case 'ring_size':
+                assert isinstance(item, int) and item >= 2
+                self.data['ring_size'] = item
             case _:
                 self.data[key] = item
     
@@ -142,6 +155,16 @@ class ImageCapture(ABC):
     @abstractmethod
     def initial_ts(self) -> int:
         pass
+
+    @property
+    def image_reuse_interval(self) -> Optional[int]:
+        """Returns the number of frames captured after a frame until its image buffer is reused.
+        A consumer holding more frames than this should copy their images.
+
+        Returns:
+            Optional[int]: reuse interval, or None if every captured frame has its own image.
+        """
+        return None
         
     def __enter__(self) -> ImageCapture:
         return self
@@ -213,4 +236,30 @@ class CRF(Enum):
     
     @staticmethod
     def names() -> list[str]:
-        return [member.name for member in CRF] 
\ No newline at end of file
+        return [member.name for member in CRF]
+
+
+class DropPolicy(Enum):
+    """Policy applied when a bounded frame queue is full."""
+    BLOCK = 1
+    '''The producer waits until the queue has a room.'''
+    DROP_OLDEST = 2
+    '''The oldest frame in the queue is discarded.'''
+    DROP_NEWEST = 3
+    '''The frame being queued is discarded.'''
+    RAISE = 4
+    '''QueueOverflowError is raised to the producer.'''
+
+    @classmethod
+    def from_name(cls, name:str) -> DropPolicy:
+        name = name.upper().replace('-', '_')
+        for item in DropPolicy:
+            if item.name == name:
+                return item
+        raise KeyError(f"invalid DropPolicy: {name}")
+
+
+class QueueOverflowError(Exception):
+    def __init__(self, message:Optional[str]) -> None:
+        self.message = message
+        super().__init__(message)
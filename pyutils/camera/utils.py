@@ -1,60 +1,221 @@
 from __future__ import annotations
 from abc import abstractmethod
 from typing import Optional
+from collections.abc import Callable
 
 from contextlib import suppress
+import threading
+from queue import Queue, Full, Empty
 
 from .types import Image, Frame, ImageCapture
 from .ts_generator import TimestampGenerator
+from .capture_policy import CapturePolicy, AllFrames
+
+
+_PREFETCH_POLL_SECONDS = 0.1
+
+
+class ImagePrefetcher:
+    """Background thread that grabs images ahead of their consumption.
+    Each grabbed item is a pair of the number of source frames consumed to grab the image and the image.
+    Grabbed items are kept in a bounded queue. When ``capacity`` items are waiting to be consumed,
+    the grabbing thread blocks, or discards the oldest item if ``drop_oldest`` is set.
+    """
+    __slots__ = ( '__grab', '__queue', '__drop_oldest', '__stopped', '__finished', '__thread' )
+
+    def __init__(self, grab:Callable[[],Optional[tuple[int,Image]]], capacity:int,
+                 *,
+                 drop_oldest:bool=False,
+                 name:Optional[str]=None) -> None:
+        if capacity <= 0:
+            raise ValueError(f'invalid prefetch capacity: {capacity}')
+
+        self.__grab = grab
+        self.__queue:Queue[Optional[tuple[int,Image]]|Exception] = Queue(maxsize=capacity)
+        self.__drop_oldest = drop_oldest
+        self.__stopped = threading.Event()
+        self.__finished = False
+        self.__thread = threading.Thread(target=self.__run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stops the grabbing thread and waits for its termination.
+        Images that have been prefetched but not consumed yet are discarded.
+        """
+        self.__stopped.set()
+        if self.__thread.is_alive():
+            self.__thread.join()
+
+    def get(self) -> Optional[tuple[int,Image]]:
+        """Returns the next prefetched item.
+        If there is no more images to grab, this method returns None.
+
+        Raises:
+            Exception: the exception raised while grabbing images in the background thread.
+
+        Returns:
+            Optional[tuple[int,Image]]: the number of consumed source frames and the prefetched image.
+        """
+        if self.__finished:
+            return None
+
+        item = self.__queue.get()
+        if item is None or isinstance(item, Exception):
+            self.__finished = True
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def __run(self) -> None:
+        try:
+            while not self.__stopped.is_set():
+                item = self.__grab()
+                if item is not None and self.__drop_oldest:
+                    item = self.__replace_oldest(item)
+                self.__put(item)
+                if item is None:
+                    return
+        except Exception as e:
+            self.__put(e)
+
+    def __replace_oldest(self, item:tuple[int,Image]) -> tuple[int,Image]:
+        # 버려지는 image의 source frame 수는 새 image에 합산하여 frame 번호가 유지되도록 한다.
+        if self.__queue.full():
+            with suppress(Empty):
+                dropped = self.__queue.get_nowait()
+                if isinstance(dropped, tuple):
+                    return (dropped[0] + item[0], item[1])
+        return item
+
+    def __put(self, item:Optional[tuple[int,Image]]|Exception) -> None:
+        # consumer가 종료된 경우에도 block되지 않도록 주기적으로 종료 여부를 확인한다.
+        while not self.__stopped.is_set():
+            try:
+                self.__queue.put(item, timeout=_PREFETCH_POLL_SECONDS)
+                return
+            except Full: pass
 
 
 class SyncableImageCapture(ImageCapture):
-    __slots__ =  ( '__frame_index', '__ts_gen', 'init_ts_expr', '__closed')
+    __slots__ =  ( '__frame_index', '__ts_gen', 'init_ts_expr', '__closed', '__prefetch', '__prefetcher',
+                   '__capture_policy' )
 
-    def __init__(self, init_ts_expr:str, init_frame_index:int) -> None:
+    def __init__(self, init_ts_expr:str, init_frame_index:int,
+                 *,
+                 prefetch:int=0,
+                 capture_policy:Optional[str|CapturePolicy]=None) -> None:
         self.__frame_index = init_frame_index-1
         self.init_ts_expr = init_ts_expr
         self.__ts_gen:Optional[TimestampGenerator] = None
-            
+        self.__closed = False
+        self.__prefetch = prefetch
+        self.__prefetcher:Optional[ImagePrefetcher] = None
+        self.__capture_policy = CapturePolicy.parse(capture_policy) if capture_policy else AllFrames()
+
     @abstractmethod
     def close_in_guard(self) -> None: pass
 
     def close(self) -> None:
         if not self.__closed:
+            # prefetch thread가 capture 객체를 사용 중일 수 있기 때문에 먼저 종료시킨다.
+            if self.__prefetcher is not None:
+                with suppress(Exception): self.__prefetcher.stop()
+                self.__prefetcher = None
             with suppress(Exception): self.close_in_guard()
-            self.__closed = False
-        
+            self.__closed = True
+
     def is_closed(self) -> bool:
         return self.__closed
 
     def __next__(self) -> Frame:
-        image = self.grab_image()
-        if image is None:
+        grabbed = self.__next_image()
+        if grabbed is None:
             raise StopIteration()
-        
+        advance, image = grabbed
+
         if self.__ts_gen is None:
             self.__ts_gen = TimestampGenerator.parse(self.init_ts_expr, fps=self.fps, sync=self.sync)
 
-        ts = self.__ts_gen.generate(self.__frame_index)
-        self.__frame_index += 1
+        # capture policy에 의해 건너뛴 frame들도 frame 번호에 반영한다.
+        self.__frame_index += advance
+        ts = self.__ts_gen.generate(self.__frame_index-1)
 
         return Frame(image=image, index=self.__frame_index, ts=ts)
 
+    def __next_image(self) -> Optional[tuple[int,Image]]:
+        latest_only = self.__capture_policy.latest_only
+        if self.__prefetch <= 0 and not latest_only:
+            return self.__grab_next()
+
+        # prefetch thread는 첫번째 frame을 요청할 때 시작시킨다.
+        # 이는 하위 클래스가 생성자에서 capture 위치를 조정할 수 있도록 하기 위함이다.
+        if self.__prefetcher is None:
+            self.__prefetcher = ImagePrefetcher(self.__grab_next, max(self.__prefetch, 1),
+                                                drop_oldest=latest_only,
+                                                name=f'{self.__class__.__name__}-prefetch')
+            self.__prefetcher.start()
+        return self.__prefetcher.get()
+
+    def __grab_next(self) -> Optional[tuple[int,Image]]:
+        skips = self.__capture_policy.frames_to_skip(self.fps)
+        for _ in range(skips):
+            if not self.skip_image():
+                return None
+        image = self.grab_image()
+        return (skips+1, image) if image is not None else None
+
+    def _reposition(self, frame_index:int, move:Callable[[],None]) -> None:
+        """Moves the image source so that the next captured frame has the given frame number.
+        Prefetched frames are discarded before ``move`` repositions the image source, and
+        the sync pacing restarts from the new position.
+
+        Args:
+            frame_index (int): frame number of the next captured frame.
+            move (Callable[[],None]): function that repositions the image source.
+        """
+        if self.__prefetcher is not None:
+            self.__prefetcher.stop()
+            self.__prefetcher = None
+        move()
+        self.__frame_index = frame_index-1
+        if self.__ts_gen is not None:
+            self.__ts_gen.resync(self.__frame_index)
+
     @abstractmethod
     def grab_image(self) -> Optional[Image]:
         """Grab an image frame from a camera.
         If it fails to capture an image, this method returns None.
+        When prefetching is enabled, this method is called from the prefetch thread.
 
         Returns:
             Image: captured image (OpenCv format).
         """
         pass
-    
+
+    def skip_image(self) -> bool:
+        """Skips an image frame from a camera.
+        Subclasses may override this method to skip a frame without decoding it.
+
+        Returns:
+            bool: True if a frame is skipped, False if there is no more frames.
+        """
+        return self.grab_image() is not None
+
     @property
     @abstractmethod
     def sync(self) -> bool:
         pass
 
+    @property
+    def prefetch(self) -> int:
+        return self.__prefetch
+
+    @property
+    def capture_policy(self) -> CapturePolicy:
+        return self.__capture_policy
+
     @property
     def frame_index(self) -> int:
         return self.__frame_index
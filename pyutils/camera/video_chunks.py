@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from typing import Optional, Any
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+import tempfile
+import logging
+
+import cv2
+
+from ..utils import utc_now_millis
+from .camera import load_camera, is_video_file
+from .image_processor import FrameProcessor, ImageProcessorOptions, Result, create_image_processor
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkResult:
+    """Result of processing a frame range of a video file.
+
+    Attributes:
+        begin_frame (int): the first frame number of the chunk.
+        end_frame (int): the frame number following the last frame of the chunk.
+        result (Result): processing result of the chunk.
+        output (Any): value collected from the chunk's frame processor, if any.
+    """
+    begin_frame: int
+    end_frame: int
+    result: Result
+    output: Any = field(default=None, repr=False)
+
+
+def split_frame_ranges(begin_frame:int, end_frame:int, chunks:int) -> list[tuple[int,int]]:
+    """Splits the frame range [begin_frame, end_frame) into the given number of contiguous ranges.
+
+    Args:
+        begin_frame (int): the first frame number.
+        end_frame (int): the frame number following the last frame.
+        chunks (int): number of ranges.
+
+    Returns:
+        list[tuple[int,int]]: frame ranges. Empty ranges are omitted.
+    """
+    if chunks <= 0:
+        raise ValueError(f'invalid number of chunks: {chunks}')
+
+    total = max(end_frame - begin_frame, 0)
+    quotient, remainder = divmod(total, chunks)
+    ranges:list[tuple[int,int]] = []
+    begin = begin_frame
+    for idx in range(chunks):
+        end = begin + quotient + (1 if idx < remainder else 0)
+        if end > begin:
+            ranges.append((begin, end))
+        begin = end
+    return ranges
+
+
+def _process_chunk(video_path:str, begin_frame:int, end_frame:int,
+                   frame_processor_factory:Optional[Callable[[],FrameProcessor]],
+                   collect:Optional[Callable[[FrameProcessor],Any]],
+                   options:dict[str,Any]) -> ChunkResult:
+    frame_processor = frame_processor_factory() if frame_processor_factory else None
+    proc = create_image_processor(video_path, frame_processor=frame_processor,
+                                  **options, begin_frame=begin_frame, end_frame=end_frame)
+    result = proc.run()
+    output = collect(frame_processor) if collect and frame_processor is not None else None
+    return ChunkResult(begin_frame=begin_frame, end_frame=end_frame, result=result, output=output)
+
+
+def process_video_chunks(video_path:str, chunks:int,
+                         frame_processor_factory:Optional[Callable[[],FrameProcessor]]=None,
+                         *,
+                         collect:Optional[Callable[[FrameProcessor],Any]]=None,
+                         workers:Optional[int]=None,
+                         logger:Optional[logging.Logger]=None,
+                         **options) -> tuple[Result, list[ChunkResult]]:
+    """Processes a video file by splitting it into frame ranges processed in parallel worker processes.
+    Each range is processed by its own ImageProcessor and FrameProcessor created with
+    ``frame_processor_factory``. If 'output_video' option is given, the videos written for each range
+    are concatenated in frame order.
+
+    Args:
+        video_path (str): path to the video file.
+        chunks (int): number of frame ranges.
+        frame_processor_factory (Optional[Callable[[],FrameProcessor]], optional): picklable function
+                        creating the FrameProcessor of a chunk. Defaults to None.
+        collect (Optional[Callable[[FrameProcessor],Any]], optional): picklable function called with the
+                        chunk's FrameProcessor after processing. Its return value is given as
+                        ``ChunkResult.output``. Defaults to None.
+        workers (Optional[int], optional): number of worker processes. Defaults to ``chunks``.
+        logger (Optional[logging.Logger], optional): logger. Defaults to None.
+
+    Keyword Args:
+        the options of ``process_images()``, except 'show', 'sync', 'begin_frame' and 'end_frame'.
+        'begin_frame' and 'end_frame' limit the whole range to process.
+        The videos of the chunks that failed are left out of 'output_video'.
+
+    Returns:
+        tuple[Result, list[ChunkResult]]: the merged result and the results of the chunks in frame order.
+    """
+    if not is_video_file(video_path):
+        raise ValueError(f'not a video file: {video_path}')
+    if options.get('show'):
+        raise ValueError(f"'show' option is not supported for chunked processing")
+
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"fails to open VideFile: {video_path}")
+        total_frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+
+    begin_frame = options.pop('begin_frame', 1)
+    end_frame = options.pop('end_frame', total_frame_count+1)
+    ranges = split_frame_ranges(begin_frame, end_frame, chunks)
+    if not ranges:
+        # 처리할 frame이 없는 경우에는 worker process들을 생성하지 않는다.
+        return Result(elapsed_ms=0, frame_count=0, fps_measured=0.0), []
+
+    # 모든 chunk들의 timestamp가 연속되도록 초기 timestamp를 미리 결정한다.
+    init_ts = options.get('init_ts', 'open')
+    if init_ts in ('open', 'realtime'):
+        options['init_ts'] = utc_now_millis()
+    options['sync'] = False
+
+    output_video = options.pop('output_video', None)
+    part_dir = tempfile.TemporaryDirectory(prefix='chunks-') if output_video else None
+    part_paths = ([str(Path(part_dir.name) / f'part-{idx:04d}{Path(output_video).suffix}')   # type: ignore
+                    for idx in range(len(ranges))] if part_dir else [])
+    ImageProcessorOptions(**options)    # 옵션 값들을 미리 검증한다.
+
+    started_ms = utc_now_millis()
+    try:
+        with ProcessPoolExecutor(max_workers=workers if workers else len(ranges)) as executor:
+            futures = []
+            for idx, (begin, end) in enumerate(ranges):
+                chunk_opts = dict(options, output_video=part_paths[idx]) if part_dir else options
+                futures.append(executor.submit(_process_chunk, video_path, begin, end,
+                                               frame_processor_factory, collect, chunk_opts))
+            chunk_results = [future.result() for future in futures]
+
+        if output_video and part_paths:
+            # 처리에 실패한 chunk의 video는 불완전하므로 이어 붙이지 않는다.
+            completed_paths = [path for path, chunk in zip(part_paths, chunk_results)
+                                if chunk.result.failure_cause is None and Path(path).exists()]
+            if len(completed_paths) < len(part_paths) and logger and logger.isEnabledFor(logging.WARNING):
+                failed = [(chunk.begin_frame, chunk.end_frame) for chunk in chunk_results
+                            if chunk.result.failure_cause is not None]
+                logger.warning(f'excluded the videos of failed chunks from {output_video}: ranges={failed}')
+            if completed_paths:
+                _concat_videos(completed_paths, output_video, logger=logger)
+    finally:
+        if part_dir:
+            with suppress(Exception): part_dir.cleanup()
+
+    frame_count = sum(chunk.result.frame_count for chunk in chunk_results)
+    elapsed_ms = utc_now_millis() - started_ms
+    failure_cause = next((chunk.result.failure_cause for chunk in chunk_results
+                            if chunk.result.failure_cause is not None), None)
+    result = Result(elapsed_ms=elapsed_ms, frame_count=frame_count,
+                    fps_measured=(frame_count * 1000 / elapsed_ms) if elapsed_ms > 0 else 0.0,
+                    failure_cause=failure_cause)
+    if logger and logger.isEnabledFor(logging.INFO):
+        logger.info(f'processed video chunks: path={video_path}, chunks={len(ranges)}, result={result}')
+
+    return result, chunk_results
+
+
+def _concat_videos(part_paths:list[str], output_video:str,
+                   *,
+                   logger:Optional[logging.Logger]=None) -> None:
+    Path(output_video).parent.mkdir(parents=True, exist_ok=True)
+    try:
+        # ffmpeg의 concat demuxer를 사용하여 re-encoding없이 이어 붙인다.
+        import ffmpeg
+
+        list_path = Path(part_paths[0]).parent / 'parts.txt'
+        with open(list_path, 'wt') as f:
+            for path in part_paths:
+                f.write(f"file '{path}'\n")
+        (ffmpeg.input(str(list_path), format='concat', safe=0)
+                .output(output_video, c='copy')
+                .overwrite_output()
+                .run(quiet=True))
+    except Exception as e:
+        if logger and logger.isEnabledFor(logging.INFO):
+            logger.info(f'fails to concatenate with ffmpeg, re-encoding with OpenCV: cause={e}')
+        _concat_videos_opencv(part_paths, output_video)
+
+
+def _concat_videos_opencv(part_paths:list[str], output_video:str) -> None:
+    from .opencv_video_writer import OpenCvVideoWriter
+    from ..size2di import Size2di
+
+    writer:Optional[OpenCvVideoWriter] = None
+    try:
+        for path in part_paths:
+            cap = cv2.VideoCapture(path)
+            try:
+                while True:
+                    ok, image = cap.read()
+                    if not ok:
+                        break
+                    if writer is None:
+                        h, w = image.shape[:2]
+                        writer = OpenCvVideoWriter(output_video, int(cap.get(cv2.CAP_PROP_FPS)), Size2di(w, h))
+                    writer.write(image)
+            finally:
+                cap.release()
+    finally:
+        if writer is not None:
+            writer.close()
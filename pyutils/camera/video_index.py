@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from typing import Optional
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from bisect import bisect_right
+import json
+import logging
+
+import cv2
+
+
+_SIDECAR_SUFFIX = '.index.json'
+_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class VideoIndex:
+    """Frame index of a video file.
+    The index is stored in a sidecar file next to the video, and it is regarded as valid
+    only while the modification time and the size of the video file are unchanged.
+
+    Attributes:
+        mtime_ns (int): modification time of the indexed video file.
+        size (int): size of the indexed video file in bytes.
+        frame_count (int): total number of frames.
+        fps (float): frame rate.
+        keyframes (list[int]): sorted frame numbers (1-based) of the key frames.
+                            Empty if the key frames could not be determined.
+    """
+    mtime_ns: int
+    size: int
+    frame_count: int
+    fps: float
+    keyframes: list[int] = field(repr=False)
+
+    @staticmethod
+    def sidecar_path(video_path:str|Path) -> Path:
+        video_path = Path(video_path)
+        return video_path.with_name(video_path.name + _SIDECAR_SUFFIX)
+
+    @classmethod
+    def load(cls, video_path:str|Path) -> Optional[VideoIndex]:
+        """Loads the index of the given video file from its sidecar file.
+
+        Args:
+            video_path (str|Path): path to the video file.
+
+        Returns:
+            Optional[VideoIndex]: the loaded index, or None if there is no valid index.
+        """
+        sidecar = cls.sidecar_path(video_path)
+        try:
+            with open(sidecar, 'rt') as f:
+                data = json.load(f)
+            if data.pop('version', None) != _INDEX_VERSION:
+                return None
+            index = VideoIndex(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+        stat = Path(video_path).stat()
+        if index.mtime_ns != stat.st_mtime_ns or index.size != stat.st_size:
+            return None
+        return index
+
+    def save(self, video_path:str|Path) -> None:
+        with open(self.sidecar_path(video_path), 'wt') as f:
+            json.dump({'version': _INDEX_VERSION, **asdict(self)}, f)
+
+    @classmethod
+    def build(cls, video_path:str|Path) -> VideoIndex:
+        """Builds the index of the given video file.
+        Key frames are collected with ffprobe. If ffprobe is not available, only the frame count
+        and the frame rate reported by OpenCV are indexed.
+
+        Args:
+            video_path (str|Path): path to the video file.
+
+        Returns:
+            VideoIndex: the built index.
+        """
+        stat = Path(video_path).stat()
+        cap = cv2.VideoCapture(str(video_path))
+        try:
+            if not cap.isOpened():
+                raise ValueError(f"fails to open VideFile: {video_path}")
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            fps = float(cap.get(cv2.CAP_PROP_FPS))
+        finally:
+            cap.release()
+
+        keyframes:list[int] = []
+        try:
+            keyframes, probed_count = _probe_keyframes(str(video_path))
+            if probed_count > 0:
+                frame_count = probed_count
+        except Exception as e:
+            logger = logging.getLogger('camera.video_index')
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f'fails to probe key frames: path={video_path}, cause={e}')
+
+        return VideoIndex(mtime_ns=stat.st_mtime_ns, size=stat.st_size, frame_count=frame_count,
+                          fps=fps, keyframes=keyframes)
+
+    @classmethod
+    def load_or_build(cls, video_path:str|Path, *, save:bool=True) -> VideoIndex:
+        index = cls.load(video_path)
+        if index is None:
+            index = cls.build(video_path)
+            if save:
+                try:
+                    index.save(video_path)
+                except OSError as e:
+                    logger = logging.getLogger('camera.video_index')
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f'fails to save video index: path={video_path}, cause={e}')
+        return index
+
+    def keyframe_before(self, frame_index:int) -> Optional[int]:
+        """Returns the last key frame number that is not after the given frame.
+
+        Args:
+            frame_index (int): frame number (1-based).
+
+        Returns:
+            Optional[int]: key frame number, or None if unknown.
+        """
+        idx = bisect_right(self.keyframes, frame_index)
+        return self.keyframes[idx-1] if idx > 0 else None
+
+
+def _probe_keyframes(video_path:str) -> tuple[list[int],int]:
+    import ffmpeg
+
+    probe = ffmpeg.probe(video_path, select_streams='v:0', show_packets=None)
+    packets = probe.get('packets', [])
+
+    # packet들은 decoding 순서로 나열되기 때문에 pts 순서로 정렬하여 frame 번호를 구한다.
+    def pts(packet:dict) -> int:
+        value = packet.get('pts', packet.get('dts'))
+        return int(value) if value is not None and value != 'N/A' else 0
+    ordered = sorted(packets, key=pts)
+    keyframes = [no for no, packet in enumerate(ordered, start=1) if 'K' in packet.get('flags', '')]
+    return keyframes, len(ordered)
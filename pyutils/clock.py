@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Optional
+import time
+
+
+_NANOS_PER_MILLI = 1_000_000
+_NANOS_PER_SECOND = 1_000_000_000
+
+# deadline 직전의 이 시간 동안은 sleep 대신 spin하며 대기한다.
+# ('time.sleep()'은 OS scheduler에 따라 수십~수백 us 늦게 깨어날 수 있다.)
+_DEFAULT_SPIN_NS = 1_500_000
+
+
+def utc_now_nanos() -> int:
+    return time.time_ns()
+
+def utc_now_millis() -> int:
+    # 기존 'round(datetime.now().timestamp() * 1000)'와 동일하게 반올림한다.
+    return (time.time_ns() + _NANOS_PER_MILLI // 2) // _NANOS_PER_MILLI
+
+def monotonic_nanos() -> int:
+    return time.monotonic_ns()
+
+def monotonic_millis() -> int:
+    return time.monotonic_ns() // _NANOS_PER_MILLI
+
+
+class AnchoredClock:
+    """UTC clock derived from the monotonic clock.
+    The wall-clock time is read only once (the anchor), and later times are computed by adding
+    the elapsed monotonic time to it, so the returned times never go backwards even if the system
+    clock is adjusted.
+    """
+    __slots__ = ( '__anchor_utc_ns', '__anchor_mono_ns' )
+
+    def __init__(self) -> None:
+        self.reanchor()
+
+    def reanchor(self) -> None:
+        """Re-reads the wall clock to correct the drift accumulated since the anchor."""
+        self.__anchor_mono_ns = time.monotonic_ns()
+        self.__anchor_utc_ns = time.time_ns()
+
+    def to_utc_nanos(self, mono_ns:int) -> int:
+        """Converts a time of the monotonic clock into UTC nanoseconds."""
+        return self.__anchor_utc_ns + (mono_ns - self.__anchor_mono_ns)
+
+    def now_nanos(self) -> int:
+        return self.to_utc_nanos(time.monotonic_ns())
+
+    def now_millis(self) -> int:
+        return (self.now_nanos() + _NANOS_PER_MILLI // 2) // _NANOS_PER_MILLI
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(anchor={self.__anchor_utc_ns // _NANOS_PER_MILLI})'
+
+
+def sleep_until(deadline_ns:int, *, spin_ns:int=_DEFAULT_SPIN_NS) -> int:
+    """Waits until the monotonic clock reaches the given deadline.
+    It sleeps until ``spin_ns`` before the deadline, and then yields the CPU repeatedly
+    until the deadline passes.
+
+    Args:
+        deadline_ns (int): deadline in nanoseconds of ``time.monotonic_ns()``.
+        spin_ns (int, optional): length of the spinning period. Defaults to 1.5ms.
+
+    Returns:
+        int: lateness in nanoseconds (0 or positive) when the wait has finished.
+    """
+    remains = deadline_ns - time.monotonic_ns()
+    if remains > spin_ns:
+        time.sleep((remains - spin_ns) / _NANOS_PER_SECOND)
+    while (now := time.monotonic_ns()) < deadline_ns:
+        # 'sleep(0)'은 GIL을 양보하므로 spin 중에도 다른 thread들이 수행될 수 있다.
+        time.sleep(0)
+    return now - deadline_ns
+
+
+class Pacer:
+    """Paces frames at a fixed rate on the monotonic clock.
+    The deadline of a frame is computed from its index and the origin (``reset()``), not from
+    the previous frame, so the rounding errors and the oversleeps do not accumulate.
+    """
+    __slots__ = ( 'fps', 'spin_ns', '__interval_ns', '__origin_ns' )
+
+    def __init__(self, fps:float, *, spin_ns:int=_DEFAULT_SPIN_NS) -> None:
+        """Creates a Pacer. The frame 0 is due at the creation time.
+
+        Args:
+            fps (float): target frame rate.
+            spin_ns (int, optional): length of the spinning period before each deadline. Defaults to 1.5ms.
+        """
+        if fps <= 0:
+            raise ValueError(f'invalid fps: {fps}')
+        if spin_ns < 0:
+            raise ValueError(f'invalid spin_ns: {spin_ns}')
+
+        self.fps = fps
+        self.spin_ns = spin_ns
+        self.__interval_ns = _NANOS_PER_SECOND / fps
+        self.__origin_ns = time.monotonic_ns()
+
+    @property
+    def interval_ns(self) -> float:
+        return self.__interval_ns
+
+    def reset(self, frame_index:int=0, *, now_ns:Optional[int]=None) -> None:
+        """Restarts the pacing so that the frame of the given index is due now.
+
+        Args:
+            frame_index (int, optional): frame index due now. Defaults to 0.
+            now_ns (Optional[int], optional): current monotonic time. Defaults to ``time.monotonic_ns()``.
+        """
+        now_ns = now_ns if now_ns is not None else time.monotonic_ns()
+        self.__origin_ns = now_ns - round(frame_index * self.__interval_ns)
+
+    def deadline_ns(self, frame_index:int) -> int:
+        return self.__origin_ns + round(frame_index * self.__interval_ns)
+
+    def wait(self, frame_index:int) -> int:
+        """Waits until the frame of the given index is due.
+
+        Args:
+            frame_index (int): frame index.
+
+        Returns:
+            int: lateness in nanoseconds (0 or positive).
+        """
+        return sleep_until(self.deadline_ns(frame_index), spin_ns=self.spin_ns)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(fps={self.fps}, spin={self.spin_ns / _NANOS_PER_MILLI:.1f}ms)'
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections.abc import Hashable
+import math
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(v:int) -> int:
+    # splitmix64의 finalizer. 작은 정수의 hash 값은 자기 자신이므로 bit들을 고르게 섞어준다.
+    v = (v + 0x9E3779B97F4A7C15) & _MASK64
+    v = ((v ^ (v >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    v = ((v ^ (v >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return v ^ (v >> 31)
+
+
+class HyperLogLog:
+    """Approximate distinct counter using ``2**precision`` registers of a byte each.
+    The relative standard error of the estimate is about ``1.04 / sqrt(2**precision)``
+    (0.8% with the default precision of 14, using 16KB of memory).
+
+    Values are hashed with the built-in ``hash()``, so counters of str or bytes values
+    can be merged only within the same process (or with the same PYTHONHASHSEED).
+    """
+    __slots__ = ( 'precision', '__registers' )
+
+    def __init__(self, precision:int=14) -> None:
+        if not (4 <= precision <= 16):
+            raise ValueError(f'invalid precision: {precision}, expected 4..16')
+
+        self.precision = precision
+        self.__registers = bytearray(1 << precision)
+
+    def add(self, value:Hashable) -> None:
+        x = _mix64(hash(value) & _MASK64)
+        # 상위 'precision' bit로 register를 고르고, 나머지 bit들의 leading zero 수로 rank를 정한다.
+        remains_bits = 64 - self.precision
+        idx = x >> remains_bits
+        rank = remains_bits - (x & ((1 << remains_bits) - 1)).bit_length() + 1
+        if rank > self.__registers[idx]:
+            self.__registers[idx] = rank
+
+    def merge(self, other:HyperLogLog) -> None:
+        """Merges the values counted by another HyperLogLog of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError(f'incompatible precision: {self.precision} != {other.precision}')
+        self.__registers = bytearray(map(max, self.__registers, other.__registers))
+
+    def count(self) -> int:
+        """Returns the estimated number of distinct values added."""
+        m = len(self.__registers)
+        match m:
+            case 16: alpha = 0.673
+            case 32: alpha = 0.697
+            case 64: alpha = 0.709
+            case _: alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.__registers)
+
+        # 값이 적은 경우에는 linear counting이 더 정확하다.
+        zeros = self.__registers.count(0)
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(precision={self.precision}, count~={self.count()})'
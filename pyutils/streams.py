@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-from typing import TypeVar, TypeAlias, Optional, overload, Any, Protocol, cast, Generic
+from typing import TypeVar, TypeAlias, Optional, overload, Any, Protocol, cast, Generic, TYPE_CHECKING
 from collections.abc import Iterable, Callable, Iterator, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from collections import deque
+from concurrent.futures import Executor, Future
+import operator
 import builtins
+import threading
+import time
 
 import itertools
 
-from .types import KeyValue
+from .types import KeyValue, Timestamped
 from .typing import SupportsDunderLT, SupportsDunderEQ, SupportsRichComparison, SupportsRichComparisonNeg
 from .typing import SupportsRichComparisonT
+if TYPE_CHECKING:
+    from .async_streams import AsyncStream
 
 
 S = TypeVar("S")
@@ -28,6 +34,249 @@ FlatMapper:TypeAlias = Callable[[T],Iterable[S]]
 FlatMapperNone:TypeAlias = Callable[[T],Iterable[S|None]]
 
 
+def _map_chunk(mapper:Callable[[S],T], chunk:list[S]) -> list[T]:
+    return [mapper(v) for v in chunk]
+
+def _filter_chunk(pred:Callable[[S],bool], chunk:list[S]) -> list[S]:
+    return [v for v in chunk if pred(v)]
+
+def _flatmap_chunk(mapper:Callable[[S],Optional[Iterable[T]]], chunk:list[S]) -> list[T]:
+    mapped:list[T] = []
+    for v in chunk:
+        values = mapper(v)
+        if values is not None:
+            mapped.extend(values)
+    return mapped
+
+def _chunks(src:Iterator[S], chunksize:int) -> Iterator[list[S]]:
+    while chunk := list(itertools.islice(src, chunksize)):
+        yield chunk
+
+def _create_executor(executor:str, workers:Optional[int]) -> Executor:
+    match executor:
+        case 'thread':
+            from concurrent.futures import ThreadPoolExecutor
+            return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stream')
+        case 'process':
+            from concurrent.futures import ProcessPoolExecutor
+            return ProcessPoolExecutor(max_workers=workers)
+        case _:
+            raise ValueError(f"invalid executor: {executor}, expected 'thread' or 'process'")
+
+def _parallel(src:Iterator[S], chunk_func:Callable[[Any,list[S]],list[T]], func:Any,
+              *,
+              workers:Optional[int],
+              executor:str|Executor,
+              ordered:bool,
+              chunksize:int,
+              max_in_flight:Optional[int]) -> Iterator[T]:
+    if workers is not None and workers <= 0:
+        raise ValueError(f'invalid workers: {workers}')
+    if chunksize <= 0:
+        raise ValueError(f'invalid chunksize: {chunksize}')
+    if isinstance(executor, str) and executor not in ('thread', 'process'):
+        raise ValueError(f"invalid executor: {executor}, expected 'thread' or 'process'")
+    if max_in_flight is None:
+        import os
+        max_in_flight = 2 * (workers if workers else (os.cpu_count() or 1))
+    elif max_in_flight <= 0:
+        raise ValueError(f'invalid max_in_flight: {max_in_flight}')
+    
+    def generate() -> Iterator[T]:
+        from concurrent.futures import wait, FIRST_COMPLETED
+        
+        # executor는 stream이 처음 소비될 때 생성하고, 외부에서 주어진 executor는 종료시키지 않는다.
+        pool = _create_executor(executor, workers) if isinstance(executor, str) else executor
+        pending:deque[Future[list[T]]] = deque()
+        
+        def next_results() -> list[T]:
+            if ordered:
+                return pending.popleft().result()
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            fut = next(iter(done))
+            pending.remove(fut)
+            return fut.result()
+            
+        try:
+            # 최대 'max_in_flight'개의 chunk만 동시에 처리 중이도록 하여 무한 stream도 lazy하게 처리한다.
+            for chunk in _chunks(src, chunksize):
+                if len(pending) >= max_in_flight:
+                    yield from next_results()
+                pending.append(pool.submit(chunk_func, func, chunk))
+            while pending:
+                yield from next_results()
+        finally:
+            # stream이 중간에 닫히거나 예외가 발생한 경우에는 아직 시작되지 않은 작업들을 취소한다.
+            for fut in pending:
+                fut.cancel()
+            if isinstance(executor, str):
+                pool.shutdown(wait=True)
+    return generate()
+
+
+@dataclass(frozen=True, slots=True)
+class Window(Generic[S]):
+    """Values whose timestamps fall in the interval [begin_ts, end_ts)."""
+    begin_ts: int
+    end_ts: int
+    values: list[S] = field(repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}[{self.begin_ts}, {self.end_ts}), count={len(self.values)}]'
+
+
+@dataclass(frozen=True, slots=True)
+class _ReadFailure:
+    error: Exception
+_END_OF_STREAM = object()
+_BATCH_POLL_SECONDS = 0.1
+
+def _batches(src:Iterator[S], max_size:int, max_wait_ms:float) -> Iterator[list[S]]:
+    from queue import Queue, Empty, Full
+    
+    queue:Queue[Any] = Queue(maxsize=max_size)
+    stopped = threading.Event()
+    
+    def put(item:Any) -> bool:
+        # consumer가 stream을 닫은 경우에도 block되지 않도록 주기적으로 종료 여부를 확인한다.
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=_BATCH_POLL_SECONDS)
+                return True
+            except Full: pass
+        return False
+    
+    def read() -> None:
+        try:
+            for v in src:
+                if not put(v):
+                    return
+            put(_END_OF_STREAM)
+        except Exception as e:
+            put(_ReadFailure(e))
+    
+    def generate() -> Iterator[list[S]]:
+        # source에서 값을 읽는 동안에도 대기 시간을 잴 수 있도록 별도의 thread에서 source를 읽는다.
+        threading.Thread(target=read, name='stream-batch', daemon=True).start()
+        try:
+            finished = False
+            while not finished:
+                item = queue.get()
+                # batch의 대기 시간은 batch의 첫번째 값이 도착한 시점부터 잰다.
+                deadline = time.monotonic() + max_wait_ms / 1000
+                batch:list[S] = []
+                while True:
+                    if item is _END_OF_STREAM:
+                        finished = True
+                        break
+                    if isinstance(item, _ReadFailure):
+                        if batch:
+                            yield batch
+                        raise item.error
+                    batch.append(item)
+                    if len(batch) >= max_size:
+                        break
+                    
+                    remains = deadline - time.monotonic()
+                    try:
+                        # 대기 시간이 지난 후에도 이미 도착한 값들은 batch에 포함시킨다.
+                        item = queue.get(timeout=remains) if remains > 0 else queue.get_nowait()
+                    except Empty:
+                        break
+                if batch:
+                    yield batch
+        finally:
+            stopped.set()
+    return generate()
+
+def _windows(src:Iterator[S], size_ms:int, slide_ms:int, ts_getter:Callable[[S],int]) -> Iterator[Window[S]]:
+    def first_start(ts:int) -> int:
+        # 주어진 timestamp를 포함하는 window들 중에서 가장 먼저 시작하는 window의 시작 시각.
+        return ((ts - size_ms) // slide_ms + 1) * slide_ms
+    
+    buffer:deque[tuple[int,S]] = deque()
+    next_begin:Optional[int] = None
+    for v in src:
+        ts = ts_getter(v)
+        if next_begin is None:
+            next_begin = first_start(ts)
+        
+        # 새 값의 timestamp가 끝 시각을 지난 window들을 순서대로 내보낸다.
+        while next_begin + size_ms <= ts:
+            while buffer and buffer[0][0] < next_begin:
+                buffer.popleft()
+            if not buffer:
+                # 값이 없는 구간의 window들은 건너뛴다.
+                next_begin = builtins.max(next_begin, first_start(ts))
+                break
+            end = next_begin + size_ms
+            yield Window(next_begin, end, [bv for bts, bv in buffer if bts < end])
+            next_begin += slide_ms
+        buffer.append((ts, v))
+    
+    while buffer:
+        while buffer and buffer[0][0] < next_begin:     # type: ignore
+            buffer.popleft()
+        if not buffer:
+            break
+        end = next_begin + size_ms     # type: ignore
+        yield Window(next_begin, end, [bv for bts, bv in buffer if bts < end])    # type: ignore
+        next_begin += slide_ms     # type: ignore
+
+def _get_ts(v:Timestamped) -> int:
+    return v.ts
+
+def _identity(v:Any) -> Any:
+    return v
+
+
+class _ReversedKey:
+    """Key wrapper inverting the order of the wrapped keys, which need not be numeric."""
+    __slots__ = ( 'key', )
+    
+    def __init__(self, key:Any) -> None:
+        self.key = key
+        
+    def __lt__(self, other:_ReversedKey) -> bool:
+        return other.key < self.key
+        
+    def __eq__(self, other:object) -> bool:
+        return isinstance(other, _ReversedKey) and self.key == other.key
+
+def _reorder(src:Iterator[S], key:Optional[Callable[[S],Any]], reversed:bool,
+             *,
+             qlen:Optional[int]=None,
+             max_delay:Optional[Any]=None) -> Iterator[S]:
+    from heapq import heappush, heappop, heappushpop
+    
+    # heap에는 (key, 순번, 값)을 저장한다. 순번으로 동일한 key의 값들 간의 입력 순서를 유지하고,
+    # 값 자체는 비교되지 않도록 한다.
+    heap:list[tuple[Any,int,S]] = []
+    seq = 0
+    max_key:Any = None
+    for v in src:
+        k = key(v) if key else v
+        entry = (_ReversedKey(k) if reversed else k, seq, v)
+        seq += 1
+        if qlen is not None:
+            if len(heap) < qlen:
+                heappush(heap, entry)
+            else:
+                # push 후 pop하는 것보다 빠르고, 새 값이 가장 작은 경우에는 heap을 변경하지 않는다.
+                yield heappushpop(heap, entry)[2]
+        else:
+            if max_key is None or k > max_key:
+                max_key = k
+            heappush(heap, entry)
+            watermark = max_key - max_delay
+            while heap[0][0] <= watermark:
+                yield heappop(heap)[2]
+    while heap:
+        yield heappop(heap)[2]
+
 
 class Stream(Generic[S]):
     __slots__ = ( '__src', )
@@ -101,6 +350,129 @@ class Stream(Generic[S]):
         mapped_values = (mapper(iv) for iv in self.__src)
         strm_iter = (strm for strm in mapped_values if strm is not None)
         return Stream(itertools.chain.from_iterable(strm_iter))
+        
+    def par_map(self, mapper:Callable[[S],T],
+                *,
+                workers:Optional[int]=None,
+                executor:str|Executor='thread',
+                ordered:bool=True,
+                chunksize:int=1,
+                max_in_flight:Optional[int]=None) -> Stream[T]:
+        """Applies ``mapper`` to the values of this stream in parallel.
+        The values are submitted in chunks of ``chunksize`` values, and at most ``max_in_flight`` chunks
+        are submitted but not consumed at a time, so infinite streams are processed lazily.
+        With the 'process' executor, ``mapper`` and the values should be picklable.
+
+        Args:
+            mapper (Callable[[S],T]): mapping function.
+            workers (Optional[int], optional): number of workers. Defaults to the executor's default.
+            executor (str|Executor, optional): 'thread', 'process', or an executor to use.
+                    An executor given by the caller is not shut down. Defaults to 'thread'.
+            ordered (bool, optional): keep the order of the values. If False, the mapped values are
+                    returned in the order of completion. Defaults to True.
+            chunksize (int, optional): number of values submitted to a worker at once. Defaults to 1.
+            max_in_flight (Optional[int], optional): maximum number of chunks being processed.
+                    Defaults to twice the number of workers.
+
+        Returns:
+            Stream[T]: stream of the mapped values.
+        """
+        return Stream(_parallel(self.__src, _map_chunk, mapper, workers=workers, executor=executor,
+                                ordered=ordered, chunksize=chunksize, max_in_flight=max_in_flight))
+        
+    def par_filter(self, pred:Callable[[S], bool],
+                   *,
+                   workers:Optional[int]=None,
+                   executor:str|Executor='thread',
+                   ordered:bool=True,
+                   chunksize:int=1,
+                   max_in_flight:Optional[int]=None) -> Stream[S]:
+        """Filters the values of this stream by evaluating ``pred`` in parallel.
+        The arguments other than ``pred`` are the same as those of ``par_map()``.
+        """
+        return Stream(_parallel(self.__src, _filter_chunk, pred, workers=workers, executor=executor,
+                                ordered=ordered, chunksize=chunksize, max_in_flight=max_in_flight))
+        
+    def par_flatmap(self, mapper:Callable[[S],Optional[Iterable[T]]],
+                    *,
+                    workers:Optional[int]=None,
+                    executor:str|Executor='thread',
+                    ordered:bool=True,
+                    chunksize:int=1,
+                    max_in_flight:Optional[int]=None) -> Stream[T]:
+        """Applies ``mapper`` to the values of this stream in parallel and flattens the results.
+        As in ``flatmap()``, None returned by ``mapper`` is ignored.
+        The arguments other than ``mapper`` are the same as those of ``par_map()``.
+        """
+        return Stream(_parallel(self.__src, _flatmap_chunk, mapper, workers=workers, executor=executor,
+                                ordered=ordered, chunksize=chunksize, max_in_flight=max_in_flight))
+       
+    def chunk(self, size:int) -> Stream[list[S]]:
+        """Groups the values of this stream into lists of ``size`` values.
+        The last list may have fewer values.
+        """
+        if size <= 0:
+            raise ValueError(f'invalid chunk size: {size}')
+        return Stream(_chunks(self.__src, size))
+        
+    def batch(self, max_size:int, max_wait_ms:float) -> Stream[list[S]]:
+        """Groups the values of this stream into micro-batches bounded by size and time.
+        A batch is emitted when it has ``max_size`` values, or when ``max_wait_ms`` milliseconds
+        have passed since its first value arrived, whichever comes first.
+        The source is read on a background (daemon) thread, which reads up to ``max_size + 1`` values
+        ahead of the consumer: ``max_size`` queued values and one more waiting to be queued.
+        If the consumer closes the returned stream early, the reader thread exits only after its
+        pending read from the source returns, so a blocking source keeps the thread alive while it
+        blocks, and one more value is taken from the source and discarded.
+
+        Args:
+            max_size (int): maximum number of values in a batch.
+            max_wait_ms (float): maximum time to wait for a batch to fill up.
+
+        Returns:
+            Stream[list[S]]: stream of the batches.
+        """
+        if max_size <= 0:
+            raise ValueError(f'invalid max_size: {max_size}')
+        if max_wait_ms < 0:
+            raise ValueError(f'invalid max_wait_ms: {max_wait_ms}')
+        return Stream(_batches(self.__src, max_size, max_wait_ms))
+        
+    def tumbling_window(self, size_ms:int, *,
+                        ts_getter:Optional[Callable[[S],int]]=None) -> Stream[Window[S]]:
+        """Groups the values of this stream into consecutive non-overlapping windows of ``size_ms``.
+        The values are expected in the order of their timestamps. A window is emitted when a value
+        beyond its end arrives or the stream ends, and windows without values are not emitted.
+
+        Args:
+            size_ms (int): length of a window.
+            ts_getter (Optional[Callable[[S],int]], optional): function returning the timestamp of a value.
+                    Defaults to the ``ts`` property of ``Timestamped`` values.
+
+        Returns:
+            Stream[Window[S]]: stream of the windows.
+        """
+        return self.sliding_window(size_ms, size_ms, ts_getter=ts_getter)
+        
+    def sliding_window(self, size_ms:int, slide_ms:int, *,
+                       ts_getter:Optional[Callable[[S],int]]=None) -> Stream[Window[S]]:
+        """Groups the values of this stream into windows of ``size_ms`` starting every ``slide_ms``.
+        Windows start at multiples of ``slide_ms``, and a value belongs to every window containing its
+        timestamp. Other behaviors are the same as those of ``tumbling_window()``.
+
+        Args:
+            size_ms (int): length of a window.
+            slide_ms (int): interval between the starts of consecutive windows.
+            ts_getter (Optional[Callable[[S],int]], optional): function returning the timestamp of a value.
+                    Defaults to the ``ts`` property of ``Timestamped`` values.
+
+        Returns:
+            Stream[Window[S]]: stream of the windows.
+        """
+        if size_ms <= 0 or slide_ms <= 0:
+            raise ValueError(f'invalid window: size={size_ms}, slide={slide_ms}')
+        ts_getter = ts_getter if ts_getter else _get_ts     # type: ignore
+        return Stream(_windows(self.__src, size_ms, slide_ms, ts_getter))     # type: ignore
        
     def take(self, count:int) -> Stream[S]:
         return Stream(itertools.islice(self.__src, 0, count))
@@ -109,12 +481,10 @@ class Stream(Generic[S]):
         return Stream(itertools.islice(self.__src, count, None))
          
     def take_last(self, count:int) -> Stream[S]:
-        dequeue = deque([])
-        for v in self.__src:
-            if len(dequeue) >= count:
-                dequeue.popleft()
-            dequeue.append(v)
-        return Stream(dequeue)
+        if count < 0:
+            raise ValueError(f'invalid count: {count}')
+        # 'maxlen'이 지정된 deque는 가득 찬 경우 오래된 값을 자동으로 버린다.
+        return Stream(deque(self.__src, maxlen=count))
          
     def drop_last(self, count:int) -> Stream[S]:
         def generate() -> Iterator[S]:
@@ -175,6 +545,100 @@ class Stream(Generic[S]):
                 groups[key] = []
             groups[key].append(v)
         return groups
+    
+    def groupby_consecutive(self, keyer:Callable[[S],K]) -> Stream[KeyValue[K,list[S]]]:
+        """Groups consecutive values of the same key lazily.
+        Only the values of the current group are kept in memory, so all the values of a key are
+        in one group only if the stream is sorted (or clustered) by the key.
+
+        Args:
+            keyer (Callable[[S],K]): function returning the key of a value.
+
+        Returns:
+            Stream[KeyValue[K,list[S]]]: stream of the groups.
+        """
+        return Stream(KeyValue(key, list(group)) for key, group in itertools.groupby(self.__src, keyer))
+    
+    def aggregate_by(self, keyer:Callable[[S],K], init:Callable[[],T], combine:Callable[[T,S],T]) -> dict[K,T]:
+        """Aggregates the values of each key incrementally.
+        Unlike ``groupby()``, only an accumulator per key is kept in memory.
+
+        Args:
+            keyer (Callable[[S],K]): function returning the key of a value.
+            init (Callable[[],T]): function creating the initial accumulator of a key.
+            combine (Callable[[T,S],T]): function returning the accumulator updated with a value.
+
+        Returns:
+            dict[K,T]: the final accumulators keyed by the keys.
+        """
+        accums:dict[K,T] = dict()
+        for v in self.__src:
+            key = keyer(v)
+            accum = accums[key] if key in accums else init()
+            accums[key] = combine(accum, v)
+        return accums
+    
+    def count_by(self, keyer:Callable[[S],K]) -> dict[K,int]:
+        counts:dict[K,int] = dict()
+        for v in self.__src:
+            key = keyer(v)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+    
+    def sum_by(self, keyer:Callable[[S],K], value:Optional[Callable[[S],Any]]=None) -> dict[K,Any]:
+        """Returns the sum of the values (or of ``value(v)``) of each key."""
+        getter = value if value else _identity
+        return self.aggregate_by(keyer, int, lambda total, v: total + getter(v))
+    
+    def min_by(self, keyer:Callable[[S],K], value:Optional[Callable[[S],Any]]=None) -> dict[K,Any]:
+        """Returns the minimum of the values (or of ``value(v)``) of each key."""
+        return self.__extreme_by(keyer, value, operator.lt)
+    
+    def max_by(self, keyer:Callable[[S],K], value:Optional[Callable[[S],Any]]=None) -> dict[K,Any]:
+        """Returns the maximum of the values (or of ``value(v)``) of each key."""
+        return self.__extreme_by(keyer, value, operator.gt)
+    
+    def mean_by(self, keyer:Callable[[S],K], value:Optional[Callable[[S],Any]]=None) -> dict[K,float]:
+        """Returns the mean of the values (or of ``value(v)``) of each key."""
+        getter = value if value else _identity
+        # key별로 [개수, 합계]만 유지한다.
+        sums:dict[K,list[Any]] = dict()
+        for v in self.__src:
+            key = keyer(v)
+            acc = sums.get(key)
+            if acc is None:
+                sums[key] = [1, getter(v)]
+            else:
+                acc[0] += 1
+                acc[1] += getter(v)
+        return {key: total / count for key, (count, total) in sums.items()}
+    
+    def __extreme_by(self, keyer:Callable[[S],K], value:Optional[Callable[[S],Any]],
+                     better:Callable[[Any,Any],bool]) -> dict[K,Any]:
+        getter = value if value else _identity
+        extremes:dict[K,Any] = dict()
+        for v in self.__src:
+            key = keyer(v)
+            x = getter(v)
+            if key not in extremes or better(x, extremes[key]):
+                extremes[key] = x
+        return extremes
+    
+    def count_distinct(self, *, key:Optional[Callable[[S],Any]]=None, precision:int=14) -> int:
+        """Returns the approximate number of distinct values (or keys) using HyperLogLog.
+        The memory used is ``2**precision`` bytes regardless of the number of values,
+        and the relative standard error is about ``1.04 / sqrt(2**precision)``.
+        """
+        from .hyperloglog import HyperLogLog
+        hll = HyperLogLog(precision)
+        add = hll.add
+        if key is None:
+            for v in self.__src:
+                add(v)
+        else:
+            for v in self.__src:
+                add(key(v))
+        return hll.count()
         
     def count(self) -> int:
         count = 0
@@ -246,15 +710,29 @@ class Stream(Generic[S]):
     def top_k(self, k:int, *, reversed:bool=False) -> Stream[SupportsRichComparison]: ...
     @overload
     def top_k(self, k:int, *,
-            key:Callable[[S],SupportsRichComparisonNeg],
+            key:Callable[[S],SupportsRichComparison],
             reversed:bool=False) -> Stream[S]: ...
     def top_k(self, k:int, *, key=None, reversed=False) -> Stream[S]|Stream[SupportsRichComparison]:
-        from heapq import nlargest
+        """Returns the ``k`` largest values in descending order, or the ``k`` smallest ones in ascending
+        order if ``reversed`` is set. Only ``k`` values are kept in a heap while scanning this stream,
+        and values of equal keys keep their order in this stream.
+        """
         if reversed:
-            key_ext = lambda v: -key(v)     # type: ignore
-            return Stream(nlargest(k, self.__src, key=key_ext))
-        else:
-            return Stream(nlargest(k, self.__src, key=key))
+            return self.bottom_k(k, key=key)
+        from heapq import nlargest
+        return Stream(nlargest(k, self.__src, key=key))
+    
+    @overload
+    def bottom_k(self, k:int) -> Stream[SupportsRichComparison]: ...
+    @overload
+    def bottom_k(self, k:int, *, key:Callable[[S],SupportsRichComparison]) -> Stream[S]: ...
+    def bottom_k(self, k:int, *, key=None) -> Stream[S]|Stream[SupportsRichComparison]:
+        """Returns the ``k`` smallest values in ascending order.
+        Only ``k`` values are kept in a heap while scanning this stream,
+        and values of equal keys keep their order in this stream.
+        """
+        from heapq import nsmallest
+        return Stream(nsmallest(k, self.__src, key=key))
     
     @overload
     def sorted(self, *, reversed:bool=False) -> Stream[SupportsRichComparison]: ...
@@ -274,44 +752,53 @@ class Stream(Generic[S]):
     @overload
     def distinct(self, *, key:Callable[[S],SupportsDunderEQ]) -> set[S]: ...
     def distinct(self, *, key=None) -> set[S]:
-        @dataclass(frozen=True, slots=True)
-        class Item(Generic[K,S]):
-            key: K
-            value: S
-            
-            def __eq__(self, other: Item[K,S]) -> bool:
-                if isinstance(other, Item):
-                    return self.key == other.key
-                else:
-                    return False
-        
         if key is None:
             return set(self.__src)
         else:
-            ditincts = set(map(lambda v: Item(key=key(v), value=v), self.__src))
-            return {item.value for item in ditincts}
+            # key별로 처음 나타난 값만 유지한다.
+            firsts:dict[Any,S] = dict()
+            for v in self.__src:
+                firsts.setdefault(key(v), v)
+            return set(firsts.values())
 
     def quasi_sort(self, qlen:int, *,
-                   key:Optional[Callable[[S],SupportsRichComparisonNeg]]=None,
+                   key:Optional[Callable[[S],SupportsRichComparison]]=None,
                    reversed:bool=False) -> Stream[S]:
-        def generate() -> Iterator[S]:
-            from heapq import heappush, heappop
-            heap = []
-            if key is None:
-                for v in self.__src:
-                    if len(heap) >= qlen:
-                        yield heappop(heap)
-                    heappush(heap, (-v,v) if reversed else v)
-                for v in heap:
-                    yield v[1] if reversed else v
-            else:
-                for v in self.__src:
-                    if len(heap) >= qlen:
-                        yield heappop(heap)[1]
-                    heappush(heap, (-key(v), v) if reversed else (key(v), v))
-                for k, v in heap:
-                    yield v[1]
-        return Stream(generate())
+        """Sorts nearly-sorted values with a reorder buffer of ``qlen`` values.
+        Each value is emitted once ``qlen`` values arrived after it, in the order of the keys
+        among the buffered ones. Values of equal keys keep their order in this stream.
+
+        Args:
+            qlen (int): size of the reorder buffer.
+            key (Optional[Callable[[S],SupportsRichComparison]], optional): function returning the sort key.
+                    Defaults to the value itself.
+            reversed (bool, optional): sort in descending order. Defaults to False.
+
+        Returns:
+            Stream[S]: stream of the reordered values.
+        """
+        if qlen <= 0:
+            raise ValueError(f'invalid qlen: {qlen}')
+        return Stream(_reorder(self.__src, key, reversed, qlen=qlen))
+    
+    def reorder_by_ts(self, max_delay_ms:int, *,
+                      ts_getter:Optional[Callable[[S],int]]=None) -> Stream[S]:
+        """Reorders out-of-order timestamped values that are at most ``max_delay_ms`` late.
+        A value is emitted once a value whose timestamp is ``max_delay_ms`` later than it arrives.
+        Values arriving later than that are emitted as soon as possible, out of order.
+
+        Args:
+            max_delay_ms (int): maximum lateness to reorder.
+            ts_getter (Optional[Callable[[S],int]], optional): function returning the timestamp of a value.
+                    Defaults to the ``ts`` property of ``Timestamped`` values.
+
+        Returns:
+            Stream[S]: stream of the reordered values.
+        """
+        if max_delay_ms < 0:
+            raise ValueError(f'invalid max_delay_ms: {max_delay_ms}')
+        ts_getter = ts_getter if ts_getter else _get_ts     # type: ignore
+        return Stream(_reorder(self.__src, ts_getter, False, max_delay=max_delay_ms))
     
     def find_first(self, pred:Optional[Callable[[S], bool]]=None,
                    *,
@@ -331,4 +818,17 @@ class Stream(Generic[S]):
  
     def foreach(self, action:Callable[[S],None]) -> None:
         for v in self.__src:
-            action(v)
\ No newline at end of file
+            action(v)
+            
+    def to_async(self, *, in_thread:bool=False) -> AsyncStream[S]:
+        """Converts this stream into an ``AsyncStream``.
+
+        Args:
+            in_thread (bool, optional): read the values on a worker thread so that a blocking source
+                                        does not block the event loop. Defaults to False.
+
+        Returns:
+            AsyncStream[S]: asynchronous stream of the values.
+        """
+        from .async_streams import AsyncStream
+        return AsyncStream.from_iterable(self.__src, in_thread=in_thread)
\ No newline at end of file
@@ -4,12 +4,13 @@ from typing import Optional, Iterable, Iterator, Generator, Callable, TypeVar, U
 from collections.abc import Sequence
 import logging
 
-# import time
+import time
 from datetime import datetime, timezone
 # from pathlib import Path
 
 # from .color import BGR
 from .types import Timestamped, TimestampedT
+from . import clock
 
 T = TypeVar("T")
 
@@ -32,10 +33,10 @@ def utc_now_datetime() -> datetime:
     return datetime.now(timezone.utc)
 
 def utc_now_seconds() -> float:
-    return utc_now_datetime().timestamp()
+    return time.time()
 
-def utc_now_millis() -> int:
-    return round(utc_now_seconds() * 1000)
+# 매 frame마다 호출되므로 datetime 객체를 생성하지 않는 'clock' 모듈의 구현을 사용한다.
+utc_now_millis = clock.utc_now_millis
 
 
 # def _parse_keyvalue(kv:str) -> tuple[str,str]:
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+from pyutils.camera.types import DropPolicy, QueueOverflowError
+from pyutils.camera.async_writer import AsyncImageWriter
+
+
+class _GatedSink:
+    """Write function blocking until the gate is opened, so that the queue can be filled up."""
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.written:list[int] = []
+
+    def __call__(self, image:int) -> None:
+        self.started.set()
+        self.gate.wait()
+        self.written.append(image)
+
+
+def _fill(writer:AsyncImageWriter, sink:_GatedSink, count:int) -> list[bool]:
+    # 첫 image가 write 함수에 전달되어 queue가 빈 것을 확인한 후에 나머지를 넣는다.
+    results = [writer.submit(0)]
+    sink.started.wait()
+    results.extend(writer.submit(v) for v in range(1, count))
+    return results
+
+
+class AsyncImageWriterTest(unittest.TestCase):
+    def test_flush_on_close(self):
+        written:list[int] = []
+        def slow_write(image:int) -> None:
+            time.sleep(0.001)
+            written.append(image)
+
+        writer = AsyncImageWriter(slow_write, 4)
+        for v in range(20):
+            writer.submit(v)     # type: ignore
+        writer.close()
+        self.assertEqual(written, list(range(20)))
+        self.assertEqual((writer.queued_count, writer.dropped_count, writer.written_count), (20, 0, 20))
+        self.assertRaises(ValueError, writer.submit, 0)
+
+    def test_block(self):
+        sink = _GatedSink()
+        writer = AsyncImageWriter(sink, 2, drop_policy=DropPolicy.BLOCK)     # type: ignore
+        _fill(writer, sink, 3)
+
+        submitted = threading.Event()
+        def submit() -> None:
+            writer.submit(3)     # type: ignore
+            submitted.set()
+        thread = threading.Thread(target=submit)
+        thread.start()
+        self.assertFalse(submitted.wait(0.05))
+        self.assertEqual(writer.pending_count, 2)
+
+        sink.gate.set()
+        thread.join()
+        writer.close()
+        self.assertEqual(sink.written, [0, 1, 2, 3])
+
+    def test_drop_newest(self):
+        sink = _GatedSink()
+        writer = AsyncImageWriter(sink, 2, drop_policy=DropPolicy.DROP_NEWEST)     # type: ignore
+        self.assertEqual(_fill(writer, sink, 5), [True, True, True, False, False])
+        sink.gate.set()
+        writer.close()
+        self.assertEqual(sink.written, [0, 1, 2])
+        self.assertEqual((writer.queued_count, writer.dropped_count, writer.written_count), (3, 2, 3))
+
+    def test_drop_oldest(self):
+        sink = _GatedSink()
+        writer = AsyncImageWriter(sink, 2, drop_policy=DropPolicy.DROP_OLDEST)     # type: ignore
+        self.assertTrue(all(_fill(writer, sink, 5)))
+        sink.gate.set()
+        writer.close()
+        self.assertEqual(sink.written, [0, 3, 4])
+        self.assertEqual((writer.queued_count, writer.dropped_count, writer.written_count), (5, 2, 3))
+
+    def test_raise(self):
+        sink = _GatedSink()
+        writer = AsyncImageWriter(sink, 2, drop_policy=DropPolicy.RAISE)     # type: ignore
+        _fill(writer, sink, 3)
+        self.assertRaises(QueueOverflowError, writer.submit, 3)
+        sink.gate.set()
+        writer.close()
+        self.assertEqual(sink.written, [0, 1, 2])
+
+    def test_write_failure(self):
+        def fail(image:int) -> None:
+            raise IOError('disk full')
+
+        writer = AsyncImageWriter(fail, 2)     # type: ignore
+        writer.submit(0)     # type: ignore
+        with self.assertRaises(IOError):
+            writer.close()
+        self.assertIsInstance(writer.failure, IOError)
+
+    def test_invalid_queue_size(self):
+        self.assertRaises(ValueError, AsyncImageWriter, lambda image: None, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
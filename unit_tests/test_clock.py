@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import time
+import unittest
+
+from pyutils.clock import utc_now_millis, AnchoredClock, Pacer, sleep_until
+
+
+class ClockTest(unittest.TestCase):
+    def test_utc_now_millis(self):
+        before = round(time.time() * 1000)
+        now = utc_now_millis()
+        after = round(time.time() * 1000)
+        self.assertTrue(before <= now <= after)
+
+    def test_anchored_clock(self):
+        clock = AnchoredClock()
+        self.assertLess(abs(clock.now_millis() - utc_now_millis()), 5)
+
+        mono = time.monotonic_ns()
+        self.assertEqual(clock.to_utc_nanos(mono + 1_000_000) - clock.to_utc_nanos(mono), 1_000_000)
+
+    def test_sleep_until(self):
+        deadline = time.monotonic_ns() + 5_000_000
+        lateness = sleep_until(deadline)
+        self.assertGreaterEqual(time.monotonic_ns(), deadline)
+        self.assertGreaterEqual(lateness, 0)
+
+    def test_pacer(self):
+        pacer = Pacer(30)
+        pacer.reset(now_ns=1_000)
+        self.assertEqual(pacer.deadline_ns(0), 1_000)
+        # 정수 ms로 자른 간격(33ms)과 달리 오차가 누적되지 않아야 한다.
+        self.assertEqual(pacer.deadline_ns(30), 1_000 + 1_000_000_000)
+
+        pacer.reset(10, now_ns=0)
+        self.assertEqual(pacer.deadline_ns(10), 0)
+
+    def test_pacer_wait(self):
+        pacer = Pacer(100)
+        started = time.monotonic_ns()
+        pacer.reset(now_ns=started)
+        for idx in range(5):
+            pacer.wait(idx)
+        self.assertGreaterEqual(time.monotonic_ns() - started, 40_000_000)
+
+    def test_invalid_fps(self):
+        self.assertRaises(ValueError, Pacer, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
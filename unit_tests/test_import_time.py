@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import unittest
+
+
+# 새 interpreter에서 주어진 모듈을 import하고, 소요 시간(ms)과 load된 heavy 모듈 목록을 출력한다.
+_SCRIPT = '''
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+print(elapsed, *[name for name in {heavy!r} if name in sys.modules])
+'''
+_HEAVY_MODULES = ('numpy', 'cv2', 'ffmpeg', 'kafka')
+# heavy 모듈의 load 여부가 주된 검사 대상이며, 시간 제한은 부하가 큰 CI 환경에서도 실패하지 않도록
+# 크게 잡아 명백한 회귀만 검출한다.
+_MAX_IMPORT_MS = 1000
+
+
+def _measure_import(module:str) -> tuple[float,set[str]]:
+    output = subprocess.run([sys.executable, '-c', _SCRIPT.format(module=module, heavy=_HEAVY_MODULES)],
+                            capture_output=True, text=True, check=True).stdout.split()
+    return float(output[0]), set(output[1:])
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_import_pyutils(self):
+        elapsed, heavy = _measure_import('pyutils')
+        self.assertFalse(heavy, f'heavy modules are imported: {heavy}')
+        self.assertLess(elapsed, _MAX_IMPORT_MS)
+
+    def test_import_camera_package(self):
+        elapsed, heavy = _measure_import('pyutils.camera')
+        self.assertFalse(heavy, f'heavy modules are imported: {heavy}')
+        self.assertLess(elapsed, _MAX_IMPORT_MS)
+
+    def test_lazy_attributes(self):
+        import pyutils
+        import pyutils.camera
+
+        self.assertEqual(pyutils.Point(1, 2).x, 1)
+        self.assertTrue(hasattr(pyutils.camera, 'Frame'))
+        self.assertIn('Box', dir(pyutils))
+        with self.assertRaises(AttributeError):
+            pyutils.no_such_attribute     # type: ignore
+
+
+if __name__ == '__main__':
+    unittest.main()
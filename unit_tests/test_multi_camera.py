@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from pyutils.size2di import Size2di
+from pyutils.camera.types import Camera, ImageCapture, Frame
+from pyutils.camera.multi_camera import MultiCameraCapture
+
+
+class _StalledCapture(ImageCapture):
+    """ImageCapture delivering ``count`` frames and then blocking in the grab until it is closed."""
+    def __init__(self, camera:_StalledCamera, count:int) -> None:
+        self.__camera = camera
+        self.__count = count
+        self.__index = 0
+        self.__closed = threading.Event()
+
+    def close(self) -> None:
+        self.__closed.set()
+
+    def camera(self) -> Camera:
+        return self.__camera
+
+    def __next__(self) -> Frame:
+        if self.__index >= self.__count:
+            self.__closed.wait()
+            raise StopIteration()
+        self.__index += 1
+        return Frame(image=np.zeros((2, 2, 3), dtype=np.uint8), index=self.__index, ts=self.__index * 100)
+
+    @property
+    def image_size(self) -> Size2di:
+        return Size2di(2, 2)
+
+    @property
+    def fps(self) -> int:
+        return 10
+
+    @property
+    def initial_ts(self) -> int:
+        return 0
+
+
+class _StalledCamera(Camera):
+    def __init__(self, uri:str, count:int) -> None:
+        self.__uri = uri
+        self.count = count
+
+    def open(self) -> ImageCapture:
+        return _StalledCapture(self, self.count)
+
+    @property
+    def uri(self) -> str:
+        return self.__uri
+
+    @property
+    def image_size(self) -> Size2di:
+        return Size2di(2, 2)
+
+    @property
+    def fps(self) -> int:
+        return 10
+
+
+class MultiCameraCaptureTest(unittest.TestCase):
+    def test_bundles(self):
+        with MultiCameraCapture([_StalledCamera('a', 3), _StalledCamera('b', 3)]) as capture:
+            bundles = [next(capture) for _ in range(3)]
+        self.assertEqual([bundle.ts for bundle in bundles], [100, 200, 300])
+        self.assertEqual([sorted(bundle.frames) for bundle in bundles], [['a', 'b']] * 3)
+
+    def test_close_stalled_source(self):
+        capture = MultiCameraCapture([_StalledCamera('a', 1), _StalledCamera('b', 0)])
+        time.sleep(0.05)
+        started = time.monotonic()
+        capture.close()
+        # grab에서 멈춘 thread도 capture가 닫히면 종료되어야 한다.
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertFalse([t for t in threading.enumerate() if t.name.startswith('capture-')])
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, MultiCameraCapture, [_StalledCamera('a', 0), _StalledCamera('a', 0)])
+        self.assertRaises(ValueError, MultiCameraCapture, [_StalledCamera('a', 0)], queue_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+import numpy as np
+
+from pyutils.camera.types import Frame, DropPolicy
+from pyutils.camera.pipeline import FrameStage, FramePipeline
+
+
+def _frame(index:int) -> Frame:
+    return Frame(image=np.full((2, 2, 3), index % 256, dtype=np.uint8), index=index, ts=index * 100)
+
+
+class FramePipelineTest(unittest.TestCase):
+    def test_pass_through(self):
+        outputs:list[int] = []
+        pipeline = FramePipeline([FrameStage('double', lambda f: [f, f]),
+                                  FrameStage('collect', lambda f: outputs.append(f.index) or [])])
+        pipeline.start()
+        for idx in range(5):
+            pipeline.put(_frame(idx))
+        pipeline.finish()
+        self.assertEqual(outputs, [0, 0, 1, 1, 2, 2, 3, 3, 4, 4])
+        self.assertEqual(pipeline.capacity, 2 * (8 + 1) + 1)
+
+    def test_flusher(self):
+        outputs:list[int] = []
+        held:list[Frame] = []
+        pipeline = FramePipeline([FrameStage('hold', lambda f: held.append(f) or [], flusher=lambda: held),
+                                  FrameStage('collect', lambda f: outputs.append(f.index) or [])])
+        pipeline.start()
+        for idx in range(3):
+            pipeline.put(_frame(idx))
+        pipeline.finish()
+        self.assertEqual(outputs, [0, 1, 2])
+
+    def test_failure_propagation(self):
+        def fail(frame:Frame) -> list[Frame]:
+            if frame.index == 2:
+                raise KeyError('boom')
+            return [frame]
+
+        pipeline = FramePipeline([FrameStage('fail', fail, queue_size=1), FrameStage('sink', lambda f: [])])
+        pipeline.start()
+        with self.assertRaises(KeyError):
+            for idx in range(100):
+                pipeline.put(_frame(idx))
+            pipeline.finish()
+        pipeline.abort()
+
+    def test_stop_propagation(self):
+        def stop(frame:Frame) -> list[Frame]:
+            if frame.index == 3:
+                raise StopIteration()
+            return [frame]
+
+        pipeline = FramePipeline([FrameStage('stop', stop, queue_size=1)])
+        pipeline.start()
+        with self.assertRaises(StopIteration):
+            for idx in range(100):
+                pipeline.put(_frame(idx))
+        pipeline.abort()
+
+    def test_drop_oldest(self):
+        started = threading.Event()
+        gate = threading.Event()
+        outputs:list[int] = []
+        def wait(frame:Frame) -> list[Frame]:
+            started.set()
+            gate.wait()
+            outputs.append(frame.index)
+            return []
+
+        pipeline = FramePipeline([FrameStage('slow', wait, queue_size=2, drop_policy=DropPolicy.DROP_OLDEST)])
+        pipeline.start()
+        pipeline.put(_frame(0))
+        # 첫 frame이 처리되는 동안 queue에 5개의 frame을 넣으면 오래된 3개가 버려진다.
+        started.wait()
+        for idx in range(1, 6):
+            pipeline.put(_frame(idx))
+        gate.set()
+        pipeline.finish()
+
+        self.assertEqual(pipeline.dropped_counts, {'slow': 3})
+        self.assertEqual(outputs, [0, 4, 5])
+
+    def test_copy_images(self):
+        image = np.zeros((2, 2, 3), dtype=np.uint8)
+        images:list[np.ndarray] = []
+        pipeline = FramePipeline([FrameStage('collect', lambda f: images.append(f.image) or [])],
+                                 copy_images=True)
+        pipeline.start()
+        pipeline.put(Frame(image=image, index=0, ts=0))
+        pipeline.finish()
+        self.assertIsNot(images[0], image)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, FramePipeline, [])
+        self.assertRaises(ValueError, FrameStage, 'x', lambda f: [f], queue_size=0)
+        self.assertRaises(ValueError, FrameStage, 'x', lambda f: [f], drop_policy=DropPolicy.RAISE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from typing import Optional
+from collections.abc import Iterator
+import unittest
+
+import numpy as np
+
+from pyutils.size2di import Size2di
+from pyutils.camera.types import Camera, ImageCapture, Frame
+from pyutils.camera.reconnecting_camera import ReconnectingCamera, CaptureGap
+
+
+class _ScriptedCapture(ImageCapture):
+    """ImageCapture delivering the given frames, and then raising the given failure (or StopIteration)."""
+    def __init__(self, camera:_ScriptedCamera, frames:list[tuple[int,float]],
+                 failure:Optional[Exception]) -> None:
+        self.__camera = camera
+        self.__frames:Iterator[tuple[int,float]] = iter(frames)
+        self.__failure = failure
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+    def camera(self) -> Camera:
+        return self.__camera
+
+    def __next__(self) -> Frame:
+        for index, ts in self.__frames:
+            return Frame(image=np.zeros((2, 2, 3), dtype=np.uint8), index=index, ts=ts)
+        if self.__failure is not None:
+            raise self.__failure
+        raise StopIteration()
+
+    @property
+    def image_size(self) -> Size2di:
+        return Size2di(2, 2)
+
+    @property
+    def fps(self) -> int:
+        return 10
+
+    @property
+    def initial_ts(self) -> int:
+        return 0
+
+
+class _ScriptedCamera(Camera):
+    """Camera whose successive ``open()`` calls return the scripted captures, or raise if None is scripted."""
+    def __init__(self, uri:str, scripts:list[Optional[tuple[list[tuple[int,float]],Optional[Exception]]]]) -> None:
+        self.__uri = uri
+        self.scripts = scripts
+        self.captures:list[_ScriptedCapture] = []
+
+    def open(self) -> ImageCapture:
+        script = self.scripts.pop(0) if self.scripts else None
+        if script is None:
+            raise IOError('connection refused')
+        capture = _ScriptedCapture(self, *script)
+        self.captures.append(capture)
+        return capture
+
+    @property
+    def uri(self) -> str:
+        return self.__uri
+
+    @property
+    def image_size(self) -> Size2di:
+        return Size2di(2, 2)
+
+    @property
+    def fps(self) -> int:
+        return 10
+
+
+class ReconnectingCameraTest(unittest.TestCase):
+    def test_backoff_delay(self):
+        camera = ReconnectingCamera(_ScriptedCamera('rtsp://cam', []), initial_backoff=0.5, max_backoff=3,
+                                    backoff_factor=2, jitter=0)
+        self.assertEqual([camera.backoff_delay(attempt) for attempt in range(6)], [0, 0.5, 1, 2, 3, 3])
+
+        camera = ReconnectingCamera(_ScriptedCamera('rtsp://cam', []), initial_backoff=1, jitter=0.5)
+        for _ in range(20):
+            self.assertTrue(0.5 <= camera.backoff_delay(1) <= 1)
+
+    def test_reconnect_offsets(self):
+        gaps:list[CaptureGap] = []
+        source = _ScriptedCamera('rtsp://cam', [([(1, 100), (2, 200), (3, 300)], IOError('lost')),
+                                                None,
+                                                ([(1, 9000), (2, 9100)], None)])
+        camera = ReconnectingCamera(source, max_retries=3, initial_backoff=0.001, jitter=0, on_gap=gaps.append)
+        with camera.open() as capture:
+            frames = list(capture)
+
+            # 재접속 이후의 frame 번호와 timestamp는 끊기기 전의 값들에 이어져야 한다.
+            self.assertEqual([f.index for f in frames[:5]], [1, 2, 3, 4, 5])
+            self.assertEqual([f.ts for f in frames[:5]], [100, 200, 300, 400, 500])
+            self.assertEqual(capture.reconnect_count, 1)
+
+        gap = gaps[0]
+        self.assertEqual((gap.last_index, gap.next_index, gap.missing_count), (3, 4, 0))
+        self.assertEqual((gap.last_ts, gap.next_ts, gap.attempts), (300, 400, 2))
+        self.assertIn('lost', gap.cause)
+        self.assertTrue(source.captures[0].closed)
+
+    def test_give_up(self):
+        source = _ScriptedCamera('rtsp://cam', [([(1, 100)], IOError('lost'))])
+        camera = ReconnectingCamera(source, max_retries=2, initial_backoff=0.001, jitter=0)
+        with camera.open() as capture:
+            self.assertEqual([f.index for f in capture], [1])
+
+    def test_non_live_source(self):
+        # video file은 frame이 끝나면 재접속하지 않고 종료한다.
+        source = _ScriptedCamera('video.mp4', [([(1, 100), (2, 200)], None), ([(1, 100)], None)])
+        camera = ReconnectingCamera(source)
+        with camera.open() as capture:
+            self.assertEqual([f.index for f in capture], [1, 2])
+        self.assertEqual(len(source.captures), 1)
+
+    def test_invalid_arguments(self):
+        source = _ScriptedCamera('rtsp://cam', [])
+        self.assertRaises(ValueError, ReconnectingCamera, source, max_retries=-1)
+        self.assertRaises(ValueError, ReconnectingCamera, source, initial_backoff=2, max_backoff=1)
+        self.assertRaises(ValueError, ReconnectingCamera, source, jitter=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import unittest
+
+from pyutils.camera.stats import LatencyRecorder, EwmaRate, ProcessingStats
+
+
+class LatencyRecorderTest(unittest.TestCase):
+    def test_percentiles(self):
+        recorder = LatencyRecorder('stage')
+        for ms in range(100, 0, -1):
+            recorder.record(ms * 1_000_000)
+
+        stats = recorder.snapshot()
+        self.assertEqual(stats.count, 100)
+        self.assertAlmostEqual(stats.mean_ms, 50.5)
+        self.assertEqual((stats.p50_ms, stats.p95_ms, stats.p99_ms, stats.max_ms), (50, 95, 99, 100))
+
+    def test_window(self):
+        # percentile은 최근 'window'개의 표본으로, 평균과 최대값은 전체 표본으로 계산된다.
+        recorder = LatencyRecorder('stage', window=10)
+        for ms in [1000, *[10]*10]:
+            recorder.record(ms * 1_000_000)
+
+        stats = recorder.snapshot()
+        self.assertEqual(stats.count, 11)
+        self.assertEqual((stats.p50_ms, stats.p99_ms, stats.max_ms), (10, 10, 1000))
+        self.assertAlmostEqual(stats.mean_ms, 1100 / 11)
+
+    def test_empty(self):
+        stats = LatencyRecorder('stage').snapshot()
+        self.assertEqual((stats.count, stats.mean_ms, stats.p50_ms), (0, 0.0, 0.0))
+        self.assertRaises(ValueError, LatencyRecorder, 'stage', 0)
+
+    def test_bottleneck(self):
+        capture, proc, reader = LatencyRecorder('capture'), LatencyRecorder('processor'), LatencyRecorder('reader')
+        capture.record(90_000_000)
+        proc.record(30_000_000)
+        reader.record(10_000_000)
+        stats = ProcessingStats(frame_count=1, elapsed_ms=130, fps=0,
+                                stages={rec.name:rec.snapshot() for rec in (capture, proc, reader)})
+        self.assertEqual(stats.bottleneck().name, 'processor')     # type: ignore
+
+
+class EwmaRateTest(unittest.TestCase):
+    def test_steady_rate(self):
+        meter = EwmaRate()
+        self.assertEqual(meter.update(0), 0.0)
+        for idx in range(1, 11):
+            meter.update(idx * 40_000_000)
+        self.assertAlmostEqual(meter.rate, 25.0)
+
+    def test_smoothing(self):
+        meter = EwmaRate(alpha=0.5)
+        meter.update(0)
+        meter.update(100_000_000)       # 100ms
+        meter.update(400_000_000)       # 300ms: (100 + 300) / 2 = 200ms
+        self.assertAlmostEqual(meter.rate, 5.0)
+
+    def test_invalid_alpha(self):
+        self.assertRaises(ValueError, EwmaRate, 0)
+        self.assertRaises(ValueError, EwmaRate, 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+import unittest
+
+from pyutils.streams import Stream, Window
+from pyutils.async_streams import AsyncStream
+
+
+def _square(v:int) -> int:
+    return v * v
+
+def _is_even(v:int) -> bool:
+    return v % 2 == 0
+
+
+class ParallelStreamTest(unittest.TestCase):
+    def test_par_map(self):
+        result = list(Stream(range(100)).par_map(_square, workers=4))
+        self.assertEqual(result, [v*v for v in range(100)])
+
+    def test_par_map_unordered(self):
+        def slow_square(v:int) -> int:
+            time.sleep(0.001 * (v % 3))
+            return v * v
+        result = list(Stream(range(50)).par_map(slow_square, workers=4, ordered=False))
+        self.assertEqual(sorted(result), [v*v for v in range(50)])
+
+    def test_par_map_process(self):
+        result = list(Stream(range(20)).par_map(math.sqrt, workers=2, executor='process', chunksize=4))
+        self.assertEqual(result, [math.sqrt(v) for v in range(20)])
+
+    def test_par_filter(self):
+        result = list(Stream(range(30)).par_filter(_is_even, workers=3, chunksize=4))
+        self.assertEqual(result, list(range(0, 30, 2)))
+
+    def test_par_flatmap(self):
+        result = list(Stream(range(5)).par_flatmap(lambda v: [v]*v if v != 3 else None, workers=2))
+        self.assertEqual(result, [1, 2, 2, 4, 4, 4, 4])
+
+    def test_par_map_bounded(self):
+        # 무한 stream에 대해서도 최대 'max_in_flight'개의 값만 미리 처리되어야 한다.
+        lock = threading.Lock()
+        calls = []
+        def record(v:int) -> int:
+            with lock:
+                calls.append(v)
+            return v
+
+        result = list(Stream.generate(0, lambda v: v+1).par_map(record, workers=2, max_in_flight=3).take(5))
+        self.assertEqual(result, [0, 1, 2, 3, 4])
+        self.assertLessEqual(len(calls), 5 + 3)
+
+    def test_par_map_error(self):
+        def fail(v:int) -> int:
+            if v == 5:
+                raise ValueError('boom')
+            return v
+        with self.assertRaises(ValueError):
+            list(Stream(range(10)).par_map(fail, workers=2))
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, Stream(range(3)).par_map, _square, workers=0)
+        self.assertRaises(ValueError, Stream(range(3)).par_map, _square, chunksize=0)
+        self.assertRaises(ValueError, Stream(range(3)).par_map, _square, executor='fiber')
+
+
+
+class _Event:
+    def __init__(self, ts:int) -> None:
+        self.ts = ts
+
+
+class BatchStreamTest(unittest.TestCase):
+    def test_chunk(self):
+        self.assertEqual(list(Stream(range(7)).chunk(3)), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertRaises(ValueError, Stream(range(3)).chunk, 0)
+
+    def test_batch_by_size(self):
+        self.assertEqual(list(Stream(range(7)).batch(3, 1000)), [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_batch_by_time(self):
+        def slow_source():
+            for v in range(4):
+                if v == 2:
+                    time.sleep(0.2)
+                yield v
+        self.assertEqual(list(Stream(slow_source()).batch(10, 50)), [[0, 1], [2, 3]])
+
+    def test_batch_error(self):
+        def failing_source():
+            yield 1
+            raise KeyError('boom')
+        batches = iter(Stream(failing_source()).batch(10, 50))
+        self.assertEqual(next(batches), [1])
+        self.assertRaises(KeyError, next, batches)
+
+    def test_batch_close(self):
+        pulled = 0
+        def endless_source():
+            nonlocal pulled
+            while True:
+                pulled += 1
+                yield pulled
+
+        batches = iter(Stream(endless_source()).batch(4, 1000))
+        self.assertEqual(next(batches), [1, 2, 3, 4])
+        batches.close()     # type: ignore
+
+        # stream을 닫으면 reader thread도 종료되어야 한다.
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline and any(t.name == 'stream-batch' for t in threading.enumerate()):
+            time.sleep(0.01)
+        self.assertFalse([t for t in threading.enumerate() if t.name == 'stream-batch'])
+        # 소비되지 않은 값들은 queue 크기와 대기 중인 하나를 넘지 않는다.
+        self.assertLessEqual(pulled, 4 + 4 + 1)
+
+    def test_tumbling_window(self):
+        events = [_Event(ts) for ts in [0, 3, 9, 10, 14, 31]]
+        windows = list(Stream(events).tumbling_window(10))
+        self.assertEqual([(w.begin_ts, w.end_ts) for w in windows], [(0, 10), (10, 20), (30, 40)])
+        self.assertEqual([[e.ts for e in w.values] for w in windows], [[0, 3, 9], [10, 14], [31]])
+
+    def test_sliding_window(self):
+        windows = list(Stream([0, 3, 9, 12]).sliding_window(10, 5, ts_getter=lambda v: v))
+        self.assertEqual(windows[0], Window(-5, 5, [0, 3]))
+        self.assertEqual([w.values for w in windows], [[0, 3], [0, 3, 9], [9, 12], [12]])
+
+
+class AggregationStreamTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.words = ['apple', 'avocado', 'banana', 'blueberry', 'cherry', 'apricot']
+
+    def test_aggregate_by(self):
+        result = Stream(self.words).aggregate_by(lambda w: w[0], list, lambda acc, w: acc + [len(w)])
+        self.assertEqual(result, {'a': [5, 7, 7], 'b': [6, 9], 'c': [6]})
+
+    def test_keyed_aggregations(self):
+        first = lambda w: w[0]
+        self.assertEqual(Stream(self.words).count_by(first), {'a': 3, 'b': 2, 'c': 1})
+        self.assertEqual(Stream(self.words).sum_by(first, len), {'a': 19, 'b': 15, 'c': 6})
+        self.assertEqual(Stream(self.words).min_by(first, len), {'a': 5, 'b': 6, 'c': 6})
+        self.assertEqual(Stream(self.words).max_by(first), {'a': 'avocado', 'b': 'blueberry', 'c': 'cherry'})
+        self.assertEqual(Stream(self.words).mean_by(first, len), {'a': 19/3, 'b': 7.5, 'c': 6.0})
+
+    def test_groupby_consecutive(self):
+        groups = Stream([1, 1, 2, 3, 3, 3, 1]).groupby_consecutive(lambda v: v)
+        self.assertEqual([(kv.key, kv.value) for kv in groups], [(1, [1, 1]), (2, [2]), (3, [3, 3, 3]), (1, [1])])
+
+    def test_distinct(self):
+        self.assertEqual(Stream([3, 1, 3, 2, 1]).distinct(), {1, 2, 3})
+        self.assertEqual(Stream(self.words).distinct(key=len), {'apple', 'avocado', 'banana', 'blueberry'})
+
+    def test_count_distinct(self):
+        self.assertAlmostEqual(Stream(range(100)).count_distinct(), 100, delta=2)
+        estimate = Stream(range(200_000)).map(lambda v: v % 50_000).count_distinct()
+        self.assertLess(abs(estimate - 50_000) / 50_000, 0.03)
+
+
+class BoundedStreamTest(unittest.TestCase):
+    def test_top_k(self):
+        words = ['kiwi', 'fig', 'plum', 'pear', 'apple', 'date']
+        self.assertEqual(list(Stream([5, 1, 4, 2, 3]).top_k(2)), [5, 4])
+        # 동일한 key의 값들은 입력 순서를 유지해야 한다.
+        self.assertEqual(list(Stream(words).top_k(3, key=len)), ['apple', 'kiwi', 'plum'])
+        # 숫자가 아닌 key도 역순으로 선택할 수 있어야 한다.
+        self.assertEqual(list(Stream(words).top_k(2, key=lambda w: w, reversed=True)), ['apple', 'date'])
+        self.assertEqual(list(Stream(words).bottom_k(2, key=len)), ['fig', 'kiwi'])
+
+    def test_take_last(self):
+        self.assertEqual(list(Stream(range(10)).take_last(3)), [7, 8, 9])
+        self.assertEqual(list(Stream(range(2)).take_last(3)), [0, 1])
+        self.assertEqual(list(Stream(range(2)).take_last(0)), [])
+
+    def test_quasi_sort(self):
+        self.assertEqual(list(Stream([2, 1, 4, 3, 6, 5]).quasi_sort(2)), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(list(Stream(['b', 'a', 'd', 'c']).quasi_sort(2, reversed=True)), ['d', 'c', 'b', 'a'])
+
+        events = [(2, 'a'), (1, 'b'), (2, 'c'), (1, 'd')]
+        result = list(Stream(events).quasi_sort(4, key=lambda e: e[0]))
+        self.assertEqual(result, [(1, 'b'), (1, 'd'), (2, 'a'), (2, 'c')])
+
+    def test_reorder_by_ts(self):
+        events = [_Event(ts) for ts in [10, 5, 20, 15, 40, 2, 35]]
+        result = [e.ts for e in Stream(events).reorder_by_ts(10)]
+        self.assertEqual(result, [5, 10, 15, 20, 2, 35, 40])
+
+
+class AsyncStreamTest(unittest.IsolatedAsyncioTestCase):
+    async def test_operators(self):
+        strm = AsyncStream.from_iterable(range(20)).filter(_is_even).map(_square).drop(1).take(5)
+        self.assertEqual(await strm.to_list(), [4, 16, 36, 64, 100])
+
+        strm = AsyncStream.from_iterable(range(10)).drop_while(lambda v: v < 3).take_while(lambda v: v < 6)
+        self.assertEqual(await strm.zip_index(1).to_list(), [(1, 3), (2, 4), (3, 5)])
+
+        groups = await AsyncStream.from_iterable(range(6)).groupby(_is_even)
+        self.assertEqual(groups, {True: [0, 2, 4], False: [1, 3, 5]})
+        self.assertEqual(await AsyncStream.from_iterable(range(6)).find_first(lambda v: v > 3), 4)
+
+    async def test_flatmap(self):
+        async def repeat(v:int):
+            for _ in range(v):
+                yield v
+        strm = AsyncStream.from_iterable(range(4)).flatmap(repeat)
+        self.assertEqual(await strm.to_list(), [1, 2, 2, 3, 3, 3])
+
+    async def test_map_async(self):
+        running = 0
+        max_running = 0
+        async def lookup(v:int) -> int:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001 * (v % 3))
+            running -= 1
+            return v * 10
+
+        result = await AsyncStream.from_iterable(range(50)).map_async(lookup, concurrency=4).to_list()
+        self.assertEqual(result, [v*10 for v in range(50)])
+        self.assertLessEqual(max_running, 4)
+
+        result = await AsyncStream.from_iterable(range(50)).map_async(lookup, ordered=False).to_list()
+        self.assertEqual(sorted(result), [v*10 for v in range(50)])
+
+    async def test_top_k_and_quasi_sort(self):
+        values = [5, 1, 4, 2, 3]
+        self.assertEqual(await AsyncStream.from_iterable(values).top_k(2).to_list(), [5, 4])
+        self.assertEqual(await AsyncStream.from_iterable(values).top_k(2, reversed=True).to_list(), [1, 2])
+        result = await AsyncStream.from_iterable(values).quasi_sort(2).to_list()
+        self.assertEqual(result, [1, 2, 3, 4, 5])
+        # queue보다 멀리 떨어진 값들은 정렬되지 않는다.
+        result = await AsyncStream.from_iterable([3, 1, 2, 0]).quasi_sort(2).to_list()
+        self.assertEqual(result, [1, 0, 2, 3])
+
+    async def test_top_k_long_stream(self):
+        async def numbers(count:int):
+            for v in range(count):
+                yield (v * 7919) % 10_007
+        result = await AsyncStream(numbers(10_000)).top_k(3).to_list()
+        self.assertEqual(result, list(Stream((v * 7919) % 10_007 for v in range(10_000)).top_k(3)))
+
+        # 동일한 key의 값들은 입력 순서를 유지해야 한다.
+        async def words(count:int):
+            for v in range(count):
+                yield f'{v % 10}-{v}'
+        result = await AsyncStream(words(5_000)).top_k(3, key=lambda w: w[0]).to_list()
+        self.assertEqual(result, ['9-9', '9-19', '9-29'])
+        result = await AsyncStream(words(5_000)).top_k(2, key=lambda w: w[0], reversed=True).to_list()
+        self.assertEqual(result, ['0-0', '0-10'])
+
+    async def test_bridges(self):
+        strm = Stream(range(5)).to_async(in_thread=True).map(_square)
+        self.assertEqual(list(await strm.to_stream()), [0, 1, 4, 9, 16])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import unittest
+
+from pyutils.camera.video_chunks import split_frame_ranges
+
+
+class SplitFrameRangesTest(unittest.TestCase):
+    def test_even_split(self):
+        self.assertEqual(split_frame_ranges(1, 13, 3), [(1, 5), (5, 9), (9, 13)])
+
+    def test_remainder(self):
+        # 나머지 frame들은 앞쪽 range들에 하나씩 배분된다.
+        self.assertEqual(split_frame_ranges(1, 12, 3), [(1, 5), (5, 9), (9, 12)])
+        self.assertEqual(split_frame_ranges(0, 10, 4), [(0, 3), (3, 6), (6, 8), (8, 10)])
+
+    def test_empty_ranges(self):
+        self.assertEqual(split_frame_ranges(1, 3, 4), [(1, 2), (2, 3)])
+        self.assertEqual(split_frame_ranges(5, 5, 3), [])
+        self.assertEqual(split_frame_ranges(7, 3, 2), [])
+
+    def test_invalid_chunks(self):
+        self.assertRaises(ValueError, split_frame_ranges, 1, 10, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()